@@ -0,0 +1,196 @@
+"""
+Offline benchmarks against the bundled MockPowerSchool.
+
+	python -m benchmarks.run --students 20000 --latency 0.005 --output benchmarks/results
+	python -m benchmarks.run --compare benchmarks/results/1.0.3.json
+
+Every scenario reports throughput (rows per second), request or operation latency (p50/p99 in
+milliseconds) and peak traced memory. Memory is measured in a separate pass so tracemalloc does
+not slow down the timed runs. Results are written as JSON named after the package version, so
+runs from different releases can be compared with --compare.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from importlib.metadata import PackageNotFoundError, version
+
+from powerschool_adapter import BulkWriter, Instrumentation, Paginator, ParallelPaginator, PowerSchool, Response
+from powerschool_adapter.codec import get_codec
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+
+
+def percentile(values, q):
+	if not values:
+		return None
+	values = sorted(values)
+	return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Benchmark:
+
+	def __init__(self, students=5000, page_size=500, workers=4, latency=0.0, repeat=3, batch_size=50, writes=1000):
+		self.students = students
+		self.page_size = page_size
+		self.workers = workers
+		self.latency = latency
+		self.repeat = repeat
+		self.batch_size = batch_size
+		self.writes = writes
+		self.latencies = []
+
+	def client(self, mock):
+		instrumentation = Instrumentation(tracing=False, after_request=[lambda event: self.latencies.append(event["elapsed"])])
+		return PowerSchool(mock.url, "client", "secret", cache_key=None, instrumentation=instrumentation)
+
+	def paginate(self, powerschool):
+		rows = 0
+		paginator = Paginator(powerschool.table("students"), self.page_size)
+		while (response := paginator.next_page()) is not None:
+			rows += response.count()
+		return rows
+
+	def paginate_parallel(self, powerschool):
+		return len(ParallelPaginator(powerschool.table("students"), self.page_size, self.workers).all())
+
+	def paginate_columnar(self, powerschool):
+		query = powerschool.table("students").projection(["ID", "STUDENT_NUMBER", "LAST_NAME", "GRADE_LEVEL"]).columnar()
+		return len(ParallelPaginator(query, self.page_size, self.workers).all())
+
+	def bulk_write_v1(self, powerschool):
+		students = [
+			{"client_uid": str(i), "action": "INSERT", "local_id": str(900000 + i), "name": {"first_name": "Bench", "last_name": f"Student {i}"}}
+			for i in range(self.writes)
+		]
+		report = BulkWriter(powerschool.to("/ws/v1/student"), self.batch_size, self.workers, retries=0).write(students)
+		return len(report.succeeded)
+
+	def bulk_write_table(self, powerschool):
+		rows = [{"id": str(i % self.students + 1), "last_name": f"Updated {i}"} for i in range(self.writes // 5)]
+		report = BulkWriter(powerschool.table("students"), self.batch_size, self.workers, retries=0).write(rows)
+		return len(report.succeeded)
+
+	def parse_page(self):
+		page = {"name": "STUDENTS", "record": [{"id": int(row["id"]), "tables": {"students": row}} for row in Dataset.synthetic(self.page_size * 4).tables["students"]]}
+		return json.dumps(page).encode()
+
+	def parse(self, content, columnar=False):
+		codec = get_codec()
+		started = time.perf_counter()
+		response = Response(codec.loads(content)).squash_table_response(columnar=columnar)
+		self.latencies.append(time.perf_counter() - started)
+		return response.count()
+
+	def scenarios(self):
+		return {
+			"paginate": self.paginate,
+			"paginate_parallel": self.paginate_parallel,
+			"paginate_columnar": self.paginate_columnar,
+			"bulk_write_v1": self.bulk_write_v1,
+			"bulk_write_table": self.bulk_write_table,
+			"parse": None,
+			"parse_columnar": None,
+		}
+
+	def measure(self, run):
+		self.latencies = []
+		timings, rows = [], 0
+		for _ in range(self.repeat):
+			gc.collect()
+			started = time.perf_counter()
+			rows = run()
+			timings.append(time.perf_counter() - started)
+		latencies = list(self.latencies)
+		gc.collect()
+		tracemalloc.start()
+		run()
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		seconds = min(timings)
+		return {
+			"rows": rows,
+			"seconds": round(seconds, 4),
+			"rows_per_second": round(rows / seconds, 1) if seconds else None,
+			"p50_ms": round(percentile(latencies, 0.5) * 1000, 3) if latencies else None,
+			"p99_ms": round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+			"peak_mb": round(peak / 1024 / 1024, 2),
+		}
+
+	def run(self, only=None):
+		results = {}
+		dataset = Dataset.synthetic(students=self.students, enrollments_per_student=0)
+		with MockPowerSchool(dataset, latency=self.latency, default_page_size=self.page_size) as mock:
+			powerschool = self.client(mock)
+			for name, scenario in self.scenarios().items():
+				if only and name not in only:
+					continue
+				if name.startswith("parse"):
+					content = self.parse_page()
+					columnar = name == "parse_columnar"
+					results[name] = self.measure(lambda: self.parse(content, columnar))
+				else:
+					results[name] = self.measure(lambda: scenario(powerschool))
+		return results
+
+
+def package_version():
+	try:
+		return version("powerschool-adapter")
+	except PackageNotFoundError:
+		return "dev"
+
+
+def compare(current, previous):
+	lines = [f"{'scenario':<20} {'rows/s':>12} {'change':>8} {'p99 ms':>10} {'peak MB':>9}"]
+	for name, result in current["results"].items():
+		before = previous["results"].get(name, {})
+		change = ""
+		if before.get("rows_per_second") and result["rows_per_second"]:
+			change = f"{(result['rows_per_second'] / before['rows_per_second'] - 1) * 100:+.1f}%"
+		lines.append(f"{name:<20} {result['rows_per_second'] or 0:>12.1f} {change:>8} {result['p99_ms'] or 0:>10.3f} {result['peak_mb']:>9.2f}")
+	return "\n".join(lines)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Benchmark powerschool-adapter against the bundled mock server.")
+	parser.add_argument("--students", type=int, default=5000)
+	parser.add_argument("--page-size", type=int, default=500)
+	parser.add_argument("--workers", type=int, default=4)
+	parser.add_argument("--latency", type=float, default=0.0, help="Seconds added by the mock server to every call")
+	parser.add_argument("--repeat", type=int, default=3)
+	parser.add_argument("--writes", type=int, default=1000)
+	parser.add_argument("--only", nargs="*", help="Scenarios to run")
+	parser.add_argument("--output", help="Directory the JSON results are written to")
+	parser.add_argument("--compare", help="Previous results file to compare against")
+	args = parser.parse_args(argv)
+
+	benchmark = Benchmark(args.students, args.page_size, args.workers, args.latency, args.repeat, writes=args.writes)
+	report = {
+		"version": package_version(),
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"codec": get_codec().name,
+		"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"config": vars(args),
+		"results": benchmark.run(args.only),
+	}
+	print(json.dumps(report["results"], indent=2))
+	if args.compare:
+		with open(args.compare) as fp:
+			print(compare(report, json.load(fp)))
+	if args.output:
+		os.makedirs(args.output, exist_ok=True)
+		path = os.path.join(args.output, f"{report['version']}.json")
+		with open(path, "w") as fp:
+			json.dump(report, fp, indent=2)
+		print(f"Results written to {path}", file=sys.stderr)
+	return report
+
+
+if __name__ == "__main__":
+	main()
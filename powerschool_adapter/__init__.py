@@ -20,5 +20,25 @@ FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 from .request import Request
 from .powerschool import PowerSchool
 from .response import Response
-from .paginator import Paginator
-from .operator import Operator
\ No newline at end of file
+from .query import Query
+from .columnar import Columnar
+from .codec import JsonCodec, get_codec, set_default_codec
+from .paginator import Paginator, ParallelPaginator, AsyncPaginator, AsyncParallelPaginator, batched
+from .operator import Operator
+from .expression import Expression, Field, Param, Raw, Template, and_, or_
+from .retry import RetryPolicy
+from .rate_limit import RateLimiter
+from .instrumentation import Instrumentation, Histogram
+from .batch import BatchFetcher, BatchResult, SplitFetcher
+from .bulk import BulkWriter, BulkReport, WriteResult
+from .sync import IncrementalSync, SyncEvent, MemoryVersionStore, DiskVersionStore
+from .checkpoint import CheckpointedExport, MemoryCheckpointStore, DiskCheckpointStore
+from .partition import PartitionedQuery, DateRanges, ValueChunks
+from .tenants import TenantRegistry, Tenant, TenantResult, TenantPage
+from .schema import SchemaRegistry, SchemaError, TableSchema
+from .cassette import Cassette, CassetteError
+from .response_cache import ResponseCache, MemoryCacheBackend, DiskCacheBackend
+from .token_provider import TokenProvider, MemoryTokenStore, DiskTokenStore
+from .async_request import AsyncRequest
+from .async_query import AsyncQuery
+from .async_powerschool import AsyncPowerSchool
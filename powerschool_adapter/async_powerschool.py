@@ -0,0 +1,63 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from .async_query import AsyncQuery
+from .async_request import AsyncRequest
+from .powerschool import PowerSchool
+
+
+class AsyncPowerSchool(PowerSchool):
+	"""
+	Asyncio twin of PowerSchool. The fluent builder is the same; every method that
+	sends a request (send, get, post, count, get_subscription_changes...) returns an awaitable instead.
+	"""
+
+	query_class = AsyncQuery
+
+	def create_request(self, server_address, client_id, client_secret, cache_key, **request_options):
+		# Authentication happens lazily on the first awaited request
+		return AsyncRequest(server_address, client_id, client_secret, cache_key, **request_options)
+
+	async def authenticate(self):
+		await self.request.authenticate()
+		return self
+
+	async def send(self, reset=True):
+		return await self.current_query().send(reset)
+
+	async def paginate(self, page_size=100):
+		return await self.paginate_query(self.current_query(), page_size)
+
+	async def paginate_query(self, query, page_size=100):
+		paginator = getattr(self.local, "paginator", None)
+		if not paginator:
+			paginator = self.local.paginator = query.paginator(page_size)
+		results = await paginator.next_page()
+		if not results:
+			return self.reset()
+		return results.data
+
+	async def aclose(self):
+		await self.request.aclose()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		await self.aclose()
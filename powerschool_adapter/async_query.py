@@ -0,0 +1,126 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from .batch import BatchFetcher, SplitFetcher
+from .bulk import BulkWriter
+from .checkpoint import AsyncCheckpointedExport
+from .export import ArrowExporter
+from .paginator import AsyncPaginator, AsyncParallelPaginator
+from .partition import AsyncPartitionedQuery
+from .query import Query
+
+
+class AsyncQuery(Query):
+	"""
+	Query whose sending methods (send, get, post, count, get_subscription_changes...) return awaitables.
+	"""
+
+	__slots__ = ()
+
+	async def send(self, reset=True):
+		if not self.endpoint:
+			raise ValueError("Endpoint must be set before sending a request.")
+
+		await self.validate()
+		response = await self.request.make_request(self.http_method, self.endpoint, self.build_request_options(), self.decodes_json())
+		if reset and self.owner is not None:
+			self.owner.reset()
+		return self.build_response(response)
+
+	async def validate(self):
+		if self.request.schema is not None:
+			await self.request.schema.check_async(self)
+		return self
+
+	async def metadata(self):
+		if self.request.schema is None:
+			raise ValueError("Table metadata needs a SchemaRegistry on the Request (schema=SchemaRegistry()).")
+		return await self.request.schema.table_async(self.request, self.table_name)
+
+	def paginator(self, page_size=100, prefetch=0):
+		return AsyncPaginator(self, page_size, prefetch)
+
+	def iter_pages(self, page_size=100, prefetch=1):
+		return self.paginator(page_size, prefetch).__aiter__()
+
+	async def iter_rows(self, page_size=100, prefetch=1):
+		async for response in self.iter_pages(page_size, prefetch):
+			for row in response:
+				yield row
+
+	async def batched(self, size, page_size=100, prefetch=1):
+		if size < 1:
+			raise ValueError("Batch size must be at least 1.")
+		batch = []
+		async for row in self.iter_rows(page_size, prefetch):
+			batch.append(row)
+			if len(batch) == size:
+				yield batch
+				batch = []
+		if batch:
+			yield batch
+
+	async def paginate_parallel(self, page_size=100, max_workers=4):
+		return await AsyncParallelPaginator(self, page_size, max_workers).all()
+
+	async def fetch_many(self, ids, id_column="id", max_url_length=2000, max_batch=100, max_workers=4):
+		return await BatchFetcher(self.untracked(), id_column, max_url_length, max_batch, max_workers).fetch_async(ids)
+
+	async def fetch_where(self, expression, max_url_length=2000, page_size=100, max_workers=4, **params):
+		return await SplitFetcher(self.untracked(), expression, params, max_url_length, page_size, max_workers).fetch_async()
+
+	async def bulk_write(self, items, batch_size=50, max_workers=4, retries=1, id_column="id"):
+		return await BulkWriter(self.untracked(), batch_size, max_workers, retries, id_column).write_async(items)
+
+	def checkpointed(self, store=None, job=None, page_size=1000, keyset=None, max_workers=1, restart=False):
+		return AsyncCheckpointedExport(self._replace(owner=None, as_columns=False, row_type=None), store, job, page_size, keyset, max_workers, restart)
+
+	def partitioned(self, *partitions, page_size=100, max_workers=4, key=None):
+		return AsyncPartitionedQuery(self._replace(owner=None, as_columns=False, row_type=None), partitions, page_size, max_workers, key)
+
+	async def export_pages(self, page_size=1000, max_workers=4):
+		pages = await AsyncParallelPaginator(self._replace(owner=None, as_columns=False, row_type=None), page_size, max_workers).pages()
+		return [response.rows() for response in pages]
+
+	async def export_columns(self):
+		columns = self.projection_columns()
+		if columns is None and self.table_name and self.request.schema is not None:
+			columns = list((await self.metadata()).columns)
+		return columns
+
+	async def record_batches(self, page_size=1000, max_workers=4, types: dict = None):
+		return ArrowExporter(await self.export_columns(), types).record_batches(await self.export_pages(page_size, max_workers))
+
+	async def to_arrow(self, page_size=1000, max_workers=4, types: dict = None):
+		return ArrowExporter(await self.export_columns(), types).to_table(await self.export_pages(page_size, max_workers))
+
+	async def to_pandas(self, page_size=1000, max_workers=4, types: dict = None):
+		return ArrowExporter(await self.export_columns(), types).to_pandas(await self.export_pages(page_size, max_workers))
+
+	async def to_parquet(self, path, page_size=1000, max_workers=4, types: dict = None, **options):
+		return ArrowExporter(await self.export_columns(), types).to_parquet(path, await self.export_pages(page_size, max_workers), **options)
+
+	async def stream(self, page_size=100):
+		# httpx responses are decoded a page at a time; rows are still handed out one by one
+		if self.id is not None or self.page_key.isdigit():
+			for row in (await self.untracked().send()).rows():
+				yield row
+			return
+		async for row in self.iter_rows(page_size, prefetch=0):
+			yield row
@@ -0,0 +1,166 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+import asyncio
+
+from .request import Request
+
+try:
+	import httpx
+except ImportError:  # pragma: no cover - optional dependency
+	httpx = None
+
+
+class AsyncRequest(Request):
+	transport_errors = (httpx.TransportError,) if httpx is not None else ()
+
+	def __init__(self, server_address, client_id, client_secret, cache_key=None, client=None, max_connections=100,
+				 max_keepalive_connections=None, keepalive_expiry=5.0, timeout=None, keep_alive=True, http2=False,
+				 token_store=None, token_refresh_margin=60, retry_policy=None, rate_limiter=None, response_cache=None,
+				 codec=None, schema=None, instrumentation=None, cassette=None):
+		self.max_connections = max_connections
+		self.max_keepalive_connections = max_connections if max_keepalive_connections is None else max_keepalive_connections
+		self.keepalive_expiry = keepalive_expiry
+		self.shared_client = client
+		self.stats = {"connections": 0, "requests": 0, "reused": 0}
+		super().__init__(server_address, client_id, client_secret, cache_key, timeout=timeout, keep_alive=keep_alive, http2=http2,
+						 token_store=token_store, token_refresh_margin=token_refresh_margin, retry_policy=retry_policy,
+						 rate_limiter=rate_limiter, response_cache=response_cache, codec=codec, schema=schema,
+						 instrumentation=instrumentation, cassette=cassette)
+
+	def create_client(self):
+		if self.shared_client is not None:
+			return self.shared_client
+		if httpx is None:
+			raise ImportError("AsyncRequest requires httpx. Install it with: pip install powerschool-adapter[async]")
+		limits = httpx.Limits(
+			max_connections=self.max_connections,
+			max_keepalive_connections=self.max_keepalive_connections if self.keep_alive else 0,
+			keepalive_expiry=self.keepalive_expiry,
+		)
+		timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0]) if isinstance(self.timeout, tuple) else self.timeout
+		# HTTP/2 needs the h2 package: pip install httpx[http2]
+		if self.cassette is not None:
+			transport = self.cassette.async_transport(httpx.AsyncHTTPTransport(limits=limits, http2=self.http2))
+			return httpx.AsyncClient(transport=transport, timeout=timeout)
+		return httpx.AsyncClient(limits=limits, timeout=timeout, http2=self.http2)
+
+	def pool_stats(self):
+		stats = dict(self.stats)
+		stats["reused"] = stats["requests"] - stats["connections"]
+		return stats
+
+	async def _trace(self, event_name, info):
+		if event_name == "connection.connect_tcp.started":
+			self.stats["connections"] += 1
+
+	async def make_request(self, method, endpoint, options=None, json=False):
+		if options is None:
+			options = {}
+
+		if self.instrumentation is None:
+			response = await self.dispatch(method, endpoint, options)
+		else:
+			event = self.instrumentation.start(method, endpoint, options)
+			try:
+				response = await self.dispatch(method, endpoint, options)
+			except Exception as e:
+				self.instrumentation.finish(event, error=e)
+				raise
+			self.instrumentation.finish(event, response)
+		return self.codec.loads(response.content) if json else response
+
+	async def dispatch(self, method, endpoint, options):
+		if self.response_cache is not None and self.response_cache.accepts(method, endpoint, options):
+			return await self.make_cached_request(method, endpoint, options)
+		return await self.execute(method, endpoint, options)
+
+	async def make_cached_request(self, method, endpoint, options):
+		key, entry, cached = self.cache_lookup(method, endpoint, options)
+		if cached is not None:
+			return cached
+		return self.cache_response(key, entry, endpoint, await self.execute(method, endpoint, options))
+
+	def build_cached_response(self, entry, endpoint):
+		return httpx.Response(entry["status"], headers=entry["headers"], content=entry["content"])
+
+	def encode_body(self, options):
+		if options.get("json") is not None:
+			options["content"] = self.codec.encode(options.pop("json"))
+		return options
+
+	async def execute(self, method, endpoint, options):
+		token = await self.authenticate()
+		options = self.encode_body(options)
+
+		auth_attempts = 0
+		retries = 0
+		while True:
+			options["headers"] = self.build_headers(options, token)
+			try:
+				response = await self.send_request(method, endpoint, options)
+			except self.transport_errors as e:
+				retries += 1
+				await asyncio.sleep(self.error_retry_delay(method, endpoint, retries, e))
+				continue
+
+			if self.token_rejected(response, auth_attempts):
+				auth_attempts += 1
+				token = await self.token_provider.refresh_async(self.fetch_token, stale=token)
+				continue
+
+			delay = self.status_retry_delay(method, endpoint, retries + 1, response)
+			if delay is None:
+				return response
+			retries += 1
+			await asyncio.sleep(delay)
+
+	def discard(self, response):
+		# httpx has already read the body, and the async stream cannot be closed synchronously
+		pass
+
+	async def send_request(self, method, endpoint, options):
+		self.stats["requests"] += 1
+		url = f"{self.server_address}{endpoint}"
+		if self.rate_limiter is None:
+			return await self.client.request(method, url, extensions={"trace": self._trace}, **options)
+		async with self.rate_limiter:
+			started = time.monotonic()
+			response = await self.client.request(method, url, extensions={"trace": self._trace}, **options)
+		self.rate_limiter.feedback(response.status_code, time.monotonic() - started)
+		return response
+
+	async def fetch_token(self):
+		if self.instrumentation is not None:
+			self.instrumentation.record_token_fetch()
+		url, data, headers = self.build_authentication_request()
+		response = await self.client.post(url, data=data, headers=headers)
+		response.raise_for_status()
+		return self.parse_token(self.codec.loads(response.content))
+
+	async def authenticate(self, force=False):
+		if force:
+			return await self.token_provider.refresh_async(self.fetch_token, stale=self.token)
+		return await self.token_provider.get_token_async(self.fetch_token)
+
+	async def aclose(self):
+		# A client passed in by the caller is shared and owned by the caller
+		if self.shared_client is None:
+			await self.client.aclose()
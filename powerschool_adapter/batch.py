@@ -0,0 +1,157 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from .columnar import Columnar
+from .expression import Compiled, Expression, Field, Param, Raw, and_
+from .operator import Operator
+from .sync import row_value
+
+BatchResult = namedtuple("BatchResult", ["found", "missing"])
+
+
+class BatchFetcher:
+	"""
+	Loads many records by id with a few `id=in=(...)` queries instead of one request per id.
+	Ids are chunked so every URL stays under max_url_length and every chunk fits in one page.
+	Works for tables and for v1 list resources such as /ws/v1/district/student.
+	"""
+
+	def __init__(self, query, id_column="id", max_url_length=2000, max_batch=100, max_workers=4):
+		self.query = query
+		self.id_column = id_column
+		self.max_url_length = max_url_length
+		self.max_batch = max_batch
+		self.max_workers = max_workers
+		self.template = Field(id_column).in_(Param("ids")).compile()
+
+	def filter_for(self, ids):
+		expression = self.template.render(ids=ids)
+		existing = self.query.query_string.get("q")
+		# The existing filter may hold an or, which must not swallow the id list
+		return f"({existing}){Operator.AND}{expression}" if existing else expression
+
+	def chunk_query(self, ids):
+		return self.query.q(self.filter_for(ids)).page_size(len(ids) or self.max_batch)
+
+	def chunks(self, ids):
+		base = len(self.query.request.server_address) + len(self.query.endpoint) + 1
+		base += len(quote(self.chunk_query([]).build_request_query(), safe="=&,;()*"))
+		return self.template.chunks(ids, self.max_url_length - base, self.max_batch)
+
+	def rows(self, response):
+		if self.query.table_name:
+			response = response.squash_table_response()
+		return [row for row in response.to_list() if row]
+
+	def collect(self, ids, chunk_rows):
+		found = {}
+		for rows in chunk_rows:
+			for row in rows:
+				# PowerSchool returns lower-case column names whatever case the filter used
+				found[str(row_value(row, self.id_column))] = row
+		return BatchResult(found, [record_id for record_id in ids if record_id not in found])
+
+	def normalise(self, ids):
+		# dict.fromkeys drops duplicates while keeping the order
+		return list(dict.fromkeys(str(record_id) for record_id in ids))
+
+	def fetch(self, ids):
+		ids = self.normalise(ids)
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			chunk_rows = executor.map(lambda chunk: self.rows(self.chunk_query(chunk).get()), self.chunks(ids))
+			return self.collect(ids, chunk_rows)
+
+	async def fetch_async(self, ids):
+		ids = self.normalise(ids)
+		semaphore = asyncio.Semaphore(self.max_workers)
+
+		async def fetch_chunk(chunk):
+			async with semaphore:
+				return self.rows(await self.chunk_query(chunk).get())
+
+		return self.collect(ids, await asyncio.gather(*(fetch_chunk(chunk) for chunk in self.chunks(ids))))
+
+
+class SplitFetcher:
+	"""
+	Runs a filter whose in-list would push the URL past max_url_length as one request per chunk
+	of the list, sent concurrently, and merges the rows in chunk order. Each chunk is paged until
+	a short page comes back. Only lists joined to the rest of the filter with and are split, so
+	the chunks never return the same row twice.
+	"""
+
+	def __init__(self, query, expression, params=None, max_url_length=2000, page_size=100, max_workers=4):
+		self.query = query
+		self.expression = expression if isinstance(expression, Expression) else Compiled(expression)
+		self.params = params or {}
+		self.max_url_length = max_url_length
+		self.page_size = page_size
+		self.max_workers = max_workers
+
+	def filters(self):
+		existing = self.query.query_string.get("q")
+		template = and_(Raw(existing), self.expression).compile() if existing else self.expression.compile()
+		base = len(self.query.request.server_address) + len(self.query.endpoint) + 1
+		base += len(quote(self.page_query(self.query.q(""), 1).build_request_query(), safe="=&,;()*"))
+		return template.split(self.max_url_length - base, **self.params)
+
+	def page_query(self, query, page):
+		return query.page_size(self.page_size).page(page)
+
+	def page_rows(self, response):
+		return list(response.rows())
+
+	def fetch_filter(self, expression):
+		query, rows, page = self.query.q(expression), [], 1
+		while True:
+			page_rows = self.page_rows(self.page_query(query, page).send())
+			rows.extend(page_rows)
+			if len(page_rows) < self.page_size:
+				return rows
+			page += 1
+
+	def merge(self, chunk_rows):
+		rows = [row for chunk in chunk_rows for row in chunk]
+		if self.query.as_columns:
+			return Columnar.from_dicts(rows, self.query.projection_columns())
+		return rows
+
+	def fetch(self):
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			return self.merge(executor.map(self.fetch_filter, self.filters()))
+
+	async def fetch_async(self):
+		semaphore = asyncio.Semaphore(self.max_workers)
+
+		async def fetch_filter(expression):
+			async with semaphore:
+				query, rows, page = self.query.q(expression), [], 1
+				while True:
+					page_rows = self.page_rows(await self.page_query(query, page).send())
+					rows.extend(page_rows)
+					if len(page_rows) < self.page_size:
+						return rows
+					page += 1
+
+		return self.merge(await asyncio.gather(*(fetch_filter(expression) for expression in self.filters())))
@@ -0,0 +1,203 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+	import httpx
+except ImportError:  # pragma: no cover - optional dependency
+	httpx = None
+
+# Errors that fail the items of one request rather than the whole write
+WRITE_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+# Errors raised before the request reached the server
+UNSENT_ERRORS = (requests.exceptions.ConnectTimeout,) + ((httpx.ConnectError, httpx.ConnectTimeout) if httpx else ())
+
+WriteResult = namedtuple("WriteResult", ["index", "item", "status", "action", "id", "error"])
+
+
+class BulkReport:
+
+	def __init__(self, results):
+		self.results = sorted(results, key=lambda result: result.index)
+
+	@property
+	def succeeded(self):
+		return [result for result in self.results if result.status == BulkWriter.SUCCESS]
+
+	@property
+	def failed(self):
+		return [result for result in self.results if result.status != BulkWriter.SUCCESS]
+
+	def is_successful(self):
+		return not self.failed
+
+	def __len__(self):
+		return len(self.results)
+
+	def __repr__(self):
+		return f"BulkReport(succeeded={len(self.succeeded)}, failed={len(self.failed)})"
+
+
+class BulkWriter:
+	"""
+	Writes many items through one query. v1 resources such as /ws/v1/student take up to
+	batch_size entries per request; table rows are fanned out as PUT (rows with an id) or
+	POST requests over a worker pool. Failed items, and only those, are resubmitted up to retries times.
+	A POST that failed without telling whether it was applied is reported as UNCONFIRMED and never resubmitted.
+	write_async does the same through an AsyncQuery, with max_workers requests in flight.
+	"""
+
+	SUCCESS = "SUCCESS"
+	ERROR = "ERROR"
+	UNCONFIRMED = "UNCONFIRMED"
+
+	def __init__(self, query, batch_size=50, max_workers=4, retries=1, id_column="id"):
+		self.query = query
+		self.batch_size = batch_size
+		self.max_workers = max_workers
+		self.retries = retries
+		self.id_column = id_column
+
+	def parse_results(self, data):
+		results = data.get("results", data) if isinstance(data, dict) else {}
+		result = results.get("result", []) if isinstance(results, dict) else []
+		return result if isinstance(result, list) else [result]
+
+	def to_write_result(self, index, item, result):
+		if result is None:
+			return WriteResult(index, item, self.ERROR, None, None, "No result returned for this item.")
+		success = result.get("success_message") or {}
+		return WriteResult(index, item, result.get("status", self.ERROR), result.get("action"), success.get("id"), result.get("error_message"))
+
+	def not_applied(self, error):
+		response = getattr(error, "response", None)
+		if response is not None:
+			# Rejected requests and a 503 are turned away before anything is written
+			return 400 <= response.status_code < 500 or response.status_code == 503
+		return isinstance(error, UNSENT_ERRORS)
+
+	def failed_batch(self, batch, error, idempotent=False):
+		message = error.response.text if getattr(error, "response", None) is not None else str(error)
+		status = self.ERROR if idempotent or self.not_applied(error) else self.UNCONFIRMED
+		return [WriteResult(index, item, status, None, None, message) for index, item in batch]
+
+	def client_uid(self, index, item):
+		return self.query.cast_to_values_string(item.get("client_uid", index))
+
+	def batch_body(self, batch):
+		key = self.query.page_key
+		# PowerSchool echoes the client_uid on each result, so entries without one are given their index
+		entries = [{**item, "client_uid": self.client_uid(index, item)} for index, item in batch]
+		return {f"{key}s": {key: [self.query.cast_to_values_string(entry) for entry in entries]}}
+
+	def batch_results(self, batch, data):
+		# Results are matched on client_uid as their order is not guaranteed
+		results = {str(result.get("client_uid")): result for result in self.parse_results(data)}
+		return [self.to_write_result(index, item, results.get(self.client_uid(index, item))) for index, item in batch]
+
+	def write_batch(self, batch):
+		try:
+			data = self.query.request.make_request(self.query.POST, self.query.endpoint, {"json": self.batch_body(batch)}, True)
+		except WRITE_ERRORS as e:
+			return self.failed_batch(batch, e)
+		return self.batch_results(batch, data)
+
+	async def write_batch_async(self, batch):
+		try:
+			data = await self.query.request.make_request(self.query.POST, self.query.endpoint, {"json": self.batch_body(batch)}, True)
+		except WRITE_ERRORS as e:
+			return self.failed_batch(batch, e)
+		return self.batch_results(batch, data)
+
+	def row_query(self, row):
+		row = dict(row)
+		row_id = row.pop(self.id_column, None)
+		return row_id, row, self.query.exclude_projection().with_data(row)
+
+	def row_results(self, index, row_id, row, response):
+		results = self.parse_results(response.get_original_data())
+		return [self.to_write_result(index, dict(row, **{self.id_column: row_id}) if row_id else row, results[0] if results else None)]
+
+	def write_row(self, entry):
+		index, row = entry
+		row_id, row, query = self.row_query(row)
+		try:
+			response = query.set_id(row_id).put() if row_id else query.post()
+		except WRITE_ERRORS as e:
+			return self.failed_batch([entry], e, idempotent=bool(row_id))
+		return self.row_results(index, row_id, row, response)
+
+	async def write_row_async(self, entry):
+		index, row = entry
+		row_id, row, query = self.row_query(row)
+		try:
+			response = await (query.set_id(row_id).put() if row_id else query.post())
+		except WRITE_ERRORS as e:
+			return self.failed_batch([entry], e, idempotent=bool(row_id))
+		return self.row_results(index, row_id, row, response)
+
+	def jobs(self, entries):
+		if self.query.table_name:
+			return entries
+		return [entries[start:start + self.batch_size] for start in range(0, len(entries), self.batch_size)]
+
+	def submit(self, entries):
+		write = self.write_row if self.query.table_name else self.write_batch
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			return [result for results in executor.map(write, self.jobs(entries)) for result in results]
+
+	async def submit_async(self, entries):
+		write = self.write_row_async if self.query.table_name else self.write_batch_async
+		semaphore = asyncio.Semaphore(self.max_workers)
+
+		async def run(job):
+			async with semaphore:
+				return await write(job)
+
+		return [result for results in await asyncio.gather(*(run(job) for job in self.jobs(entries))) for result in results]
+
+	def merge_retry(self, results, retried):
+		retried = {result.index: result for result in retried}
+		return [retried.get(result.index, result) for result in results]
+
+	def failed_entries(self, results):
+		return [(result.index, result.item) for result in results if result.status == self.ERROR]
+
+	def write(self, items):
+		results = self.submit(list(enumerate(items)))
+		for _ in range(self.retries):
+			failed = self.failed_entries(results)
+			if not failed:
+				break
+			results = self.merge_retry(results, self.submit(failed))
+		return BulkReport(results)
+
+	async def write_async(self, items):
+		results = await self.submit_async(list(enumerate(items)))
+		for _ in range(self.retries):
+			failed = self.failed_entries(results)
+			if not failed:
+				break
+			results = self.merge_retry(results, await self.submit_async(failed))
+		return BulkReport(results)
@@ -0,0 +1,228 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+	import httpx
+except ImportError:  # pragma: no cover - optional dependency
+	httpx = None
+
+# Only headers the client acts on are kept; Authorization and cookies are never written
+KEPT_HEADERS = ("Content-Type", "Retry-After", "ETag", "Last-Modified", "Cache-Control", "Expires")
+TOKEN_PATH = "/oauth/access_token"
+TRANSFER_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class CassetteError(LookupError):
+	pass
+
+
+class Cassette:
+	"""
+	Records PowerSchool calls and replays them without a network. Interactions are stored as
+	gzipped JSON lines in call order. Replays match on method, path, sorted query and a digest
+	of the body, and serve repeated calls in recorded order. latency_factor scales the recorded
+	server time on replay: 0 replays at full speed, 1 at recorded latency.
+	Access tokens in recorded token responses are replaced so no credentials reach the file.
+	"""
+
+	RECORD = "record"
+	REPLAY = "replay"
+
+	def __init__(self, path, mode=REPLAY, latency_factor=0.0):
+		if mode not in (self.RECORD, self.REPLAY):
+			raise ValueError(f"Unknown cassette mode '{mode}'. Use 'record' or 'replay'.")
+		self.path = path
+		self.mode = mode
+		self.latency_factor = latency_factor
+		self.interactions = []
+		self.queues = {}
+		self.lock = threading.Lock()
+		self.started = time.monotonic()
+		if mode == self.REPLAY:
+			self.load()
+
+	@staticmethod
+	def key(method, url, body):
+		parts = urlsplit(str(url))
+		query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+		if isinstance(body, str):
+			body = body.encode()
+		digest = hashlib.sha1(body).hexdigest()[:16] if body else ""
+		return f"{method.upper()} {parts.path}?{query} {digest}"
+
+	def load(self):
+		with gzip.open(self.path, "rt", encoding="utf-8") as fp:
+			for line in fp:
+				interaction = json.loads(line)
+				self.interactions.append(interaction)
+				self.queues.setdefault(interaction["key"], deque()).append(interaction)
+
+	def save(self):
+		if self.mode != self.RECORD:
+			return
+		with self.lock:
+			interactions = list(self.interactions)
+		with gzip.open(self.path, "wt", encoding="utf-8", compresslevel=9) as fp:
+			for interaction in interactions:
+				fp.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.save()
+
+	def __len__(self):
+		return len(self.interactions)
+
+	def record(self, method, url, body, status, headers, content, elapsed):
+		path = urlsplit(str(url)).path
+		if path.endswith(TOKEN_PATH) and status == 200:
+			payload = json.loads(content)
+			payload["access_token"] = "replayed-token"
+			content = json.dumps(payload).encode()
+		try:
+			encoded, encoding = content.decode("utf-8"), "text"
+		except UnicodeDecodeError:
+			encoded, encoding = base64.b64encode(content).decode(), "base64"
+		interaction = {
+			"key": self.key(method, url, body),
+			"offset": round(time.monotonic() - self.started, 6),
+			"elapsed": round(elapsed, 6),
+			"status": status,
+			"headers": {name: headers[name] for name in KEPT_HEADERS if name in headers},
+			"encoding": encoding,
+			"content": encoded,
+		}
+		with self.lock:
+			self.interactions.append(interaction)
+
+	def play(self, method, url, body):
+		key = self.key(method, url, body)
+		with self.lock:
+			queue = self.queues.get(key)
+			if not queue:
+				raise CassetteError(f"No recorded interaction left for {key}")
+			# The last answer keeps being served once a call is repeated more often than recorded
+			interaction = queue.popleft() if len(queue) > 1 else queue[0]
+		content = interaction["content"]
+		content = base64.b64decode(content) if interaction["encoding"] == "base64" else content.encode("utf-8")
+		return interaction, content
+
+	def delay(self, interaction):
+		return interaction["elapsed"] * self.latency_factor
+
+	def adapter(self, inner=None):
+		return CassetteAdapter(self, inner)
+
+	def async_transport(self, inner=None):
+		if httpx is None:
+			raise ImportError("Async cassettes require httpx. Install it with: pip install powerschool-adapter[async]")
+		return AsyncCassetteTransport(self, inner)
+
+
+class CassetteAdapter(BaseAdapter):
+	"""
+	requests transport adapter: records through the wrapped adapter or replays from the cassette.
+	"""
+
+	def __init__(self, cassette, inner=None):
+		super().__init__()
+		self.cassette = cassette
+		self.inner = inner
+
+	def send(self, request, stream=False, **kwargs):
+		if self.cassette.mode == Cassette.RECORD:
+			# requests only sets response.elapsed after the adapter returns
+			started = time.monotonic()
+			response = self.inner.send(request, stream=stream, **kwargs)
+			content = response.content
+			self.cassette.record(request.method, request.url, request.body, response.status_code, response.headers,
+								 content, time.monotonic() - started)
+			if stream:
+				# The body was read for the cassette, so streaming callers read it back from memory
+				response.raw = io.BytesIO(content)
+			return response
+		interaction, content = self.cassette.play(request.method, request.url, request.body)
+		if self.cassette.delay(interaction):
+			time.sleep(self.cassette.delay(interaction))
+		response = requests.Response()
+		response.status_code = interaction["status"]
+		response.headers = CaseInsensitiveDict(interaction["headers"])
+		response.raw = io.BytesIO(content)
+		if not stream:
+			response._content = content
+		response.encoding = "utf-8"
+		response.url = request.url
+		response.request = request
+		response.reason = requests.status_codes._codes.get(response.status_code, ("",))[0].upper()
+		response.elapsed = timedelta(seconds=interaction["elapsed"])
+		return response
+
+	def close(self):
+		if self.inner is not None:
+			self.inner.close()
+
+
+if httpx is not None:
+
+	class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+		"""
+		httpx transport: records through the wrapped transport or replays from the cassette.
+		"""
+
+		def __init__(self, cassette, inner=None):
+			self.cassette = cassette
+			self.inner = inner
+
+		async def handle_async_request(self, request):
+			body = await request.aread()
+			if self.cassette.mode == Cassette.RECORD:
+				started = time.monotonic()
+				response = await self.inner.handle_async_request(request)
+				content = await response.aread()
+				self.cassette.record(request.method, request.url, body, response.status_code, response.headers,
+									 content, time.monotonic() - started)
+				# The body is already decoded, so the transfer headers no longer apply
+				headers = [(name, value) for name, value in response.headers.items() if name.lower() not in TRANSFER_HEADERS]
+				return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+			interaction, content = self.cassette.play(request.method, request.url, body)
+			if self.cassette.delay(interaction):
+				await asyncio.sleep(self.cassette.delay(interaction))
+			return httpx.Response(interaction["status"], headers=interaction["headers"], content=content, request=request)
+
+		async def aclose(self):
+			if self.inner is not None:
+				await self.inner.aclose()
@@ -0,0 +1,198 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import hashlib
+import json
+import time
+
+from diskcache import Cache
+
+from .expression import Field, Raw, and_
+from .paginator import AsyncPaginator, ParallelPaginator
+from .paths import user_cache_dir
+
+
+class MemoryCheckpointStore:
+
+	def __init__(self):
+		self.checkpoints = {}
+
+	def get(self, job):
+		return self.checkpoints.get(job)
+
+	def set(self, job, checkpoint):
+		self.checkpoints[job] = checkpoint
+
+	def delete(self, job):
+		self.checkpoints.pop(job, None)
+
+
+class DiskCheckpointStore:
+	"""
+	Persists export progress in a diskcache directory so a job survives crashes and restarts.
+	"""
+
+	def __init__(self, directory=None):
+		self.cache = Cache(directory if directory is not None else user_cache_dir("checkpoints"))
+
+	def get(self, job):
+		return self.cache.get(job)
+
+	def set(self, job, checkpoint):
+		self.cache.set(job, checkpoint)
+
+	def delete(self, job):
+		self.cache.delete(job)
+
+
+def fingerprint(query):
+	# Paging parameters change while the export runs, everything else identifies the query
+	params = sorted((key, str(value)) for key, value in query.query_string.items() if key not in ("page", "pagesize"))
+	source = json.dumps([query.http_method, query.endpoint, params, dict(query.data)], sort_keys=True, default=str)
+	return hashlib.sha1(source.encode()).hexdigest()
+
+
+class CheckpointedExport:
+	"""
+	Pages through a table or PowerQuery and stores progress (query fingerprint, last page,
+	last sort key, rows so far) after every page the caller has finished with, so a job that
+	dies resumes at the first unfinished page. Progress is removed once the export completes.
+
+	With keyset set to a unique sort column, pages are requested as `column=gt=<last key>`
+	on page 1 instead of by page number, so deep pages cost the same as the first one.
+	Keyset continuation needs a table query; PowerQueries resume by page number. The keyset
+	column is added to the projection when it is missing.
+	"""
+
+	def __init__(self, query, store=None, job=None, page_size=1000, keyset=None, max_workers=1, restart=False):
+		if keyset and not query.table_name:
+			raise ValueError("Keyset continuation needs a table query; PowerQueries resume by page number.")
+		columns = query.projection_columns()
+		if keyset and columns is not None and keyset.lower() not in columns:
+			# Every page's last row has to carry the key the next page continues from
+			query = query.projection(columns + [keyset.lower()])
+		self.query = query
+		self.store = store if store is not None else MemoryCheckpointStore()
+		self.fingerprint = fingerprint(query)
+		self.job = job or self.fingerprint
+		self.page_size = page_size
+		self.keyset = keyset.lower() if keyset else None
+		self.max_workers = max_workers
+		if restart:
+			self.store.delete(self.job)
+
+	def progress(self):
+		checkpoint = self.store.get(self.job)
+		if checkpoint is not None and checkpoint["fingerprint"] != self.fingerprint:
+			raise ValueError(f"Checkpoint '{self.job}' was written for a different query. Pass restart=True to start over.")
+		# A page number means nothing to a keyset export and the other way round, so resuming would start over
+		if checkpoint is not None and checkpoint.get("keyset") != self.keyset:
+			raise ValueError(f"Checkpoint '{self.job}' was written with keyset={checkpoint.get('keyset')!r}. Resume with the same keyset or pass restart=True.")
+		return checkpoint or {"fingerprint": self.fingerprint, "keyset": self.keyset, "page": 0, "sort_key": None, "rows": 0}
+
+	def save(self, checkpoint, response):
+		rows = response.rows()
+		checkpoint = dict(checkpoint, page=checkpoint["page"] + 1, rows=checkpoint["rows"] + len(rows), updated=time.time())
+		if self.keyset:
+			sort_key = rows[-1].get(self.keyset)
+			if sort_key is None:
+				# Continuing without a key would request the first page again
+				raise ValueError(f"The last row of page {checkpoint['page']} has no '{self.keyset}' value; keyset needs a non-null unique column.")
+			checkpoint["sort_key"] = sort_key
+		self.store.set(self.job, checkpoint)
+		return checkpoint
+
+	def keyset_query(self, sort_key):
+		query = self.query.sort(self.keyset).page_size(self.page_size).page(1)
+		if sort_key is None:
+			return query
+		expression = Field(self.keyset).gt(sort_key)
+		existing = self.query.query_string.get("q")
+		return query.q(and_(Raw(existing), expression) if existing else expression)
+
+	def keyset_pages(self, checkpoint):
+		while True:
+			response = self.keyset_query(checkpoint["sort_key"]).send()
+			if response.is_empty():
+				return
+			yield response
+			checkpoint = self.save(checkpoint, response)
+
+	def numbered_pages(self, checkpoint):
+		if self.max_workers > 1:
+			paginator = ParallelPaginator(self.query, self.page_size, self.max_workers)
+			for response in paginator.pages(start=checkpoint["page"] + 1):
+				if response.is_empty():
+					return
+				yield response
+				checkpoint = self.save(checkpoint, response)
+			return
+		query = self.query.page_size(self.page_size)
+		while True:
+			response = query.page(checkpoint["page"] + 1).send()
+			if response.is_empty():
+				return
+			yield response
+			checkpoint = self.save(checkpoint, response)
+
+	def pages(self):
+		"""
+		Yields Responses from the first unfinished page. A page counts as done once the next one is requested.
+		"""
+		checkpoint = self.progress()
+		yield from self.keyset_pages(checkpoint) if self.keyset else self.numbered_pages(checkpoint)
+		self.store.delete(self.job)
+
+	def rows(self):
+		for response in self.pages():
+			yield from response.rows()
+
+
+class AsyncCheckpointedExport(CheckpointedExport):
+	"""
+	CheckpointedExport over an AsyncQuery; pages() and rows() are async generators. With
+	max_workers above 1, numbered pages are prefetched max_workers - 1 pages ahead.
+	"""
+
+	async def keyset_pages(self, checkpoint):
+		while True:
+			response = await self.keyset_query(checkpoint["sort_key"]).send()
+			if response.is_empty():
+				return
+			yield response
+			checkpoint = self.save(checkpoint, response)
+
+	async def numbered_pages(self, checkpoint):
+		paginator = AsyncPaginator(self.query, self.page_size, self.max_workers - 1)
+		paginator.page = checkpoint["page"] + 1
+		async for response in paginator:
+			yield response
+			checkpoint = self.save(checkpoint, response)
+
+	async def pages(self):
+		checkpoint = self.progress()
+		pages = self.keyset_pages(checkpoint) if self.keyset else self.numbered_pages(checkpoint)
+		async for response in pages:
+			yield response
+		self.store.delete(self.job)
+
+	async def rows(self):
+		async for response in self.pages():
+			for row in response.rows():
+				yield row
@@ -0,0 +1,177 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import dataclasses
+import json
+from typing import Any, Dict, List
+
+try:
+	import orjson
+except ImportError:  # pragma: no cover - optional dependency
+	orjson = None
+
+try:
+	import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+	msgspec = None
+
+
+def to_builtins(value):
+	# Typed rows are not JSON serialisable on their own
+	if hasattr(value, "_asdict"):
+		return value._asdict()
+	if dataclasses.is_dataclass(value) and not isinstance(value, type):
+		return dataclasses.asdict(value)
+	if msgspec is not None and isinstance(value, msgspec.Struct):
+		return msgspec.structs.asdict(value)
+	if hasattr(value, "to_list"):
+		return list(value.to_list())
+	raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def row_fields(row_type):
+	if hasattr(row_type, "_fields"):
+		return row_type._fields
+	if hasattr(row_type, "__struct_fields__"):
+		return row_type.__struct_fields__
+	if dataclasses.is_dataclass(row_type):
+		return tuple(field.name for field in dataclasses.fields(row_type))
+	raise TypeError(f"{row_type!r} is not a namedtuple, dataclass or msgspec Struct.")
+
+
+class JsonCodec:
+	"""
+	Standard library codec, used when neither orjson nor msgspec is installed.
+	"""
+
+	name = "json"
+
+	def loads(self, data):
+		return json.loads(data)
+
+	def prepare(self, value):
+		# json and msgspec write named tuples as arrays without asking default, so typed rows are converted first
+		if isinstance(value, list) and value and hasattr(value[0], "_asdict"):
+			return [row._asdict() if hasattr(row, "_asdict") else row for row in value]
+		return value
+
+	def dumps(self, value) -> str:
+		return json.dumps(self.prepare(value), default=to_builtins)
+
+	def encode(self, value) -> bytes:
+		return json.dumps(self.prepare(value), default=to_builtins, separators=(",", ":")).encode()
+
+	def decode_rows(self, data, row_type, key: str = "record", table_name: str = None) -> List[Any]:
+		# Imported here as Response uses the codec for to_json
+		from .response import Response
+		response = Response(self.loads(data), key, self)
+		if table_name:
+			response.table_name = table_name.lower()
+		response.squash_table_response()
+		rows = [] if response.is_empty() else response.to_list()
+		fields = row_fields(row_type)
+		return [row_type(**{field: row.get(field) for field in fields}) for row in rows]
+
+
+class OrjsonCodec(JsonCodec):
+	name = "orjson"
+
+	def loads(self, data):
+		return orjson.loads(data)
+
+	def dumps(self, value) -> str:
+		return orjson.dumps(value, default=to_builtins).decode()
+
+	def encode(self, value) -> bytes:
+		return orjson.dumps(value, default=to_builtins)
+
+
+class MsgspecCodec(JsonCodec):
+	"""
+	Decodes table pages straight into msgspec Structs without building a dict per row.
+	PowerSchool sends every column as a string, so fields are converted leniently ("12" -> 12).
+	"""
+
+	name = "msgspec"
+
+	def __init__(self):
+		self.decoder = msgspec.json.Decoder()
+		self.encoder = msgspec.json.Encoder(enc_hook=to_builtins)
+		self.page_decoders: Dict[tuple, Any] = {}
+
+	def loads(self, data):
+		return self.decoder.decode(data if isinstance(data, (bytes, bytearray, memoryview)) else data.encode())
+
+	def dumps(self, value) -> str:
+		return self.encoder.encode(self.prepare(value)).decode()
+
+	def encode(self, value) -> bytes:
+		return self.encoder.encode(self.prepare(value))
+
+	def page_decoder(self, row_type, key, tables):
+		cache_key = (row_type, key, tables)
+		decoder = self.page_decoders.get(cache_key)
+		if decoder is None:
+			row = msgspec.defstruct("Record", [("tables", Dict[str, row_type], {})]) if tables else row_type
+			fields = [(key, List[row], [])]
+			if tables:
+				# A single record (/ws/schema/table/{table}/{id}) carries its tables at the top level
+				fields.append(("tables", Dict[str, row_type], {}))
+			page = msgspec.defstruct("Page", fields)
+			decoder = self.page_decoders[cache_key] = msgspec.json.Decoder(page, strict=False)
+		return decoder
+
+	def decode_rows(self, data, row_type, key: str = "record", table_name: str = None) -> List[Any]:
+		# v1 resources nest rows under "<key>s", which is left to the generic path
+		if not hasattr(row_type, "__struct_fields__") or key.lower() != "record":
+			return super().decode_rows(data, row_type, key, table_name)
+		page = self.page_decoder(row_type, key.lower(), bool(table_name)).decode(data)
+		records = getattr(page, key.lower())
+		if not table_name:
+			return records
+		if not records and page.tables:
+			return list(page.tables.values())
+		return [row for record in records for row in record.tables.values()]
+
+
+CODECS = {"json": JsonCodec, "orjson": OrjsonCodec, "msgspec": MsgspecCodec}
+default_codec = None
+
+
+def get_codec(codec=None) -> JsonCodec:
+	"""
+	Returns a codec instance. `codec` can be an instance, one of "orjson", "msgspec" or "json",
+	or None for the fastest installed one.
+	"""
+	global default_codec
+	if isinstance(codec, JsonCodec):
+		return codec
+	if codec is not None:
+		if codec == "orjson" and orjson is None or codec == "msgspec" and msgspec is None:
+			raise ImportError(f"The {codec} codec needs the {codec} package. Install it with: pip install powerschool-adapter[fast]")
+		return CODECS[codec]()
+	if default_codec is None:
+		default_codec = OrjsonCodec() if orjson is not None else MsgspecCodec() if msgspec is not None else JsonCodec()
+	return default_codec
+
+
+def set_default_codec(codec):
+	global default_codec
+	default_codec = get_codec(codec) if codec is not None else None
+	return default_codec
@@ -0,0 +1,156 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import keyword
+import re
+from collections import namedtuple
+from collections.abc import Mapping, Sequence
+
+
+def row_type_for(columns):
+	# PowerQuery columns look like "students.dcid", so names are made into identifiers first
+	fields = [re.sub(r"\W", "_", column) for column in columns]
+	fields = [f"{field}_" if keyword.iskeyword(field) else field for field in fields]
+	return namedtuple("Row", fields, rename=True)
+
+
+class Columnar:
+	"""
+	Rows stored as slotted named tuples sharing one schema instead of one dict per row.
+	to_list()/to_dict() return lazy dict views, and column() returns one column as a list.
+	"""
+
+	__slots__ = ("columns", "row_type", "rows")
+
+	def __init__(self, columns=(), rows=None):
+		self.columns = tuple(columns)
+		self.row_type = row_type_for(self.columns)
+		self.rows = rows if rows is not None else []
+
+	@classmethod
+	def from_dicts(cls, dicts, columns=None):
+		dicts = dicts if isinstance(dicts, list) else list(dicts)
+		if not columns:
+			# Null columns are left out of PowerSchool rows, so the schema is the union of every row's keys
+			columns = dict.fromkeys(key for row in dicts for key in row)
+		columnar = cls(columns)
+		columnar.extend(dicts)
+		return columnar
+
+	def widen(self, columns):
+		"""
+		Appends the columns missing from the schema, as None in the rows already held.
+		"""
+		added = tuple(column for column in columns if column not in self.columns)
+		if added:
+			padding = (None,) * len(added)
+			self.columns += added
+			self.row_type = row_type_for(self.columns)
+			make = self.row_type._make
+			self.rows = [make(row + padding) for row in self.rows]
+		return self
+
+	def extend(self, rows):
+		if isinstance(rows, Columnar):
+			if rows.columns == self.columns:
+				self.rows.extend(rows.rows)
+				return self
+			rows = rows.to_list()
+		make = self.row_type._make
+		columns = self.columns
+		self.rows.extend(make([row.get(column) for column in columns]) for row in rows)
+		return self
+
+	def column(self, name):
+		index = self.columns.index(name)
+		return [row[index] for row in self.rows]
+
+	def to_columns(self):
+		return {column: list(values) for column, values in zip(self.columns, zip(*self.rows))} if self.rows else {column: [] for column in self.columns}
+
+	def to_list(self):
+		return RowListView(self)
+
+	def to_dict(self, key="id"):
+		return RowDictView(self, key)
+
+	def __len__(self):
+		return len(self.rows)
+
+	def __iter__(self):
+		return iter(self.rows)
+
+	def __getitem__(self, index):
+		return self.rows[index]
+
+	def __bool__(self):
+		return bool(self.rows)
+
+	def __repr__(self):
+		return f"Columnar(columns={list(self.columns)}, rows={len(self.rows)})"
+
+
+class RowListView(Sequence):
+	"""
+	Read-only list of dicts built on access from a Columnar.
+	"""
+
+	__slots__ = ("columnar",)
+
+	def __init__(self, columnar):
+		self.columnar = columnar
+
+	def __len__(self):
+		return len(self.columnar.rows)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [dict(zip(self.columnar.columns, row)) for row in self.columnar.rows[index]]
+		return dict(zip(self.columnar.columns, self.columnar.rows[index]))
+
+
+class RowDictView(Mapping):
+	"""
+	Read-only mapping of str(row[key]) -> dict built on access from a Columnar.
+	"""
+
+	__slots__ = ("columnar", "key", "index")
+
+	def __init__(self, columnar, key="id"):
+		self.columnar = columnar
+		self.key = key
+		self.index = None
+
+	def build_index(self):
+		if self.index is None:
+			position = self.columnar.columns.index(self.key) if self.key in self.columnar.columns else None
+			if position is None:
+				self.index = {str(i): i for i in range(len(self.columnar.rows))}
+			else:
+				self.index = {str(row[position]): i for i, row in enumerate(self.columnar.rows)}
+		return self.index
+
+	def __getitem__(self, key):
+		return dict(zip(self.columnar.columns, self.columnar.rows[self.build_index()[key]]))
+
+	def __iter__(self):
+		return iter(self.build_index())
+
+	def __len__(self):
+		return len(self.build_index())
@@ -0,0 +1,241 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import re
+import sys
+from datetime import date, datetime
+
+# pyarrow is heavy, so it is only imported once an export is requested
+pyarrow = None
+
+INTEGER = re.compile(r"^-?\d+$")
+FLOAT = re.compile(r"^-?(\d+\.\d*|\.\d+|\d+)([eE][-+]?\d+)?$")
+DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?$")
+# Zero-padded numbers such as zip codes and student numbers are identifiers, not numbers
+ZERO_PADDED = re.compile(r"^-?0\d")
+BOOLEANS = {"1": True, "0": False, "true": True, "false": False}
+# A column whose values stop fitting its type moves to the next wider type, or to string
+WIDER = {"int": "float", "date": "timestamp"}
+
+
+def require_pyarrow():
+	global pyarrow
+	if pyarrow is None:
+		try:
+			import pyarrow.parquet
+		except ImportError:
+			raise ImportError("Exporting requires pyarrow. Install it with: pip install powerschool-adapter[export]")
+		pyarrow = sys.modules["pyarrow"]
+	return pyarrow
+
+
+def parse_timestamp(value):
+	return datetime.fromisoformat(value.replace(" ", "T"))
+
+
+def parse_bool(value):
+	return BOOLEANS[str(value).lower()]
+
+
+class ArrowExporter:
+	"""
+	Turns PowerSchool rows, whose values arrive as strings, into typed Arrow record batches.
+	Column types are inferred from the first batch (int, float, date, timestamp, bool for
+	true/false, otherwise string) and can be forced with types, e.g. {"enrolled": "bool"} to read
+	"1"/"0" flags. When a later batch does not fit, the column is widened (int to float, date to
+	timestamp, otherwise string) and the batches already produced are cast to the wider schema.
+	Without columns, columns first seen in a later batch are appended. Columns that never hold
+	a value are typed null.
+	"""
+
+	TYPES = {
+		"int": (lambda: pyarrow.int64(), int),
+		"float": (lambda: pyarrow.float64(), float),
+		"date": (lambda: pyarrow.date32(), date.fromisoformat),
+		"timestamp": (lambda: pyarrow.timestamp("us"), parse_timestamp),
+		"bool": (lambda: pyarrow.bool_(), parse_bool),
+		"string": (lambda: pyarrow.string(), str),
+		"null": (lambda: pyarrow.null(), None),
+	}
+
+	def __init__(self, columns=None, types=None):
+		require_pyarrow()
+		self.columns = [column.lower() for column in columns] if columns else None
+		self.types = {column.lower(): kind for column, kind in (types or {}).items()}
+		self.kinds = None
+		self.schema = None
+
+	@staticmethod
+	def matches(kind, value):
+		if kind == "int":
+			return bool(INTEGER.match(value)) and str(int(value)) == value
+		if kind == "float":
+			return bool(FLOAT.match(value)) and not ZERO_PADDED.match(value)
+		if kind == "date":
+			return bool(DATE.match(value))
+		if kind == "timestamp":
+			return bool(TIMESTAMP.match(value) or DATE.match(value))
+		if kind == "bool":
+			return value.lower() in ("true", "false")
+		return True
+
+	def present(self, values):
+		return [str(value) for value in values if value not in (None, "")]
+
+	def infer_kind(self, values):
+		values = self.present(values)
+		if not values:
+			# Typed by the first batch that holds a value
+			return "null"
+		for kind in ("int", "float", "date", "timestamp", "bool"):
+			if all(self.matches(kind, value) for value in values):
+				return kind
+		return "string"
+
+	def widen_kind(self, kind, values):
+		values = self.present(values)
+		if kind == "null":
+			return self.infer_kind(values)
+		while not all(self.matches(kind, value) for value in values):
+			kind = WIDER.get(kind, "string")
+		return kind
+
+	def build_schema(self):
+		self.schema = pyarrow.schema([(column, self.TYPES[kind][0]()) for column, kind in self.kinds.items()])
+
+	def prepare(self, rows):
+		columns = self.columns or list(dict.fromkeys(key for row in rows for key in row))
+		self.kinds = {
+			column: self.types.get(column) or self.infer_kind(row.get(column) for row in rows)
+			for column in columns
+		}
+		self.build_schema()
+
+	def widen(self, rows):
+		"""
+		Fits the schema to a later batch. Returns True when it changed.
+		"""
+		kinds = dict(self.kinds)
+		if self.columns is None:
+			for column in dict.fromkeys(key for row in rows for key in row):
+				if column not in kinds:
+					kinds[column] = self.types.get(column) or self.infer_kind(row.get(column) for row in rows)
+		for column, kind in kinds.items():
+			# Forced types are kept; values that do not convert are reported by convert()
+			if column not in self.types:
+				kinds[column] = self.widen_kind(kind, (row.get(column) for row in rows))
+		if kinds == self.kinds:
+			return False
+		self.kinds = kinds
+		self.build_schema()
+		return True
+
+	def conform(self, batch):
+		"""
+		Casts a batch made under an earlier schema to the current one.
+		"""
+		if batch.schema.equals(self.schema):
+			return batch
+		names = batch.schema.names
+		arrays = [
+			batch.column(field.name).cast(field.type) if field.name in names else pyarrow.nulls(batch.num_rows, field.type)
+			for field in self.schema
+		]
+		return pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+	def convert(self, column, kind, value):
+		if value in (None, ""):
+			return None
+		try:
+			return self.TYPES[kind][1](value)
+		except (ValueError, KeyError):
+			raise ValueError(f"Column '{column}' was given the type {kind} but holds '{value}'.")
+
+	def record_batch(self, rows):
+		if self.schema is None:
+			self.prepare(rows)
+		else:
+			self.widen(rows)
+		arrays = [
+			pyarrow.array([self.convert(column, kind, row.get(column)) for row in rows], type=self.schema.field(column).type)
+			for column, kind in self.kinds.items()
+		]
+		return pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+	def record_batches(self, pages):
+		"""
+		Yields one batch per page. A batch carries a wider schema than the ones before it when
+		its page did not fit; conform() casts the earlier batches.
+		"""
+		for rows in pages:
+			rows = rows.to_list() if hasattr(rows, "to_list") else rows
+			if len(rows):
+				yield self.record_batch(rows)
+
+	def to_table(self, pages):
+		batches = list(self.record_batches(pages))
+		if not batches:
+			return pyarrow.table({column: [] for column in self.columns or []})
+		return pyarrow.Table.from_batches([self.conform(batch) for batch in batches], schema=self.schema)
+
+	def to_pandas(self, pages):
+		return self.to_table(pages).to_pandas()
+
+	def widened_writer(self, source, target, **options):
+		# A Parquet file has one schema, so the batches written so far are copied under the wider one
+		writer = pyarrow.parquet.ParquetWriter(target, self.schema, **options)
+		for batch in pyarrow.parquet.ParquetFile(source).iter_batches():
+			writer.write_batch(self.conform(batch))
+		os.remove(source)
+		return writer
+
+	def to_parquet(self, path, pages, **options):
+		"""
+		Writes each page as it arrives into a temporary file that replaces path once every page is
+		written, so a failed export never leaves a truncated file. Returns the number of rows written.
+		"""
+		path = os.fspath(path)
+		partial, widened = f"{path}.partial", f"{path}.widened"
+		target, writer, rows = partial, None, 0
+		try:
+			for batch in self.record_batches(pages):
+				if writer is None:
+					writer = pyarrow.parquet.ParquetWriter(target, self.schema, **options)
+				elif not batch.schema.equals(writer.schema):
+					writer.close()
+					source, target = target, widened if target == partial else partial
+					writer = self.widened_writer(source, target, **options)
+				writer.write_batch(batch)
+				rows += batch.num_rows
+			if writer is not None:
+				writer.close()
+				writer = None
+				os.replace(target, path)
+		except BaseException:
+			if writer is not None:
+				writer.close()
+			for leftover in (partial, widened):
+				if os.path.exists(leftover):
+					os.remove(leftover)
+			raise
+		if not rows and self.columns:
+			pyarrow.parquet.write_table(self.to_table([]), path, **options)
+		return rows
@@ -0,0 +1,355 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import re
+from datetime import date, datetime
+from urllib.parse import quote
+
+from .operator import Operator
+
+# Values holding FIQL syntax characters or whitespace are quoted
+RESERVED = re.compile(r"[\s\"'();,=!~<>]")
+
+
+def format_value(value, wildcard=False):
+	if isinstance(value, Wildcard):
+		return str(value)
+	if isinstance(value, bool):
+		# PowerSchool stores flags as 1/0 numbers
+		return "1" if value else "0"
+	if isinstance(value, datetime):
+		return value.strftime("%Y-%m-%dT%H:%M:%S")
+	if isinstance(value, date):
+		return value.isoformat()
+	if isinstance(value, (int, float)):
+		return str(value)
+	value = "" if value is None else str(value)
+	suffix = Operator.WILDCARD if wildcard else ""
+	if not value or RESERVED.search(value):
+		return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + suffix + '"'
+	return value + suffix
+
+
+def format_list(values):
+	return "(" + ",".join(format_value(value) for value in values) + ")"
+
+
+class Param:
+	"""
+	Placeholder filled in when a compiled Template is rendered.
+	"""
+
+	__slots__ = ("name",)
+
+	def __init__(self, name):
+		self.name = name
+
+	def __repr__(self):
+		return f"Param({self.name!r})"
+
+
+class Slot:
+	__slots__ = ("name", "many", "splittable")
+
+	def __init__(self, name, many, splittable):
+		self.name = name
+		self.many = many
+		self.splittable = splittable
+
+
+class Expression:
+	"""
+	Immutable FIQL expression. Combine with & (and) and | (or), then compile() once into a
+	Template that renders with parameters, or render() directly.
+	"""
+
+	__slots__ = ()
+
+	def __and__(self, other):
+		return Group(Operator.AND, (self, other))
+
+	def __or__(self, other):
+		return Group(Operator.OR, (self, other))
+
+	def parts(self, splittable):
+		raise NotImplementedError
+
+	def compile(self):
+		defaults, parts = {}, []
+		for part in self.parts(True):
+			if isinstance(part, tuple):
+				# Literal in-lists become implicit parameters so they can be split too
+				name = f"_in{len(defaults)}"
+				defaults[name] = list(part[1])
+				part = Slot(name, True, part[0])
+			parts.append(part)
+		return Template(merge_literals(parts), defaults)
+
+	def render(self, **params):
+		return self.compile().render(**params)
+
+	def __str__(self):
+		return self.render()
+
+	def __repr__(self):
+		return f"{type(self).__name__}({self.compile().source()})"
+
+
+class Comparison(Expression):
+	__slots__ = ("field", "operator", "value", "wildcard")
+
+	def __init__(self, field, operator, value, wildcard=False):
+		self.field = field
+		self.operator = operator
+		self.value = value
+		self.wildcard = wildcard
+
+	def parts(self, splittable):
+		prefix = f"{self.field}{self.operator}"
+		if isinstance(self.value, Param):
+			return [prefix, Slot(self.value.name, False, False)]
+		return [prefix + format_value(self.value, self.wildcard)]
+
+
+class Membership(Expression):
+	__slots__ = ("field", "values")
+
+	def __init__(self, field, values):
+		self.field = field
+		self.values = values if isinstance(values, Param) else tuple(values)
+
+	def parts(self, splittable):
+		prefix = f"{self.field}{Operator.IN}"
+		if isinstance(self.values, Param):
+			return [prefix, Slot(self.values.name, True, splittable)]
+		return [prefix, (splittable, self.values)]
+
+
+class Group(Expression):
+	__slots__ = ("operator", "children")
+
+	def __init__(self, operator, children):
+		flattened = []
+		for child in children:
+			# a & (b & c) is written a;b;c
+			if isinstance(child, Group) and child.operator == operator:
+				flattened.extend(child.children)
+			else:
+				flattened.append(child)
+		self.operator = operator
+		self.children = tuple(flattened)
+
+	def parts(self, splittable):
+		# Only lists under a chain of ands can be split without changing the result
+		splittable = splittable and self.operator == Operator.AND
+		parts = []
+		for index, child in enumerate(self.children):
+			if index:
+				parts.append(self.operator)
+			child_parts = child.parts(splittable)
+			# And binds tighter than or, so an or nested in an and needs parentheses
+			if self.operator == Operator.AND and isinstance(child, Group) and child.operator == Operator.OR:
+				child_parts = ["(", *child_parts, ")"]
+			parts.extend(child_parts)
+		return parts
+
+
+class Raw(Expression):
+	"""
+	FIQL text written by hand, such as the q already set on a query. Kept in parentheses so an
+	or inside it cannot capture the rest of the filter; its in-lists are never split.
+	"""
+
+	__slots__ = ("text",)
+
+	def __init__(self, text):
+		self.text = text
+
+	def parts(self, splittable):
+		return ["(", self.text, ")"]
+
+
+class Compiled(Expression):
+	"""
+	A compiled Template used as an expression again, so it can be combined with others.
+	"""
+
+	__slots__ = ("template",)
+
+	def __init__(self, template):
+		self.template = template
+
+	def parts(self, splittable):
+		defaults, parts = self.template.defaults, []
+		for part in self.template.parts:
+			if isinstance(part, Slot) and part.name in defaults:
+				# Implicit lists go back to literals and are renamed when the combination is compiled
+				part = (part.splittable and splittable, defaults[part.name])
+			elif isinstance(part, Slot):
+				part = Slot(part.name, part.many, part.splittable and splittable)
+			parts.append(part)
+		return parts
+
+
+def merge_literals(parts):
+	merged = []
+	for part in parts:
+		if isinstance(part, str) and merged and isinstance(merged[-1], str):
+			merged[-1] += part
+		else:
+			merged.append(part)
+	return tuple(merged)
+
+
+def and_(*expressions):
+	return Group(Operator.AND, expressions)
+
+
+def or_(*expressions):
+	return Group(Operator.OR, expressions)
+
+
+class Field:
+	"""
+	Builds comparisons on one column: Field("grade_level").ge(9) & Field("id").in_(Param("ids")).
+	Values are formatted by type (dates as YYYY-MM-DD, booleans as 1/0) and quoted when needed.
+	"""
+
+	__slots__ = ("name",)
+
+	def __init__(self, name):
+		self.name = name
+
+	def eq(self, value):
+		return Comparison(self.name, Operator.EQUALS, value)
+
+	def ne(self, value):
+		return Comparison(self.name, Operator.NOT_EQUALS, value)
+
+	def gt(self, value):
+		return Comparison(self.name, Operator.GREATER_THAN, value)
+
+	def ge(self, value):
+		return Comparison(self.name, Operator.GREATER_THAN_OR_EQUAL, value)
+
+	def lt(self, value):
+		return Comparison(self.name, Operator.LESS_THAN, value)
+
+	def le(self, value):
+		return Comparison(self.name, Operator.LESS_THAN_OR_EQUAL, value)
+
+	def in_(self, values):
+		return Membership(self.name, values)
+
+	def between(self, low, high):
+		return Group(Operator.AND, (self.ge(low), self.le(high)))
+
+	def startswith(self, prefix):
+		return Comparison(self.name, Operator.EQUALS, prefix, wildcard=True)
+
+	def like(self, pattern):
+		# The pattern's own * are kept as wildcards, everything else is escaped
+		*head, tail = str(pattern).split(Operator.WILDCARD)
+		if head:
+			return Comparison(self.name, Operator.EQUALS, Wildcard(head + [tail]))
+		return self.eq(pattern)
+
+
+class Wildcard(str):
+	__slots__ = ()
+
+	def __new__(cls, pieces):
+		value = Operator.WILDCARD.join(pieces)
+		if RESERVED.search(value):
+			value = '"' + Operator.WILDCARD.join(piece.replace("\\", "\\\\").replace('"', '\\"') for piece in pieces) + '"'
+		return super().__new__(cls, value)
+
+
+class Template:
+	"""
+	A compiled expression: literal text with parameter slots, rendered by joining strings.
+	split() renders one q per chunk of the largest splittable in-list so every request URL
+	stays under a length budget.
+	"""
+
+	__slots__ = ("parts", "defaults", "slots")
+
+	def __init__(self, parts, defaults=None):
+		self.parts = parts
+		self.defaults = defaults or {}
+		self.slots = {part.name: part for part in parts if isinstance(part, Slot)}
+
+	def source(self):
+		return "".join(part if isinstance(part, str) else f"{{{part.name}}}" for part in self.parts)
+
+	def render(self, **params):
+		values = {**self.defaults, **params} if self.defaults else params
+		rendered = []
+		for part in self.parts:
+			if isinstance(part, str):
+				rendered.append(part)
+			elif part.name not in values:
+				raise KeyError(f"Missing value for parameter '{part.name}'.")
+			elif part.many:
+				rendered.append(format_list(values[part.name]))
+			else:
+				rendered.append(format_value(values[part.name]))
+		return "".join(rendered)
+
+	def __str__(self):
+		return self.render()
+
+	def split_param(self, params):
+		values = {**self.defaults, **params}
+		names = [name for name, slot in self.slots.items() if slot.splittable and name in values]
+		return max(names, key=lambda name: len(values[name]), default=None)
+
+	def chunks(self, values, budget, max_items=None):
+		"""
+		Groups values so each rendered list costs at most budget URL-encoded characters.
+		Raises ValueError when a single value is over budget on its own.
+		"""
+		chunks, current, length = [], [], 0
+		for value in values:
+			cost = len(quote(format_value(value), safe="")) + 1
+			if cost > budget:
+				raise ValueError(f"The value {value!r} does not fit in {budget} characters.")
+			if current and (length + cost > budget or (max_items and len(current) >= max_items)):
+				chunks.append(current)
+				current, length = [], 0
+			current.append(value)
+			length += cost
+		if current:
+			chunks.append(current)
+		return chunks
+
+	def split(self, budget, max_items=None, **params):
+		"""
+		Returns the rendered expressions, one per chunk of the splittable in-list, each within budget
+		URL-encoded characters. Raises ValueError when no single value fits.
+		"""
+		name = self.split_param(params)
+		rendered = self.render(**params)
+		if name is None or (len(quote(rendered, safe="=&,;()*")) <= budget and not max_items):
+			return [rendered]
+		values = list(dict.fromkeys({**self.defaults, **params}[name]))
+		base = len(quote(self.render(**{**params, name: []}), safe="=&,;()*"))
+		if base >= budget:
+			raise ValueError(f"The expression does not fit in {budget} characters even without '{name}' values.")
+		return [self.render(**{**params, name: chunk}) for chunk in self.chunks(values, budget - base, max_items)]
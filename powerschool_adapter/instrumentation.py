@@ -0,0 +1,214 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+
+try:
+	from opentelemetry import trace
+except ImportError:  # pragma: no cover - optional dependency
+	trace = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; the last bucket catches everything slower
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Ids in paths are folded so /ws/v1/student/12 and /ws/v1/student/13 share a histogram
+PATH_ID = re.compile(r"/\d+(?=/|$)")
+
+
+class Histogram:
+	"""
+	Fixed-bucket latency histogram. Quantiles are estimated as the upper bound of the bucket they fall in.
+	"""
+
+	__slots__ = ("buckets", "counts", "count", "total", "max")
+
+	def __init__(self, buckets=LATENCY_BUCKETS):
+		self.buckets = tuple(buckets)
+		self.counts = [0] * (len(self.buckets) + 1)
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+
+	def observe(self, value):
+		self.counts[bisect.bisect_left(self.buckets, value)] += 1
+		self.count += 1
+		self.total += value
+		self.max = max(self.max, value)
+
+	def quantile(self, q):
+		if not self.count:
+			return None
+		rank = q * self.count
+		seen = 0
+		for index, count in enumerate(self.counts):
+			seen += count
+			if seen >= rank and count:
+				return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+		return self.max
+
+	def summary(self):
+		return {
+			"count": self.count,
+			"mean": self.total / self.count if self.count else None,
+			"p50": self.quantile(0.5),
+			"p90": self.quantile(0.9),
+			"p99": self.quantile(0.99),
+			"max": self.max if self.count else None,
+		}
+
+
+class EndpointStats:
+	__slots__ = ("latency", "requests", "errors", "bytes_in", "bytes_out", "rows")
+
+	def __init__(self, buckets):
+		self.latency = Histogram(buckets)
+		self.requests = 0
+		self.errors = 0
+		self.bytes_in = 0
+		self.bytes_out = 0
+		self.rows = 0
+
+	def summary(self):
+		return {
+			"requests": self.requests, "errors": self.errors, "bytes_in": self.bytes_in,
+			"bytes_out": self.bytes_out, "rows": self.rows, "latency": self.latency.summary(),
+		}
+
+
+class Instrumentation:
+	"""
+	Collects per-endpoint latency histograms, bytes in/out, decoded rows, retries and token
+	refreshes for a Request, calls before/after hooks around every call and, when
+	opentelemetry is installed and tracing is on, wraps each call in a client span.
+	Hooks receive one event dict, like RetryPolicy hooks.
+	"""
+
+	def __init__(self, buckets=LATENCY_BUCKETS, tracing=True, tracer=None, before_request=None, after_request=None):
+		self.buckets = buckets
+		if tracer is None and tracing and trace is not None:
+			tracer = trace.get_tracer("powerschool_adapter")
+		self.tracer = tracer
+		self.before_hooks = list(before_request or [])
+		self.after_hooks = list(after_request or [])
+		self.lock = threading.Lock()
+		self.reset()
+
+	def reset(self):
+		with self.lock:
+			self.endpoints = {}
+			self.counters = {"retries": 0, "auth_refreshes": 0, "token_fetches": 0}
+
+	def before_request(self, hook):
+		self.before_hooks.append(hook)
+		return hook
+
+	def after_request(self, hook):
+		self.after_hooks.append(hook)
+		return hook
+
+	def endpoint_key(self, endpoint):
+		return PATH_ID.sub("/{id}", endpoint.split("?", 1)[0])
+
+	def endpoint_stats(self, key):
+		stats = self.endpoints.get(key)
+		if stats is None:
+			stats = self.endpoints[key] = EndpointStats(self.buckets)
+		return stats
+
+	def start(self, method, endpoint, options):
+		event = {"method": method, "endpoint": endpoint, "key": self.endpoint_key(endpoint), "options": options}
+		for hook in self.before_hooks:
+			hook(event)
+		if self.tracer is not None:
+			event["span"] = self.tracer.start_span(f"{method} {event['key']}", kind=trace.SpanKind.CLIENT, attributes={
+				"http.request.method": method, "url.path": endpoint,
+			})
+		event["started"] = time.perf_counter()
+		return event
+
+	def finish(self, event, response=None, error=None):
+		elapsed = time.perf_counter() - event.pop("started")
+		options = event.pop("options")
+		if response is None and error is not None:
+			response = getattr(error, "response", None)
+		body = options.get("data") or options.get("content") or b""
+		event.update({
+			"elapsed": elapsed,
+			"status": getattr(response, "status_code", None),
+			"bytes_out": len(body) if isinstance(body, (bytes, str)) else 0,
+			"bytes_in": self.response_size(response, options),
+			"error": error,
+		})
+		with self.lock:
+			stats = self.endpoint_stats(event["key"])
+			stats.latency.observe(elapsed)
+			stats.requests += 1
+			stats.errors += error is not None
+			stats.bytes_in += event["bytes_in"]
+			stats.bytes_out += event["bytes_out"]
+		span = event.pop("span", None)
+		if span is not None:
+			if event["status"] is not None:
+				span.set_attribute("http.response.status_code", event["status"])
+			if error is not None:
+				span.record_exception(error)
+				span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+			span.end()
+		for hook in self.after_hooks:
+			hook(event)
+		logger.debug("%s %s -> %s in %.3fs (%d bytes)", event["method"], event["endpoint"], event["status"], elapsed, event["bytes_in"])
+		return event
+
+	def response_size(self, response, options):
+		if response is None:
+			return 0
+		# Reading a streamed body here would consume it
+		if options.get("stream"):
+			return int(response.headers.get("Content-Length") or 0)
+		return len(response.content)
+
+	def record_rows(self, endpoint, rows):
+		with self.lock:
+			self.endpoint_stats(self.endpoint_key(endpoint)).rows += rows
+
+	def record_retry(self, event):
+		with self.lock:
+			self.counters["retries"] += 1
+
+	def record_auth_refresh(self):
+		with self.lock:
+			self.counters["auth_refreshes"] += 1
+
+	def record_token_fetch(self):
+		with self.lock:
+			self.counters["token_fetches"] += 1
+
+	def get_stats(self):
+		with self.lock:
+			endpoints = {key: stats.summary() for key, stats in self.endpoints.items()}
+			stats = dict(self.counters)
+		for total in ("requests", "errors", "bytes_in", "bytes_out", "rows"):
+			stats[total] = sum(endpoint[total] for endpoint in endpoints.values())
+		stats["endpoints"] = endpoints
+		return stats
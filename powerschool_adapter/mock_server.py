@@ -0,0 +1,616 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+FIRST_NAMES = ("Ada", "Grace", "Linus", "Alan", "Barbara", "Edsger", "Margaret", "Dennis", "Frances", "Ken", "Radia", "Tim")
+LAST_NAMES = ("Lovelace", "Hopper", "Torvalds", "Turing", "Liskov", "Dijkstra", "Hamilton", "Ritchie", "Allen", "Thompson", "Perlman", "Lee")
+
+
+# One call received by MockPowerSchool: target is the raw request line path, query string included
+MockRequest = namedtuple("MockRequest", ["method", "target", "path", "params", "body"])
+
+
+class Dataset:
+	"""
+	In-memory tables served by MockPowerSchool. Rows are dicts of lower case column -> string,
+	as PowerSchool returns them. Every write bumps the data version and records the change.
+	"""
+
+	def __init__(self, tables=None):
+		self.tables = {name.lower(): list(rows) for name, rows in (tables or {}).items()}
+		self.named_queries = {}
+		self.version = 1
+		self.changes = []
+		self.next_ids = {}
+		self.lock = threading.Lock()
+
+	@classmethod
+	def synthetic(cls, students=1000, schools=4, enrollments_per_student=4, seed=0):
+		"""
+		Generates students, schools and cc (section enrollment) tables of the given sizes.
+		"""
+		rng = random.Random(seed)
+		school_rows = [
+			{"id": str(i), "school_number": str(100 * i), "name": f"School {i}", "low_grade": "0", "high_grade": "12"}
+			for i in range(1, schools + 1)
+		]
+		student_rows, cc_rows = [], []
+		start = date(2020, 8, 1)
+		for i in range(1, students + 1):
+			student_rows.append({
+				"id": str(i), "dcid": str(i + 10000), "student_number": str(100000 + i),
+				"first_name": rng.choice(FIRST_NAMES), "last_name": rng.choice(LAST_NAMES),
+				"grade_level": str(rng.randint(0, 12)), "schoolid": school_rows[i % schools]["school_number"] if schools else "0",
+				"enroll_status": rng.choice("0000000023"), "gender": rng.choice("FM"),
+				"entrydate": (start + timedelta(days=rng.randint(0, 1500))).isoformat(),
+			})
+			for _ in range(enrollments_per_student):
+				cc_rows.append({
+					"id": str(len(cc_rows) + 1), "studentid": str(i), "sectionid": str(rng.randint(1, 500)),
+					"termid": str(rng.choice((3400, 3401, 3402, 3500, 3501))), "schoolid": student_rows[-1]["schoolid"],
+				})
+		dataset = cls({"students": student_rows, "schools": school_rows, "cc": cc_rows})
+		dataset.add_named_query("com.mock.students.by_grade", dataset.students_by_grade)
+		return dataset
+
+	def students_by_grade(self, args):
+		grade = args.get("grade_level")
+		return [
+			{"students.id": row["id"], "students.dcid": row["dcid"], "students.last_name": row["last_name"], "students.grade_level": row["grade_level"]}
+			for row in self.tables.get("students", []) if grade in (None, "", row["grade_level"])
+		]
+
+	def add_named_query(self, name, function):
+		# function(arguments) returns the flat rows of the PowerQuery
+		self.named_queries[name.lower()] = function
+		return self
+
+	def columns(self, table):
+		rows = self.tables[table]
+		return list(dict.fromkeys(column for row in rows[:100] for column in row)) if rows else ["id"]
+
+	def find(self, table, row_id):
+		return next((row for row in self.tables[table] if row.get("id") == str(row_id)), None)
+
+	def record_change(self, table, row_id):
+		self.version += 1
+		self.changes.append((self.version, table, str(row_id)))
+
+	def insert(self, table, values):
+		with self.lock:
+			rows = self.tables.setdefault(table, [])
+			if table not in self.next_ids:
+				self.next_ids[table] = max((int(row["id"]) for row in rows if str(row.get("id", "")).isdigit()), default=0) + 1
+			row_id = str(self.next_ids[table])
+			self.next_ids[table] += 1
+			rows.append({"id": row_id, **{key.lower(): str(value) for key, value in values.items()}})
+			self.record_change(table, row_id)
+			return row_id
+
+	def update(self, table, row_id, values):
+		with self.lock:
+			row = self.find(table, row_id)
+			if row is None:
+				return False
+			row.update({key.lower(): str(value) for key, value in values.items()})
+			self.record_change(table, row_id)
+			return True
+
+	def delete(self, table, row_id):
+		with self.lock:
+			row = self.find(table, row_id)
+			if row is None:
+				return False
+			self.tables[table].remove(row)
+			self.record_change(table, row_id)
+			return True
+
+	def changes_since(self, version):
+		tables = {}
+		for changed, table, row_id in self.changes:
+			if changed > version:
+				ids = tables.setdefault(table.upper(), [])
+				if int(row_id) not in ids:
+					ids.append(int(row_id))
+		return {"$dataversion": str(self.version), "tables": tables}
+
+
+class Filter:
+	"""
+	Evaluates FIQL filters (==, !=, =gt=, =ge=, =lt=, =le=, =in=, =out=, ; and , with parentheses)
+	against flat rows. * in == and != values is a case insensitive wildcard.
+	"""
+
+	TOKEN = re.compile(r'\s*(?:(?P<open>\()|(?P<close>\))|(?P<and>;)|(?P<or>,)|(?P<comparison>[\w.]+(?:==|!=|=[a-z]+=)))')
+	VALUE = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'|([^;,()]*)')
+
+	def __init__(self, expression):
+		self.expression = expression
+		self.position = 0
+		self.predicate = self.parse_or()
+		if self.position != len(expression):
+			raise ValueError(f"Unexpected input at position {self.position} of q: {expression}")
+
+	def __call__(self, row):
+		return self.predicate(row)
+
+	def peek(self, kind):
+		match = self.TOKEN.match(self.expression, self.position)
+		return match if match and match.group(kind) else None
+
+	def parse_or(self):
+		parts = [self.parse_and()]
+		while (match := self.peek("or")) is not None:
+			self.position = match.end()
+			parts.append(self.parse_and())
+		return parts[0] if len(parts) == 1 else lambda row: any(part(row) for part in parts)
+
+	def parse_and(self):
+		parts = [self.parse_term()]
+		while (match := self.peek("and")) is not None:
+			self.position = match.end()
+			parts.append(self.parse_term())
+		return parts[0] if len(parts) == 1 else lambda row: all(part(row) for part in parts)
+
+	def parse_term(self):
+		match = self.peek("open")
+		if match is not None:
+			self.position = match.end()
+			predicate = self.parse_or()
+			match = self.peek("close")
+			if match is None:
+				raise ValueError(f"Missing ) in q: {self.expression}")
+			self.position = match.end()
+			return predicate
+		match = self.peek("comparison")
+		if match is None:
+			raise ValueError(f"Expected a comparison at position {self.position} of q: {self.expression}")
+		field, operator = re.match(r"([\w.]+)(==|!=|=[a-z]+=)", match.group("comparison")).groups()
+		self.position = match.end()
+		if operator in ("=in=", "=out="):
+			values = self.parse_list()
+			return self.membership(field.lower(), values, operator == "=in=")
+		return self.comparison(field.lower(), operator, self.parse_value())
+
+	def parse_value(self):
+		match = self.VALUE.match(self.expression, self.position)
+		self.position = match.end()
+		quoted = match.group(1) if match.group(1) is not None else match.group(2)
+		if quoted is not None:
+			return re.sub(r"\\(.)", r"\1", quoted)
+		return match.group(3).strip()
+
+	def parse_list(self):
+		if self.expression[self.position:self.position + 1] != "(":
+			return [self.parse_value()]
+		self.position += 1
+		values = []
+		while self.expression[self.position:self.position + 1] != ")":
+			values.append(self.parse_value())
+			if self.expression[self.position:self.position + 1] == ",":
+				self.position += 1
+			elif self.expression[self.position:self.position + 1] != ")":
+				raise ValueError(f"Unterminated list in q: {self.expression}")
+		self.position += 1
+		return values
+
+	@staticmethod
+	def field_value(row, field):
+		value = row.get(field)
+		if value is None and "." in field:
+			value = row.get(field.split(".", 1)[1])
+		return value
+
+	@staticmethod
+	def ordered(value):
+		try:
+			return (0, float(value), "")
+		except (TypeError, ValueError):
+			return (1, 0.0, str(value).lower())
+
+	def membership(self, field, values, inside):
+		values = {str(value).lower() for value in values}
+		return lambda row: (str(self.field_value(row, field)).lower() in values) == inside
+
+	def comparison(self, field, operator, value):
+		if operator in ("==", "!="):
+			if "*" in value:
+				pattern = re.compile("^" + ".*".join(re.escape(part) for part in value.split("*")) + "$", re.IGNORECASE)
+				matches = lambda row: pattern.match(str(self.field_value(row, field) or "")) is not None
+			else:
+				target = self.ordered(value)
+				matches = lambda row: self.ordered(self.field_value(row, field)) == target
+			return matches if operator == "==" else (lambda row: not matches(row))
+		compare = {"=gt=": lambda a, b: a > b, "=ge=": lambda a, b: a >= b, "=lt=": lambda a, b: a < b, "=le=": lambda a, b: a <= b}.get(operator)
+		if compare is None:
+			raise ValueError(f"Unsupported operator {operator} in q: {self.expression}")
+		target = self.ordered(value)
+		return lambda row: self.field_value(row, field) is not None and compare(self.ordered(self.field_value(row, field)), target)
+
+
+class MockError(Exception):
+
+	def __init__(self, status, message, headers=None):
+		super().__init__(message)
+		self.status = status
+		self.headers = headers or {}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+	# Headers and body leave in one segment; separate small writes stall on delayed ACKs
+	wbufsize = -1
+	disable_nagle_algorithm = True
+
+	ROUTES = (
+		("POST", re.compile(r"^/oauth/access_token/?$"), "access_token"),
+		("GET", re.compile(r"^/ws/schema/table/(?P<table>\w+)/metadata$"), "table_metadata"),
+		("GET", re.compile(r"^/ws/schema/table/(?P<table>\w+)/count$"), "table_count"),
+		("GET", re.compile(r"^/ws/schema/table/(?P<table>\w+)$"), "table_rows"),
+		("GET", re.compile(r"^/ws/schema/table/(?P<table>\w+)/(?P<id>\d+)$"), "table_row"),
+		("POST", re.compile(r"^/ws/schema/table/(?P<table>\w+)$"), "table_insert"),
+		("PUT", re.compile(r"^/ws/schema/table/(?P<table>\w+)/(?P<id>\d+)$"), "table_update"),
+		("DELETE", re.compile(r"^/ws/schema/table/(?P<table>\w+)/(?P<id>\d+)$"), "table_delete"),
+		("POST", re.compile(r"^/ws/schema/query/(?P<name>[\w.]+)/count$"), "power_query_count"),
+		("POST", re.compile(r"^/ws/schema/query/(?P<name>[\w.]+)$"), "power_query"),
+		("GET", re.compile(r"^/ws/v1/district/student/count$"), "students_count"),
+		("GET", re.compile(r"^/ws/v1/district/student$"), "students"),
+		("GET", re.compile(r"^/ws/v1/student/(?P<id>\d+)$"), "student"),
+		("POST", re.compile(r"^/ws/v1/student$"), "student_write"),
+		("GET", re.compile(r"^/ws/dataversion/(?P<application>[\w.]+)/(?P<version>\d+)$"), "data_version"),
+	)
+
+	def log_message(self, format, *args):
+		pass
+
+	@property
+	def mock(self):
+		return self.server.mock
+
+	def handle_any(self):
+		length = int(self.headers.get("Content-Length") or 0)
+		raw = self.rfile.read(length) if length else b""
+		url = urlparse(self.path)
+		self.params = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+		try:
+			self.body = json.loads(raw) if raw and "json" in self.headers.get("Content-Type", "") else {}
+			for method, pattern, handler in self.ROUTES:
+				match = pattern.match(unquote(url.path))
+				if match and method == self.command:
+					break
+			else:
+				raise MockError(404, f"No mock route for {self.command} {url.path}")
+			if handler != "access_token":
+				self.mock.record(MockRequest(self.command, self.path, unquote(url.path), self.params, self.body))
+			self.mock.before_request(self.command, url.path, handler, self.headers)
+			payload = getattr(self, handler)(**match.groupdict())
+		except MockError as e:
+			return self.respond(e.status, {"message": str(e)}, e.headers)
+		except (ValueError, KeyError) as e:
+			return self.respond(400, {"message": str(e)})
+		self.respond(200, payload)
+
+	do_GET = handle_any
+	do_POST = handle_any
+	do_PUT = handle_any
+	do_DELETE = handle_any
+
+	def respond(self, status, payload, headers=None):
+		body = json.dumps(payload, separators=(",", ":")).encode()
+		etag = f'"{hashlib.md5(body).hexdigest()}"'
+		if status == 200 and self.command == "GET" and self.headers.get("If-None-Match") == etag:
+			status, body = 304, b""
+		self.send_response(status)
+		for key, value in (headers or {}).items():
+			self.send_header(key, value)
+		if self.command == "GET" and status in (200, 304):
+			self.send_header("ETag", etag)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def page(self, rows):
+		size = int(self.params.get("pagesize") or self.mock.default_page_size)
+		if self.mock.max_page_size:
+			size = min(size, self.mock.max_page_size)
+		page = int(self.params.get("page") or 1)
+		return rows[(page - 1) * size:page * size]
+
+	def filtered(self, rows):
+		if self.params.get("q"):
+			rows = list(filter(Filter(self.params["q"]), rows))
+		return rows
+
+	def table(self, table):
+		table = table.lower()
+		if table not in self.mock.dataset.tables:
+			raise MockError(404, f"Table {table} does not exist")
+		return table
+
+	def projected(self, table, rows):
+		projection = self.params.get("projection") or "*"
+		if projection == "*":
+			return rows
+		columns = [column.strip().lower() for column in projection.split(",")]
+		known = set(self.mock.dataset.columns(table))
+		unknown = [column for column in columns if column not in known]
+		if unknown:
+			raise MockError(400, f"Invalid projection column(s): {', '.join(unknown)}")
+		return [{column: row[column] for column in columns if column in row} for row in rows]
+
+	def sorted(self, rows):
+		if not self.params.get("sort"):
+			return rows
+		columns = [column.strip().lower() for column in self.params["sort"].split(",")]
+		descending = self.params.get("sortdescending") == "true"
+		return sorted(rows, key=lambda row: [Filter.ordered(row.get(column)) for column in columns], reverse=descending)
+
+	def access_token(self):
+		token = self.mock.issue_token(self.headers.get("Authorization", ""))
+		return {"access_token": token, "token_type": "Bearer", "expires_in": str(self.mock.token_ttl)}
+
+	def table_metadata(self, table):
+		table = self.table(table)
+		columns = [{"name": column.upper(), "type": "VARCHAR2"} for column in self.mock.dataset.columns(table)]
+		return {"metadata": {"name": table.upper(), "columns": columns}}
+
+	def table_count(self, table):
+		return {"count": len(self.filtered(self.mock.dataset.tables[self.table(table)]))}
+
+	def table_rows(self, table):
+		table = self.table(table)
+		rows = self.projected(table, self.page(self.sorted(self.filtered(self.mock.dataset.tables[table]))))
+		return {"name": table.upper(), "record": [{"id": int(row["id"]) if "id" in row else index, "tables": {table: row}} for index, row in enumerate(rows)]}
+
+	def table_row(self, table, id):
+		table = self.table(table)
+		row = self.mock.dataset.find(table, id)
+		if row is None:
+			raise MockError(404, f"No {table} row with id {id}")
+		return {"id": int(id), "name": table.upper(), "tables": {table: self.projected(table, [row])[0]}}
+
+	def write_result(self, action, row_id):
+		return {"result": {"status": "SUCCESS", "action": action, "success_message": {"id": int(row_id)}}}
+
+	def table_values(self, table):
+		return self.body.get("tables", {}).get(table, {})
+
+	def table_insert(self, table):
+		table = self.table(table)
+		return self.write_result("INSERT", self.mock.dataset.insert(table, self.table_values(table)))
+
+	def table_update(self, table, id):
+		table = self.table(table)
+		if not self.mock.dataset.update(table, id, self.table_values(table)):
+			raise MockError(404, f"No {table} row with id {id}")
+		return self.write_result("UPDATE", id)
+
+	def table_delete(self, table, id):
+		table = self.table(table)
+		if not self.mock.dataset.delete(table, id):
+			raise MockError(404, f"No {table} row with id {id}")
+		return self.write_result("DELETE", id)
+
+	def power_query_rows(self, name):
+		function = self.mock.dataset.named_queries.get(name.lower())
+		if function is None:
+			raise MockError(404, f"Named query {name} does not exist")
+		return self.filtered(function(self.body or {}))
+
+	def power_query(self, name):
+		return {"name": name, "record": self.page(self.power_query_rows(name))}
+
+	def power_query_count(self, name):
+		return {"count": len(self.power_query_rows(name))}
+
+	def student_resource(self, row):
+		return {
+			"id": int(row["id"]), "local_id": int(row["student_number"]),
+			"name": {"first_name": row["first_name"], "last_name": row["last_name"]},
+			"school_enrollment": {"grade_level": int(row["grade_level"]), "school_number": row["schoolid"], "enroll_status_code": int(row["enroll_status"])},
+		}
+
+	def resource_rows(self):
+		rows = self.mock.dataset.tables.get("students", [])
+		if self.params.get("q"):
+			q = Filter(self.params["q"])
+			# v1 filters address nested fields as name.last_name
+			rows = [row for row in rows if q(flatten(self.student_resource(row)))]
+		return rows
+
+	def students(self):
+		return {"students": {"student": [self.student_resource(row) for row in self.page(self.resource_rows())]}}
+
+	def students_count(self):
+		return {"resource": {"count": len(self.resource_rows())}}
+
+	def student(self, id):
+		row = self.mock.dataset.find("students", id)
+		if row is None:
+			raise MockError(404, f"No student with id {id}")
+		return {"student": self.student_resource(row)}
+
+	def student_write(self):
+		results = []
+		for student in self.body.get("students", {}).get("student", []):
+			values = {
+				"first_name": student.get("name", {}).get("first_name", ""), "last_name": student.get("name", {}).get("last_name", ""),
+				"student_number": student.get("local_id", ""), "grade_level": student.get("school_enrollment", {}).get("grade_level", "0"),
+			}
+			action = str(student.get("action", "INSERT")).upper()
+			if action == "UPDATE" and self.mock.dataset.update("students", student.get("id"), {k: v for k, v in values.items() if v != ""}):
+				row_id = student.get("id")
+			elif action == "INSERT":
+				row_id = self.mock.dataset.insert("students", {"enroll_status": "0", "schoolid": "0", **values})
+			else:
+				results.append({"client_uid": student.get("client_uid"), "status": "ERROR", "action": action, "error_message": {"error": "Not found"}})
+				continue
+			results.append({"client_uid": student.get("client_uid"), "status": "SUCCESS", "action": action, "success_message": {"id": int(row_id)}})
+		return {"results": {"result": results}}
+
+	def data_version(self, application, version):
+		return self.mock.dataset.changes_since(int(version))
+
+
+def flatten(value, prefix=""):
+	flat = {}
+	for key, item in value.items():
+		if isinstance(item, dict):
+			flat.update(flatten(item, f"{prefix}{key}."))
+		else:
+			flat[f"{prefix}{key}"] = item
+	return flat
+
+
+class MockPowerSchool:
+	"""
+	Local stand-in for a PowerSchool server, for tests and benchmarks.
+
+	Serves OAuth, /ws/schema/table (rows, count, metadata, writes), /ws/schema/query,
+	/ws/v1/student, /ws/v1/district/student and /ws/dataversion from a Dataset. latency
+	(seconds, or a (low, high) range) is added to every call, error_rate answers that share
+	of calls with a 500, rate_limit answers calls beyond that many per second with a 429 and
+	fail_next() scripts the next statuses. Every call other than a token request is appended
+	to history as a MockRequest. Use as a context manager or call start()/stop().
+	"""
+
+	def __init__(self, dataset=None, latency=0, error_rate=0.0, rate_limit=None, retry_after=1, token_ttl=3600,
+				 default_page_size=100, max_page_size=None, client_id=None, client_secret=None, seed=0, host="127.0.0.1", port=0):
+		self.dataset = dataset if dataset is not None else Dataset.synthetic()
+		self.latency = latency
+		self.error_rate = error_rate
+		self.rate_limit = rate_limit
+		self.retry_after = retry_after
+		self.token_ttl = token_ttl
+		self.default_page_size = default_page_size
+		self.max_page_size = max_page_size
+		# When set, the token endpoint only accepts these credentials
+		self.client_id = client_id
+		self.client_secret = client_secret
+		self.random = random.Random(seed)
+		self.tokens = {}
+		self.scripted = []
+		self.history = []
+		self.stats = {"requests": 0, "tokens": 0, "throttled": 0, "errors": 0}
+		self.window = (0, 0)
+		self.lock = threading.Lock()
+		self.address = (host, port)
+		self.server = None
+
+	@property
+	def url(self):
+		host, port = self.server.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def start(self):
+		self.server = ThreadingHTTPServer(self.address, MockHandler)
+		self.server.daemon_threads = True
+		self.server.mock = self
+		threading.Thread(target=self.server.serve_forever, daemon=True).start()
+		return self
+
+	def stop(self):
+		if self.server is not None:
+			self.server.shutdown()
+			self.server.server_close()
+			self.server = None
+
+	def __enter__(self):
+		return self.start()
+
+	def __exit__(self, *exc):
+		self.stop()
+
+	def fail_next(self, *statuses):
+		with self.lock:
+			self.scripted.extend(statuses)
+		return self
+
+	def record(self, request):
+		with self.lock:
+			self.history.append(request)
+
+	def revoke_tokens(self):
+		with self.lock:
+			self.tokens.clear()
+
+	def issue_token(self, authorization):
+		if self.client_id is not None:
+			expected = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+			if authorization != f"Basic {expected}":
+				raise MockError(401, "Invalid client credentials")
+		token = secrets.token_hex(16)
+		with self.lock:
+			self.tokens[token] = time.monotonic() + self.token_ttl
+			self.stats["tokens"] += 1
+		return token
+
+	def delay(self):
+		if isinstance(self.latency, (tuple, list)):
+			with self.lock:
+				return self.random.uniform(*self.latency)
+		return self.latency
+
+	def throttled(self):
+		if not self.rate_limit:
+			return False
+		with self.lock:
+			second = int(time.monotonic())
+			window, count = self.window
+			count = count + 1 if window == second else 1
+			self.window = (second, count)
+			return count > self.rate_limit
+
+	def before_request(self, method, path, handler, headers):
+		delay = self.delay()
+		if delay:
+			time.sleep(delay)
+		with self.lock:
+			self.stats["requests"] += 1
+			status = self.scripted.pop(0) if self.scripted and handler != "access_token" else None
+			if status is None and self.error_rate and handler != "access_token" and self.random.random() < self.error_rate:
+				status = 500
+			if status is not None:
+				self.stats["errors"] += 1
+		if status is not None:
+			raise MockError(status, "Injected failure", {"Retry-After": str(self.retry_after)} if status in (429, 503) else None)
+		if handler == "access_token":
+			return
+		if self.throttled():
+			with self.lock:
+				self.stats["throttled"] += 1
+			raise MockError(429, "Too many requests", {"Retry-After": str(self.retry_after)})
+		token = headers.get("Authorization", "").removeprefix("Bearer ")
+		with self.lock:
+			expires = self.tokens.get(token)
+		if expires is None or expires < time.monotonic():
+			raise MockError(401, "Invalid or expired access token")
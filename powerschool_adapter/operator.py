@@ -23,5 +23,8 @@ class Operator:
     GREATER_THAN_OR_EQUAL = "=ge="
     LESS_THAN = "=lt="
     LESS_THAN_OR_EQUAL = "=le="
+    IN = "=in="
+    NOT_EQUALS = "!="
     AND = ";"
+    OR = ","
     WILDCARD = "*"
\ No newline at end of file
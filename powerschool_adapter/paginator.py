@@ -17,22 +17,45 @@ DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWIS
 FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from .columnar import Columnar
+
+logger = logging.getLogger(__name__)
+
+
+def batched(iterable, size):
+	"""
+	Yields lists of up to size items from iterable.
+	"""
+	if size < 1:
+		raise ValueError("Batch size must be at least 1.")
+	iterator = iter(iterable)
+	while True:
+		batch = list(islice(iterator, size))
+		if not batch:
+			return
+		yield batch
+
 
 class Paginator:
 
-	def __init__(self, builder, page_size=100):
-		print(f"Paginator builder with page size: {page_size}")
-		self.builder = builder
+	def __init__(self, builder, page_size=100, prefetch=0):
+		logger.debug("Paginator builder with page size: %s", page_size)
+		self.builder = builder.untracked().page_size(page_size)
 		self.page = 1
 		self.has_more = True
-		self.builder.page_size(page_size).page(self.page)
+		# Number of pages requested ahead of the one being consumed when iterating
+		self.prefetch = prefetch
 
 	def next_page(self):
 		if not self.has_more:
 			return None
-		response = self.builder.page(self.page).send(reset=False)
-		if not response.is_empty():
-			self.builder.data = response.data
+		response = self.builder.page(self.page).send()
 
 		if response.is_empty():
 			self.page = 1
@@ -47,3 +70,165 @@ class Paginator:
 
 	def has_next(self):
 		return self.has_more
+
+	def __iter__(self):
+		if not self.prefetch:
+			while True:
+				response = self.next_page()
+				if response is None:
+					return
+				yield response
+		with ThreadPoolExecutor(max_workers=self.prefetch + 1) as executor:
+			pending = deque()
+			next_page = self.page
+			try:
+				while self.has_more:
+					# The page being consumed plus `prefetch` pages in flight behind it
+					while len(pending) <= self.prefetch:
+						pending.append(executor.submit(self.builder.page(next_page).send))
+						next_page += 1
+					response = pending.popleft().result()
+					if response.is_empty():
+						self.page = 1
+						self.has_more = False
+						return
+					self.page += 1
+					yield response
+			finally:
+				for future in pending:
+					future.cancel()
+
+
+class AsyncPaginator(Paginator):
+
+	async def next_page(self):
+		if not self.has_more:
+			return None
+		response = await self.builder.page(self.page).send()
+
+		if response.is_empty():
+			self.page = 1
+			self.has_more = False
+			return None
+
+		self.page += 1
+		return response
+
+	async def get_next_page(self):
+		return await self.next_page()
+
+	def __iter__(self):
+		raise TypeError("AsyncPaginator is iterated with `async for`.")
+
+	async def __aiter__(self):
+		pending = deque()
+		next_page = self.page
+		try:
+			while self.has_more:
+				while len(pending) <= self.prefetch:
+					pending.append(asyncio.ensure_future(self.builder.page(next_page).send()))
+					next_page += 1
+				response = await pending.popleft()
+				if response.is_empty():
+					self.page = 1
+					self.has_more = False
+					return
+				self.page += 1
+				yield response
+		finally:
+			for task in pending:
+				task.cancel()
+
+
+class ParallelPaginator:
+
+	def __init__(self, builder, page_size=100, max_workers=4):
+		if max_workers < 1:
+			raise ValueError("max_workers must be at least 1.")
+		self.builder = builder.untracked()
+		self.page_size = page_size
+		self.max_workers = max_workers
+		self.total = None
+
+	def fetch_count(self):
+		# Paging, sorting and projection parameters are meaningless for the count endpoint
+		query = self.builder.remove_query_param("page", "pagesize", "projection", "sort", "sortdescending")
+		response = query.count()
+		self.total = int(response.data.get("count", 0)) if isinstance(response.data, dict) else 0
+		return self.total
+
+	def page_count(self):
+		if self.total is None:
+			self.fetch_count()
+		return -(-self.total // self.page_size)
+
+	def fetch_page(self, page):
+		return self.builder.page_size(self.page_size).page(page).send()
+
+	def pages(self, start=1):
+		total_pages = self.page_count()
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			pending = deque()
+			next_page = start
+			try:
+				while next_page <= total_pages or pending:
+					# Keep a bounded window of pages in flight so results are yielded in order
+					while next_page <= total_pages and len(pending) < self.max_workers * 2:
+						pending.append(executor.submit(self.fetch_page, next_page))
+						next_page += 1
+					yield pending.popleft().result()
+			finally:
+				for future in pending:
+					future.cancel()
+
+	def rows(self):
+		# Squashed like iter_rows, fetch_many and Response.rows
+		for response in self.pages():
+			yield from response.rows()
+
+	def collect_columns(self, responses):
+		# Each page is converted as it arrives so only one page of dicts is alive at a time
+		projection = self.builder.projection_columns()
+		result = Columnar(projection or ())
+		for response in responses:
+			if not response.is_empty():
+				if not projection:
+					# Without a projection a later page may bring columns that were null on earlier ones
+					result.widen(response.data.columns)
+				result.extend(response.data)
+		return result
+
+	def all(self):
+		if getattr(self.builder, "as_columns", False):
+			return self.collect_columns(self.pages())
+		return list(self.rows())
+
+
+class AsyncParallelPaginator(ParallelPaginator):
+
+	async def fetch_count(self):
+		query = self.builder.remove_query_param("page", "pagesize", "projection", "sort", "sortdescending")
+		response = await query.count()
+		self.total = int(response.data.get("count", 0)) if isinstance(response.data, dict) else 0
+		return self.total
+
+	async def page_count(self):
+		if self.total is None:
+			await self.fetch_count()
+		return -(-self.total // self.page_size)
+
+	async def pages(self):
+		total_pages = await self.page_count()
+		semaphore = asyncio.Semaphore(self.max_workers)
+
+		async def fetch(page):
+			async with semaphore:
+				return await self.fetch_page(page)
+
+		# gather preserves the order of the pages it was given
+		return await asyncio.gather(*(fetch(page) for page in range(1, total_pages + 1)))
+
+	async def all(self):
+		if getattr(self.builder, "as_columns", False):
+			return self.collect_columns(await self.pages())
+		return [row for response in await self.pages() for row in response.rows()]
@@ -0,0 +1,143 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import datetime
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .paginator import AsyncParallelPaginator, ParallelPaginator
+
+
+class DateRanges:
+	"""
+	Splits [start, end] into consecutive ranges of days, passed as the start_argument and
+	end_argument of the PowerQuery. Both ends of a range are inclusive.
+	"""
+
+	def __init__(self, start_argument, end_argument, start, end, days=7, date_format="%Y-%m-%d"):
+		if days < 1:
+			raise ValueError("A date range shard must span at least one day.")
+		self.start_argument = start_argument
+		self.end_argument = end_argument
+		self.start = start
+		self.end = end
+		self.days = days
+		self.date_format = date_format
+
+	def shards(self):
+		start = self.start
+		while start <= self.end:
+			end = min(start + datetime.timedelta(days=self.days - 1), self.end)
+			yield {self.start_argument: start.strftime(self.date_format), self.end_argument: end.strftime(self.date_format)}
+			start = end + datetime.timedelta(days=1)
+
+
+class ValueChunks:
+	"""
+	Splits a list argument (school ids, term ids...) into shards of size values each.
+	"""
+
+	def __init__(self, argument, values, size=1):
+		if size < 1:
+			raise ValueError("A value shard must hold at least one value.")
+		self.argument = argument
+		self.values = list(values)
+		self.size = size
+
+	def shards(self):
+		for index in range(0, len(self.values), self.size):
+			chunk = self.values[index:index + self.size]
+			yield {self.argument: chunk if self.size > 1 else chunk[0]}
+
+
+class PartitionedQuery:
+	"""
+	Runs a PowerQuery once per shard of its arguments (the product of every partition) and
+	fetches the pages of all shards from one bounded pool: each shard's count is requested
+	first and its pages are queued as soon as the count arrives. Rows are merged in shard and
+	page order and duplicates are dropped, by the key columns or by the whole row.
+	"""
+
+	def __init__(self, query, partitions, page_size=100, max_workers=4, key=None):
+		self.query = query
+		self.partitions = partitions
+		self.page_size = page_size
+		self.max_workers = max_workers
+		self.key = [key] if isinstance(key, str) else key
+
+	def shards(self):
+		for combination in itertools.product(*(list(partition.shards()) for partition in self.partitions)):
+			arguments = {}
+			for shard in combination:
+				arguments.update(shard)
+			yield arguments
+
+	def shard_query(self, arguments):
+		return self.query.set_data({**self.query.data, **arguments})
+
+	def identity(self, row):
+		if self.key:
+			return tuple(row.get(column) for column in self.key)
+		return tuple(sorted(row.items()))
+
+	def merge(self, responses):
+		rows = {}
+		for response in responses:
+			for row in response.rows():
+				rows.setdefault(self.identity(row), row)
+		return list(rows.values())
+
+	def paginators(self, paginator_class):
+		return [paginator_class(self.shard_query(arguments), self.page_size) for arguments in self.shards()]
+
+	def fetch(self):
+		paginators = self.paginators(ParallelPaginator)
+		pages = {}
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			counts = {executor.submit(paginator.page_count): index for index, paginator in enumerate(paginators)}
+			for future in as_completed(counts):
+				index = counts[future]
+				for page in range(1, future.result() + 1):
+					pages[(index, page)] = executor.submit(paginators[index].fetch_page, page)
+			return self.merge(pages[position].result() for position in sorted(pages))
+
+	async def fetch_async(self):
+		paginators = self.paginators(AsyncParallelPaginator)
+		semaphore = asyncio.Semaphore(self.max_workers)
+
+		async def limited(awaitable):
+			async with semaphore:
+				return await awaitable
+
+		async def fetch_shard(paginator):
+			total_pages = await limited(paginator.page_count())
+			return await asyncio.gather(*(limited(paginator.fetch_page(page)) for page in range(1, total_pages + 1)))
+
+		shard_pages = await asyncio.gather(*(fetch_shard(paginator) for paginator in paginators))
+		return self.merge(response for pages in shard_pages for response in pages)
+
+
+class AsyncPartitionedQuery(PartitionedQuery):
+	"""
+	PartitionedQuery over an AsyncQuery; fetch() is awaitable.
+	"""
+
+	async def fetch(self):
+		return await self.fetch_async()
@@ -0,0 +1,601 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from types import MappingProxyType
+from urllib.parse import parse_qs
+
+from .batch import BatchFetcher, SplitFetcher
+from .bulk import BulkWriter
+from .checkpoint import CheckpointedExport
+from .export import ArrowExporter
+from .expression import Expression, Template
+from .paginator import Paginator, ParallelPaginator, batched
+from .partition import PartitionedQuery
+from .response import Response
+from .stream import iter_rows
+
+
+class Query:
+	"""
+	An immutable request description. Every builder method returns a new Query, so one
+	query can be reused and sent from any number of threads against a shared Request.
+	"""
+
+	GET = "GET"
+	POST = "POST"
+	PUT = "PUT"
+	PATCH = "PATCH"
+	DELETE = "DELETE"
+
+	__slots__ = (
+		"request", "owner", "endpoint", "http_method", "data", "query_string",
+		"table_name", "id", "include_projection", "response_as_json", "page_key", "as_columns",
+		"row_type",
+	)
+
+	def __init__(self, request, owner=None, endpoint: str = None, http_method: str = "GET", data: dict = None,
+				 query_string: dict = None, table_name: str = None, id: str | int = None, include_projection: bool = False,
+				 response_as_json: bool = True, page_key: str = "record", as_columns: bool = False, row_type: type = None):
+		set_field = object.__setattr__
+		set_field(self, "request", request)
+		# PowerSchool client that remembers this query as its current one, if any
+		set_field(self, "owner", owner)
+		set_field(self, "endpoint", endpoint)
+		set_field(self, "http_method", http_method)
+		set_field(self, "data", MappingProxyType(dict(data or {})))
+		set_field(self, "query_string", MappingProxyType(dict(query_string or {})))
+		set_field(self, "table_name", table_name)
+		set_field(self, "id", id)
+		set_field(self, "include_projection", include_projection)
+		set_field(self, "response_as_json", response_as_json)
+		set_field(self, "page_key", page_key)
+		set_field(self, "as_columns", as_columns)
+		set_field(self, "row_type", row_type)
+
+	def __setattr__(self, name, value):
+		raise AttributeError(f"{type(self).__name__} is immutable; use the builder methods to derive a new query.")
+
+	def __repr__(self):
+		return f"{type(self).__name__}({self.http_method} {self.endpoint} {dict(self.query_string)})"
+
+	def _replace(self, **changes):
+		fields = {name: getattr(self, name) for name in Query.__slots__}
+		fields.update(changes)
+		query = type(self)(**fields)
+		if query.owner is not None:
+			query.owner.remember(query)
+		return query
+
+	def untracked(self):
+		# Internal derivations (count, paging, fetchers) must not replace the client's current query
+		return self._replace(owner=None)
+
+	def get_request(self):
+		return self.request
+
+	def set_table(self, table: str):
+		return self._replace(
+			table_name=table.split('/')[-1],  # Extract the part after the last / in the table string
+			endpoint=table if table.startswith('/') else f"/ws/schema/table/{table}",
+			include_projection=True,
+			page_key="record",
+		)
+
+	def table(self, table: str):
+		return self.set_table(table)
+
+	def set_id(self, resource_id: str | int):
+		return self._replace(endpoint=f"{self.endpoint}/{resource_id}", id=resource_id)
+
+	def for_id(self, resource_id: str | int):
+		return self.set_id(resource_id)
+
+	def resource(self, endpoint: str, method: str = None, data: dict = None):
+		query = self._replace(endpoint=endpoint, include_projection=False)
+		if method is not None:
+			query = query.set_method(method)
+		if data:
+			query = query.set_data(data)
+		# If the method and data are set, automatically send the request
+		if query.http_method is not None and query.data:
+			return query.send()
+		return query
+
+	def exclude_projection(self):
+		return self._replace(include_projection=False)
+
+	def without_projection(self):
+		return self.exclude_projection()
+
+	def set_endpoint(self, endpoint: str):
+		return self._replace(endpoint=endpoint, page_key=endpoint.split('/')[-1], include_projection=False)
+
+	def to_endpoint(self, endpoint: str):
+		return self.set_endpoint(endpoint)
+
+	def to(self, endpoint: str):
+		return self.set_endpoint(endpoint)
+
+	def get_endpoint(self):
+		return self.endpoint
+
+	def set_named_query(self, query_name: str, data: dict = None):
+		query = self._replace(
+			endpoint=query_name if query_name.startswith('/') else f"/ws/schema/query/{query_name}",
+			page_key="record",
+			include_projection=False,
+		)
+		if data:
+			return query.set_data(data).post()
+		return query.set_method(self.POST)
+
+	""" Alias of set_named_query """
+
+	def named_query(self, query: str, data: dict = None):
+		return self.set_named_query(query, data)
+
+	""" Alias of set_named_query """
+
+	def power_query(self, query_name: str, data: dict = None):
+		return self.set_named_query(query_name, data)
+
+	""" Alias of set_named_query """
+
+	def pq(self, query_name: str, data: dict = None):
+		return self.set_named_query(query_name, data)
+
+	def set_data(self, data: dict):
+		return self._replace(data=self.cast_to_values_string(data))
+
+	def with_data(self, data: dict):
+		return self.set_data(data)
+
+	def set_data_item(self, key: str, value: str | bool | dict | list):
+		return self._replace(data={**self.data, key: self.cast_to_values_string(value)})
+
+	def with_query_string(self, query):
+		if isinstance(query, dict):
+			return self._replace(query_string=query)
+		if isinstance(query, str):
+			# Remove leading '?' if present
+			query = query.lstrip('?')
+			# Parse the query string into a dictionary
+			parsed = parse_qs(query)
+			# Convert list values to single items if only one value exists
+			return self._replace(query_string={k: v[0] if len(v) == 1 else v for k, v in parsed.items()})
+		return self
+
+	def query(self, query_string: str | list):
+		return self.with_query_string(query_string)
+
+	def add_query_param(self, key, value):
+		return self._replace(query_string={**self.query_string, key: value})
+
+	def remove_query_param(self, *keys):
+		return self._replace(query_string={k: v for k, v in self.query_string.items() if k not in keys})
+
+	def has_query_param(self, key):
+		return key in self.query_string
+
+	def q(self, query: str | Expression):
+		return self.add_query_param('q', str(query) if isinstance(query, Expression) else query)
+
+	"""
+	Sets q from an Expression or a compiled Template rendered with params.
+	"""
+
+	def where(self, expression: str | Expression | Template, **params):
+		if isinstance(expression, Expression):
+			expression = expression.compile()
+		return self.q(expression.render(**params) if isinstance(expression, Template) else expression)
+
+	def query_expression(self, expression: str):
+		return self.q(expression)
+
+	def adhoc_filter(self, expression: str):
+		return self
+
+	def filter(self, expression: str):
+		return self.adhoc_filter(expression)
+
+	def projection(self, projection_fields: str | list):
+		if isinstance(projection_fields, list):
+			projection_fields = ",".join(projection_fields)
+		return self.add_query_param("projection", projection_fields)._replace(include_projection=True)
+
+	def page_size(self, size):
+		return self.add_query_param("pagesize", size)
+
+	def page(self, page):
+		return self.add_query_param("page", page)
+
+	def sort(self, columns: str | list, descending=False):
+		if isinstance(columns, list):
+			columns = ",".join(columns)
+		return self._replace(query_string={
+			**self.query_string,
+			"sort": columns,
+			"sortdescending": "true" if descending else "false",
+		})
+
+	def adhoc_order(self, expression: str):
+		return self.add_query_param('order', expression)
+
+	def order(self, expression: str):
+		return self.adhoc_order(expression)
+
+	def include_count(self):
+		return self.add_query_param("count", "true")
+
+	def data_version(self, version: int | str, application_name: str):
+		# The $dataversion parameter is prefixed with $ because it's a special PowerSchool API parameter that:
+		return self.set_data_item("$dataversion", version).set_data_item("$dataversion_applicationname", application_name)
+
+	def with_data_version(self, version: int, application_name: str):
+		return self.data_version(version, application_name)
+
+	def expansions(self, expansions: str | list):
+		if isinstance(expansions, list):
+			expansions = ",".join(expansions)
+		return self.add_query_param("expansions", expansions)
+
+	def with_expansions(self, expansions: str | list):
+		return self.expansions(expansions)
+
+	def with_expansion(self, expansion: str):
+		return self.with_expansions(expansion)
+
+	def extensions(self, extensions: str | list):
+		if isinstance(extensions, list):
+			extensions = ",".join(extensions)
+		return self.add_query_param("extensions", extensions)
+
+	def with_extensions(self, extensions: str | list):
+		return self.extensions(extensions)
+
+	def with_extension(self, extension: str):
+		return self.extensions(extension)
+
+	def get_subscription_changes(self, application: str, version: int):
+		return self.set_endpoint(f"/ws/dataversion/{application}/{version}").set_method(self.GET).send()
+
+	def count(self):
+		query = self.untracked()._replace(endpoint=f"{self.endpoint}/count", include_projection=False, row_type=None)
+		# Named queries are counted with the same POST body they are executed with
+		if query.http_method == self.POST:
+			return query.send()
+		return query.get()
+
+	def raw(self):
+		return self._replace(response_as_json=False)
+
+	def as_json_response(self):
+		return self._replace(response_as_json=True)
+
+	"""
+	Returns rows as a Columnar: named tuples sharing one schema built from the projection.
+	"""
+
+	def columnar(self, enabled: bool = True):
+		return self._replace(as_columns=enabled)
+
+	"""
+	Decodes rows straight into a namedtuple, dataclass or msgspec Struct declared for the table.
+	With msgspec installed Structs are decoded from the raw page without intermediate dicts.
+	"""
+
+	def typed(self, row_type: type = None):
+		return self._replace(row_type=row_type)
+
+	def default_projection(self):
+		# A column set declared on the schema registry replaces projection=* for the table
+		schema = self.request.schema
+		return (schema.projection_for(self.table_name) if schema is not None else None) or "*"
+
+	def projection_columns(self):
+		projection = self.query_string.get("projection") or (self.default_projection() if self.include_projection else None)
+		if not projection or projection == "*":
+			return None
+		# PowerSchool returns column names in lower case
+		return [column.strip().lower() for column in str(projection).split(",")]
+
+	"""
+	Recursively casts all values in the data dictionary to strings.
+	Handles nested dictionaries and lists.
+	"""
+
+	@classmethod
+	def cast_to_values_string(cls, data: dict | list | bool):
+		if isinstance(data, dict):
+			return {key: cls.cast_to_values_string(value) for key, value in data.items()}
+		elif isinstance(data, list):
+			return ','.join(str(cls.cast_to_values_string(item)) for item in data)
+		elif isinstance(data, bool):
+			return "1" if data else "0"
+		elif data is None:
+			return ""
+		elif isinstance(data, (int, float)):
+			return str(data)
+		else:
+			return str(data).strip()
+
+	"""
+	Builds the JSON structure for the request body.
+	This handles cases for table-based requests, IDs, and plain data.
+	"""
+
+	def build_request_json(self):
+		if self.http_method in [self.GET, self.DELETE]:
+			return None  # No JSON body for GET/DELETE requests
+
+		body = {}
+
+		# Add table-specific data if a table is set
+		if self.table_name:
+			body['tables'] = {self.table_name: dict(self.data)}
+
+		# Add ID if set
+		if self.id:
+			body['id'] = self.id
+			body['name'] = self.table_name
+
+		# If there's no table, use the data directly
+		if self.data and not self.table_name:
+			body = dict(self.data)
+
+		return body or None
+
+	"""
+	Builds the query string for the request.
+	Automatically includes `projection=*` for GET requests if not already set.
+	"""
+
+	def build_request_query(self):
+		if self.http_method not in {self.GET, self.POST}:  # Check if method is not GET or POST
+			return None
+
+		query_parts = []
+
+		# Add existing query string parameters
+		for key, value in self.query_string.items():
+			query_parts.append(f"{key}={value}")
+
+		# Include `projection=*` (or the table's declared columns) if applicable
+		if self.include_projection and not self.has_query_param("projection"):
+			query_parts.append(f"projection={self.default_projection()}")
+
+		# Combine query parts into a full query string
+		return "&".join(query_parts)
+
+	def build_request_options(self):
+		options = {}
+		body = self.build_request_json()
+		if body is not None:
+			options['json'] = body
+		params = self.build_request_query()
+		if params is not None:
+			options['params'] = params
+		return options
+
+	def set_method(self, method: str):
+		return self._replace(http_method=method)
+
+	def method(self, method: str):
+		return self.set_method(method)
+
+	def get(self, endpoint=None):
+		query = self.set_endpoint(endpoint) if endpoint else self
+		return query.set_method(self.GET).send()
+
+	def post(self):
+		return self.set_method(self.POST).send()
+
+	def put(self):
+		return self.set_method(self.PUT).send()
+
+	def patch(self):
+		return self.set_method(self.PATCH).send()
+
+	def delete(self):
+		return self.set_method(self.DELETE).send()
+
+	def send(self, reset=True):
+		if not self.endpoint:
+			raise ValueError("Endpoint must be set before sending a request.")
+
+		self.validate()
+		response = self.request.make_request(self.http_method, self.endpoint, self.build_request_options(), self.decodes_json())
+		if reset and self.owner is not None:
+			self.owner.reset()
+		return self.build_response(response)
+
+	"""
+	Client-style helpers kept for chains such as powerschool.table('students').paginate().
+	The paging state lives on the PowerSchool client that built the query.
+	"""
+
+	def paginate(self, page_size=100):
+		if self.owner is None:
+			raise ValueError("paginate() needs a query built by a PowerSchool client. Use paginator() or iter_pages() instead.")
+		return self.owner.paginate_query(self, page_size)
+
+	def reset(self):
+		if self.owner is not None:
+			self.owner.reset()
+		return type(self)(self.request, owner=self.owner)
+
+	def clone(self):
+		# Queries are immutable, so the query itself is its own clone
+		return self
+
+	"""
+	Checks projection, sort, q and body column names against the cached table metadata
+	when the Request has a SchemaRegistry; raises SchemaError before anything is sent.
+	"""
+
+	def validate(self):
+		if self.request.schema is not None:
+			self.request.schema.check(self)
+		return self
+
+	def metadata(self):
+		if self.request.schema is None:
+			raise ValueError("Table metadata needs a SchemaRegistry on the Request (schema=SchemaRegistry()).")
+		return self.request.schema.table(self.request, self.table_name)
+
+	def decodes_json(self):
+		# Typed rows are decoded by the codec from the raw body
+		return self.response_as_json and self.row_type is None
+
+	def build_response(self, data):
+		if self.row_type is not None and self.response_as_json:
+			rows = self.request.codec.decode_rows(data.content, self.row_type, self.page_key, self.table_name)
+			response = Response({self.page_key: rows}, self.page_key, self.request.codec)
+		else:
+			response = Response(data, self.page_key, self.request.codec)
+			if self.as_columns:
+				response.squash_table_response(columnar=True, columns=self.projection_columns())
+		if self.request.instrumentation is not None and self.response_as_json:
+			self.request.instrumentation.record_rows(self.endpoint, response.raw_count())
+		return response
+
+	"""
+	Loads many records by id with chunked `id=in=(...)` filters sent concurrently.
+	Returns a BatchResult with rows keyed by id and the ids that were not found.
+	"""
+
+	def fetch_many(self, ids, id_column="id", max_url_length=2000, max_batch=100, max_workers=4):
+		return BatchFetcher(self.untracked(), id_column, max_url_length, max_batch, max_workers).fetch(ids)
+
+	"""
+	Fetches every row matching an expression whose in-list may be too long for one URL: the list
+	is split across concurrent requests and the rows are merged. The query's own q is kept.
+	"""
+
+	def fetch_where(self, expression: Expression | Template, max_url_length=2000, page_size=100, max_workers=4, **params):
+		return SplitFetcher(self.untracked(), expression, params, max_url_length, page_size, max_workers).fetch()
+
+	"""
+	Writes many items: v1 resources get batch_size entries per request, table rows are
+	fanned out as PUT/POST requests. Returns a BulkReport with a WriteResult per item.
+	"""
+
+	def bulk_write(self, items, batch_size=50, max_workers=4, retries=1, id_column="id"):
+		return BulkWriter(self.untracked(), batch_size, max_workers, retries, id_column).write(items)
+
+	def paginator(self, page_size=100, prefetch=0):
+		return Paginator(self, page_size, prefetch)
+
+	"""
+	Generators over every page or row. The next `prefetch` pages are requested in the
+	background while the current one is consumed.
+	"""
+
+	def iter_pages(self, page_size=100, prefetch=1):
+		return iter(self.paginator(page_size, prefetch))
+
+	def iter_rows(self, page_size=100, prefetch=1):
+		for response in self.iter_pages(page_size, prefetch):
+			yield from response
+
+	def batched(self, size, page_size=100, prefetch=1):
+		return batched(self.iter_rows(page_size, prefetch), size)
+
+	"""
+	Fetches every page concurrently after a single count request.
+	Rows are returned in page order, so a sort() on the query is preserved.
+	"""
+
+	def paginate_parallel(self, page_size=100, max_workers=4):
+		return ParallelPaginator(self, page_size, max_workers).all()
+
+	"""
+	Resumable export: progress is written to the checkpoint store after every page so a rerun
+	with the same job continues where the previous one stopped. keyset names a unique sort
+	column to continue from instead of a page number.
+	"""
+
+	def checkpointed(self, store=None, job=None, page_size=1000, keyset=None, max_workers=1, restart=False):
+		return CheckpointedExport(self._replace(owner=None, as_columns=False, row_type=None), store, job, page_size, keyset, max_workers, restart)
+
+	"""
+	Splits a PowerQuery's arguments into shards (DateRanges, ValueChunks) and runs every shard
+	and its pages concurrently; fetch() returns the merged rows without duplicates.
+	"""
+
+	def partitioned(self, *partitions, page_size=100, max_workers=4, key=None):
+		return PartitionedQuery(self._replace(owner=None, as_columns=False, row_type=None), partitions, page_size, max_workers, key)
+
+	"""
+	Arrow, pandas and Parquet exports. Pages are fetched concurrently and converted one at a
+	time; only the projected columns are exported and types are inferred from the first page.
+	"""
+
+	def export_pages(self, page_size=1000, max_workers=4):
+		for response in ParallelPaginator(self._replace(owner=None, as_columns=False, row_type=None), page_size, max_workers).pages():
+			yield response.rows()
+
+	def export_columns(self):
+		# Without a projection the table metadata names the columns that are null on the first page
+		columns = self.projection_columns()
+		if columns is None and self.table_name and self.request.schema is not None:
+			columns = list(self.metadata().columns)
+		return columns
+
+	def record_batches(self, page_size=1000, max_workers=4, types: dict = None):
+		return ArrowExporter(self.export_columns(), types).record_batches(self.export_pages(page_size, max_workers))
+
+	def to_arrow(self, page_size=1000, max_workers=4, types: dict = None):
+		return ArrowExporter(self.export_columns(), types).to_table(self.export_pages(page_size, max_workers))
+
+	def to_pandas(self, page_size=1000, max_workers=4, types: dict = None):
+		return ArrowExporter(self.export_columns(), types).to_pandas(self.export_pages(page_size, max_workers))
+
+	def to_parquet(self, path, page_size=1000, max_workers=4, types: dict = None, **options):
+		return ArrowExporter(self.export_columns(), types).to_parquet(path, self.export_pages(page_size, max_workers), **options)
+
+	"""
+	Yields rows one at a time across every page. Each page body is parsed incrementally
+	(when ijson is installed) so memory stays flat regardless of the table size.
+	"""
+
+	def stream(self, page_size=100):
+		if not self.endpoint:
+			raise ValueError("Endpoint must be set before sending a request.")
+		if self.id is not None or self.page_key.isdigit():
+			# A single record or v1 resource is one small object that is not paged
+			yield from self.untracked().send().rows()
+			return
+		query = self.untracked().page_size(page_size)
+		page = 1
+		while True:
+			options = query.page(page).build_request_options()
+			options['stream'] = True
+			response = self.request.make_request(self.http_method, self.endpoint, options, False)
+			response.raw.decode_content = True
+			rows = 0
+			try:
+				for row in iter_rows(response.raw, self.page_key, self.table_name, self.request.codec):
+					rows += 1
+					yield row
+			finally:
+				response.close()
+			if not rows:
+				return
+			page += 1
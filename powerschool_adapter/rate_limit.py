@@ -0,0 +1,131 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+
+
+class RateLimiter:
+	"""
+	Token bucket limiting requests per second plus a cap on requests in flight. One limiter
+	can be shared by every Request talking to a server, from threads and coroutines alike;
+	coroutines are capped per event loop.
+
+	With adaptive=True the rate is halved whenever the server answers 429 or a response is
+	slower than latency_threshold, and creeps back up by increase_step on each healthy response.
+	"""
+
+	registry = {}
+	registry_lock = threading.Lock()
+
+	def __init__(self, rate=None, burst=None, max_in_flight=None, adaptive=False, min_rate=1.0,
+				 increase_step=0.1, decrease_factor=0.5, latency_threshold=None):
+		self.max_rate = rate
+		self.rate = rate
+		self.burst = burst if burst is not None else max(1.0, rate or 1.0)
+		self.tokens = self.burst
+		self.updated_at = time.monotonic()
+		self.max_in_flight = max_in_flight
+		self.adaptive = adaptive
+		self.min_rate = min_rate
+		self.increase_step = increase_step
+		self.decrease_factor = decrease_factor
+		self.latency_threshold = latency_threshold
+		self.lock = threading.Lock()
+		self.thread_slots = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+		# asyncio semaphores are bound to one event loop, so a shared limiter keeps one per loop
+		self.async_slots = weakref.WeakKeyDictionary()
+
+	@classmethod
+	def for_server(cls, server_address, **options):
+		"""
+		Returns the limiter shared by every Request to server_address, creating it with options the first time.
+		"""
+		with cls.registry_lock:
+			if server_address not in cls.registry:
+				cls.registry[server_address] = cls(**options)
+			return cls.registry[server_address]
+
+	def reserve(self):
+		"""
+		Takes a token from the bucket and returns how long the caller must wait before using it.
+		"""
+		if not self.rate:
+			return 0.0
+		with self.lock:
+			now = time.monotonic()
+			self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+			self.updated_at = now
+			self.tokens -= 1
+			return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+	def acquire(self):
+		if self.thread_slots is not None:
+			self.thread_slots.acquire()
+		delay = self.reserve()
+		if delay:
+			time.sleep(delay)
+
+	def release(self):
+		if self.thread_slots is not None:
+			self.thread_slots.release()
+
+	def loop_slots(self):
+		loop = asyncio.get_running_loop()
+		with self.lock:
+			slots = self.async_slots.get(loop)
+			if slots is None:
+				slots = self.async_slots[loop] = asyncio.Semaphore(self.max_in_flight)
+			return slots
+
+	async def acquire_async(self):
+		if self.max_in_flight:
+			await self.loop_slots().acquire()
+		delay = self.reserve()
+		if delay:
+			await asyncio.sleep(delay)
+
+	def release_async(self):
+		if self.max_in_flight:
+			self.loop_slots().release()
+
+	def feedback(self, status, elapsed):
+		if not self.adaptive or not self.rate:
+			return
+		with self.lock:
+			if status == 429 or (self.latency_threshold and elapsed > self.latency_threshold):
+				self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+			elif status < 500:
+				self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+	def __enter__(self):
+		self.acquire()
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		self.release()
+
+	async def __aenter__(self):
+		await self.acquire_async()
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		self.release_async()
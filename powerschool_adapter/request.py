@@ -19,75 +19,246 @@ FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 
 import time
 import base64
+import logging
 import requests
-from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .codec import get_codec
+from .retry import RetryPolicy
+from .token_provider import DiskTokenStore, MemoryTokenStore, TokenProvider
+
+logger = logging.getLogger(__name__)
 
 
 class Request:
+	# Failures where no response arrived, retried according to the retry policy
+	transport_errors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
 
-	def __init__(self, server_address, client_id, client_secret, cache_key=None):
+	def __init__(self, server_address, client_id, client_secret, cache_key=None, timeout=None, keep_alive=True,
+				 pool_connections=10, pool_maxsize=10, pool_block=False, http2=False, token_store=None, token_refresh_margin=60,
+				 retry_policy=None, rate_limiter=None, response_cache=None, codec=None, schema=None,
+				 instrumentation=None, cassette=None):
 		self.server_address = server_address
 		self.client_id = client_id
 		self.client_secret = client_secret
 		self.cache_key = cache_key
-		self.cache = Cache('.cache') if cache_key else None
-		self.token = self._get_cached_token() if cache_key else None
-		self.client = requests.Session()
-		self.attempts = 0
-
-	def _get_cached_token(self):
-		# Fetch the token and its expiration time
-		cached_token = self.cache.get(self.cache_key, default=None, expire_time=True)
-		if cached_token:
-			token, expire_time = cached_token
-			if expire_time:
-				expiration_time_str = time.strftime('%Y-%m-%d %H:%M', time.localtime(expire_time))
-				print(f"The cached token '{token}' will expire at: {expiration_time_str}")
-			return token
-		print("No token found in cache.")
-		return None
-
-	def _cache_token(self, token, ttl):
-		self.cache.set(self.cache_key, token, expire=ttl)
-		self.cache.close()
-		print(f"Token cached successfully with key '{self.cache}' and TTL: {ttl}")
+		# A cache key keeps the token in a diskcache shared by every worker process unless another store is given
+		if token_store is None:
+			token_store = DiskTokenStore() if cache_key else MemoryTokenStore()
+		# The server and client always go into the key so clients sharing a store never see each other's tokens
+		token_key = f"{server_address}:{client_id}"
+		self.token_provider = TokenProvider(token_store, f"{cache_key}:{token_key}" if cache_key else token_key, token_refresh_margin)
+		# Either a single number of seconds or a (connect, read) tuple
+		self.timeout = timeout
+		self.keep_alive = keep_alive
+		# Number of hosts to keep pools for and the number of connections kept per host
+		self.pool_connections = pool_connections
+		self.pool_maxsize = pool_maxsize
+		self.pool_block = pool_block
+		self.http2 = http2
+		self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+		# Share RateLimiter.for_server(server_address, ...) between Requests to govern a whole server
+		self.rate_limiter = rate_limiter
+		self.response_cache = response_cache
+		# orjson or msgspec when installed, otherwise the standard library
+		self.codec = get_codec(codec)
+		# SchemaRegistry validating table queries and supplying default projections
+		self.schema = schema
+		# Instrumentation collecting latency, sizes, retries and spans
+		self.instrumentation = instrumentation
+		# Cassette recording every call, or replaying recorded calls without a network
+		self.cassette = cassette
+		self.client = self.create_client()
 
-	def make_request(self, method, endpoint, options=None, json=False):
-		if not self.token:
-			print("Token not found. Authenticating...")
-			self.authenticate()
+	def create_client(self):
+		if self.http2:
+			raise ValueError("HTTP/2 is only available on AsyncRequest. The requests based Request speaks HTTP/1.1.")
+		session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+		if self.cassette is not None:
+			adapter = self.cassette.adapter(adapter)
+		session.mount("https://", adapter)
+		session.mount("http://", adapter)
+		return session
 
-		self.attempts += 1
+	def pool_stats(self):
+		stats = {"connections": 0, "requests": 0, "reused": 0}
+		adapters = {id(adapter): adapter for adapter in self.client.adapters.values()}.values()
+		for adapter in adapters:
+			pools = getattr(adapter, "inner", adapter).poolmanager.pools
+			for key in pools.keys():
+				pool = pools[key]
+				stats["connections"] += pool.num_connections
+				stats["requests"] += pool.num_requests
+		stats["reused"] = stats["requests"] - stats["connections"]
+		return stats
 
+	@property
+	def token(self):
+		return self.token_provider.token
+
+	def make_request(self, method, endpoint, options=None, json=False):
 		if options is None:
 			options = {}
+		if self.timeout is not None:
+			options.setdefault("timeout", self.timeout)
 
-		headers = options.get("headers", {})
-		headers.update({
-			"Accept": "application/json",
-			"Content-Type": "application/json",
-			"Authorization": f"Bearer {self.token}"
-		})
-		options["headers"] = headers
+		if self.instrumentation is None:
+			response = self.dispatch(method, endpoint, options)
+		else:
+			event = self.instrumentation.start(method, endpoint, options)
+			try:
+				response = self.dispatch(method, endpoint, options)
+			except Exception as e:
+				self.instrumentation.finish(event, error=e)
+				raise
+			self.instrumentation.finish(event, response)
+		return self.codec.loads(response.content) if json else response
 
-		response = self.client.request(method, f"{self.server_address}{endpoint}", **options)
+	def dispatch(self, method, endpoint, options):
+		if self.response_cache is not None and self.response_cache.accepts(method, endpoint, options):
+			return self.make_cached_request(method, endpoint, options)
+		return self.execute(method, endpoint, options)
 
-		try:
-			response.raise_for_status()
-		except requests.exceptions.HTTPError as e:
-			if response.status_code == 401 and self.attempts < 3:
-				# Reauthenticate and retry the request
-				self.authenticate(force=True)
-				return self.make_request(method, endpoint, options, json)
-			raise e
+	def make_cached_request(self, method, endpoint, options):
+		key, entry, cached = self.cache_lookup(method, endpoint, options)
+		if cached is not None:
+			return cached
+		return self.cache_response(key, entry, endpoint, self.execute(method, endpoint, options))
 
-		self.attempts = 0
+	def cache_lookup(self, method, endpoint, options):
+		"""
+		Returns the cache key, the stored entry and a response built from it when it is still fresh.
+		A stale entry adds its validators to the request headers.
+		"""
+		cache = self.response_cache
+		key = cache.key(self.server_address, method, endpoint, options)
+		entry, fresh = cache.lookup(key)
+		if fresh:
+			return key, entry, self.build_cached_response(entry, endpoint)
+		if entry is not None:
+			options["headers"] = {**options.get("headers", {}), **cache.conditional_headers(entry)}
+		return key, entry, None
 
-		return response.json() if json else response
+	def cache_response(self, key, entry, endpoint, response):
+		cache = self.response_cache
+		if entry is not None:
+			if response.status_code == 304:
+				return self.build_cached_response(cache.revalidated(key, endpoint, entry), endpoint)
+			# The validators no longer matched, so the stale entry saved nothing
+			cache.record("misses")
+		cache.store(key, endpoint, response.status_code, response.headers, response.content)
+		return response
 
-	def authenticate(self, force=False):
-		if not force and self.token:
-			return
+	def build_cached_response(self, entry, endpoint):
+		response = requests.Response()
+		response.status_code = entry["status"]
+		response.headers = CaseInsensitiveDict(entry["headers"])
+		response._content = entry["content"]
+		response.encoding = "utf-8"
+		response.url = f"{self.server_address}{endpoint}"
+		return response
+
+	def encode_body(self, options):
+		# The body is encoded once with the codec instead of by requests on every attempt
+		if options.get("json") is not None:
+			options["data"] = self.codec.encode(options.pop("json"))
+		return options
+
+	def execute(self, method, endpoint, options):
+		token = self.authenticate()
+		options = self.encode_body(options)
+
+		# Retry budgets are counted per call so a Request can be shared between threads
+		auth_attempts = 0
+		retries = 0
+		while True:
+			options["headers"] = self.build_headers(options, token)
+			try:
+				response = self.send_request(method, endpoint, options)
+			except self.transport_errors as e:
+				retries += 1
+				time.sleep(self.error_retry_delay(method, endpoint, retries, e))
+				continue
+
+			if self.token_rejected(response, auth_attempts):
+				auth_attempts += 1
+				# Only the first request rejected with this token refreshes it, the rest reuse the new one
+				token = self.token_provider.refresh(self.fetch_token, stale=token)
+				continue
+
+			delay = self.status_retry_delay(method, endpoint, retries + 1, response)
+			if delay is None:
+				return response
+			retries += 1
+			time.sleep(delay)
+
+	def error_retry_delay(self, method, endpoint, retry, error):
+		"""
+		Returns the delay before the given retry of a call that failed with a transport error, or
+		re-raises the error when the retry policy gives up.
+		"""
+		delay = self.retry_policy.error_delay(method, endpoint, retry - 1)
+		if delay is None:
+			raise error
+		self.notify_retry(method=method, endpoint=endpoint, retry=retry, delay=delay, status=None, error=error)
+		return delay
+
+	def status_retry_delay(self, method, endpoint, retry, response):
+		"""
+		Returns the delay before retrying a response the retry policy considers transient. Otherwise
+		raises for an error status or returns None for a response to hand back.
+		"""
+		delay = self.retry_policy.status_delay(method, endpoint, retry - 1, response.status_code, response.headers)
+		if delay is None:
+			# httpx also raises for redirects, which would reject a 304 revalidating a cached response
+			if response.status_code >= 400:
+				response.raise_for_status()
+			return None
+		self.discard(response)
+		self.notify_retry(method=method, endpoint=endpoint, retry=retry, delay=delay, status=response.status_code, error=None)
+		return delay
+
+	def token_rejected(self, response, auth_attempts):
+		if response.status_code != 401 or auth_attempts >= 2:
+			return False
+		self.discard(response)
+		if self.instrumentation is not None:
+			self.instrumentation.record_auth_refresh()
+		return True
+
+	def discard(self, response):
+		response.close()
+
+	def notify_retry(self, **event):
+		logger.info("Retrying %s %s in %.2fs (retry %d, status %s, error %r)", event["method"], event["endpoint"],
+					event["delay"], event["retry"], event["status"], event["error"])
+		if self.instrumentation is not None:
+			self.instrumentation.record_retry(event)
+		self.retry_policy.notify(**event)
+
+	def send_request(self, method, endpoint, options):
+		if self.rate_limiter is None:
+			return self.client.request(method, f"{self.server_address}{endpoint}", **options)
+		with self.rate_limiter:
+			started = time.monotonic()
+			response = self.client.request(method, f"{self.server_address}{endpoint}", **options)
+		self.rate_limiter.feedback(response.status_code, time.monotonic() - started)
+		return response
+
+	def build_headers(self, options, token=None):
+		headers = dict(options.get("headers", {}))
+		headers.update({
+			"Accept": "application/json",
+			"Content-Type": "application/json",
+			"Authorization": f"Bearer {token or self.token}"
+		})
+		if not self.keep_alive:
+			headers["Connection"] = "close"
+		return headers
+
+	def build_authentication_request(self):
 		if not self.client_id or not self.client_secret:
 			raise ValueError("Missing either client ID or secret. Cannot authenticate with PowerSchool API.")
 		token = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
@@ -95,14 +266,25 @@ class Request:
 			"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
 			"Authorization": f"Basic {token}"
 		}
-		response = self.client.post(f"{self.server_address}/oauth/access_token", data={"grant_type": "client_credentials"}, headers=headers)
-		response.raise_for_status()
-		json_response = response.json()
-		self.token = json_response["access_token"]
+		return f"{self.server_address}/oauth/access_token", {"grant_type": "client_credentials"}, headers
+
+	def parse_token(self, json_response):
 		ttl = int(json_response["expires_in"])
-		print(f"Authenticated successfully. Token expires in {ttl} seconds.")
-		if self.cache_key:
-			self._cache_token(self.token, ttl)
+		logger.info("Authenticated successfully. Token expires in %d seconds.", ttl)
+		return json_response["access_token"], ttl
+
+	def fetch_token(self):
+		if self.instrumentation is not None:
+			self.instrumentation.record_token_fetch()
+		url, data, headers = self.build_authentication_request()
+		response = self.client.post(url, data=data, headers=headers, timeout=self.timeout)
+		response.raise_for_status()
+		return self.parse_token(self.codec.loads(response.content))
+
+	def authenticate(self, force=False):
+		if force:
+			return self.token_provider.refresh(self.fetch_token, stale=self.token)
+		return self.token_provider.get_token(self.fetch_token)
 
 	def get_client(self):
 		return self.client
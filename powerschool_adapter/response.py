@@ -18,27 +18,96 @@ FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 """
 
 import re
-import json
 from typing import Any, Dict, List, Optional
 
+from .codec import get_codec
+from .columnar import Columnar
+from .export import ArrowExporter
+from .paginator import batched
+
+
+# Marks data that has not been inferred from the original payload yet
+UNSET = object()
 
-class Response:
 
-	def __init__(self, data, key: str = "record"):
+class Response:
+	"""
+	Wraps a decoded page. Data inference, meta extraction and table squashing run on first
+	access of data/meta and are memoised, so a response that is only passed through or read
+	with get_original_data() never walks the payload. Slotted to keep page loops light.
+	"""
+
+	__slots__ = (
+		"original_data", "page_key", "table_name", "index", "is_single_item",
+		"_data", "_meta", "_expansions", "_extensions", "_squash", "codec",
+	)
+
+	def __init__(self, data, key: str = "record", codec=None):
 		# Data Example:
 		"""
 		{'name': 'Students', 'record': [{'id': 1, 'tables': {'students': {'dcid': '1', 'student_number': '10006', 'id': '1', 'first_name': 'Tony'}}}]}
 		"""
-		self.data = self.infer_data(data, key.lower()) if isinstance(data, dict) else data
-		self.table_name = data["name"].lower() if isinstance(data, dict) and "name" in data else None
 		self.original_data = data
-		self.expansions: Optional[List[str]] = None
-		self.extensions: Optional[List[str]] = None
-		self.meta: Dict[str, Any] = {}
+		self.page_key = key
+		self.table_name = data["name"].lower() if isinstance(data, dict) and "name" in data else None
 		self.index = 0
 		self.is_single_item = isinstance(key, int) and len(data) == 1
-		self.meta.update(data.get("@extensions", {}))
-		self.meta.update(data.get("@expansions", {}))
+		self._data = UNSET
+		self._meta: Dict[str, Any] = {}
+		self._expansions: Optional[List[str]] = None
+		self._extensions: Optional[List[str]] = None
+		# Arguments of a squash_table_response call waiting for the first access of data
+		self._squash = None
+		# The Request's codec; None uses the default one
+		self.codec = codec
+
+	def materialise(self):
+		data = self.original_data
+		if not isinstance(data, dict):
+			self._data = data
+			return
+		self._data = self.infer_data(data, self.page_key.lower())
+
+	@property
+	def data(self):
+		if self._data is UNSET:
+			self.materialise()
+		if self._squash is not None:
+			columnar, columns = self._squash
+			self._squash = None
+			self.apply_squash(columnar, columns)
+		return self._data
+
+	@data.setter
+	def data(self, data):
+		self._data = data
+		self._squash = None
+
+	@property
+	def meta(self) -> Dict[str, Any]:
+		if self._data is UNSET:
+			self.materialise()
+		return self._meta
+
+	@property
+	def expansions(self) -> Optional[List[str]]:
+		if self._data is UNSET:
+			self.materialise()
+		return self._expansions
+
+	@expansions.setter
+	def expansions(self, value):
+		self._expansions = value
+
+	@property
+	def extensions(self) -> Optional[List[str]]:
+		if self._data is UNSET:
+			self.materialise()
+		return self._extensions
+
+	@extensions.setter
+	def extensions(self, value):
+		self._extensions = value
 
 	def infer_data(self, data: Dict[str, Any], key: str) -> Dict[str, Any]:
 		if not data:
@@ -61,7 +130,9 @@ class Response:
 		meta_keys = ["@extensions", "@expansions"]
 		for meta_key in meta_keys:
 			self.set_meta(data, meta_key)
-			data.pop(meta_key, None)
+		if any(meta_key in data for meta_key in meta_keys):
+			# original_data is left as received, whichever accessor runs first
+			data = {k: v for k, v in data.items() if k not in meta_keys}
 
 		if key in data:
 			return data[key]
@@ -90,24 +161,34 @@ class Response:
 		if property in ["extensions", "expansions"]:
 			setattr(self, property, self.split_comma_string(value))
 		else:
-			self.meta[property] = value
+			self._meta[property] = value
 
 	def get_meta(self):
 		return self.meta
 
-	def squash_table_response(self):
-		if not self.table_name:
-			return self
-		is_assoc = isinstance(self.data, dict)
-		if is_assoc:
-			self.data = [self.data]
-		self.data = [
-			datum["tables"][self.table_name] for datum in self.data if "tables" in datum
-		]
-		if is_assoc:
-			self.data = self.data[0] if self.data else None
+	def squash_table_response(self, columnar: bool = False, columns: Optional[List[str]] = None):
+		# Applied on the next access of data
+		if self._squash is not None:
+			self.data
+		self._squash = (columnar, columns)
 		return self
 
+	def apply_squash(self, columnar: bool, columns: Optional[List[str]]):
+		data = self._data
+		if self.table_name and not isinstance(data, Columnar):
+			is_assoc = isinstance(data, dict)
+			if is_assoc:
+				data = [data]
+			data = [
+				datum["tables"][self.table_name] for datum in data if "tables" in datum
+			]
+			if is_assoc:
+				data = data[0] if data else None
+		if columnar and isinstance(data, list):
+			# Rows share one schema, taken from the projection when the caller knows it
+			data = Columnar.from_dicts(data, columns)
+		self._data = data
+
 	def split_comma_string(self, string: Optional[str]) -> List[str]:
 		if not string:
 			return []
@@ -118,10 +199,24 @@ class Response:
 		return not bool(self.data)
 
 	def count(self) -> int:
-		return len(self.data) if isinstance(self.data, list) else 1
+		return len(self.data) if isinstance(self.data, (list, Columnar)) else 1
+
+	def raw_count(self) -> int:
+		"""
+		Counts rows as count() would, read from the page as received so data is not materialised.
+		"""
+		if self._data is not UNSET or not isinstance(self.original_data, dict):
+			return 0 if self.is_empty() else self.count()
+		key = self.page_key.lower()
+		items = self.original_data.get(key)
+		if items is None and isinstance(self.original_data.get(f"{key}s"), dict):
+			items = self.original_data[f"{key}s"].get(key)
+		if isinstance(items, list):
+			return len(items)
+		return 1 if items or self.original_data else 0
 
 	def current(self) -> Any:
-		if isinstance(self.data, list):
+		if isinstance(self.data, (list, Columnar)):
 			return self.data[self.index] if self.index < len(self.data) else None
 		return self.data
 
@@ -132,9 +227,14 @@ class Response:
 		return self.index
 
 	def to_list(self) -> List[Dict[str, Any]]:
+		if isinstance(self.data, Columnar):
+			return self.data.to_list()
 		return self.data if isinstance(self.data, list) else [self.data]
 
 	def to_dict(self) -> Dict[str, Any]:
+		if isinstance(self.data, Columnar):
+			return self.data.to_dict()
+
 		if isinstance(self.data, dict):
 			return self.data  # Already a dictionary, return as is
 
@@ -148,8 +248,34 @@ class Response:
 
 		return {}  # If self.data is not a list or dict, return an empty dict
 
+	def rows(self) -> List[Dict[str, Any]]:
+		# Reads the records through to_list(), then unwraps table records into a new list;
+		# unlike squash_table_response(), self.data keeps its {"tables": ...} shape
+		rows = self.to_list() if not self.is_empty() else []
+		if self.table_name and not isinstance(self.data, Columnar):
+			return [row["tables"][self.table_name] if isinstance(row, dict) and "tables" in row else row for row in rows]
+		return rows
+
+	def to_arrow(self, types: Optional[Dict[str, str]] = None, columns: Optional[List[str]] = None):
+		return ArrowExporter(columns, types).to_table([self.rows()])
+
+	def to_pandas(self, types: Optional[Dict[str, str]] = None, columns: Optional[List[str]] = None):
+		return ArrowExporter(columns, types).to_pandas([self.rows()])
+
+	def to_parquet(self, path, types: Optional[Dict[str, str]] = None, columns: Optional[List[str]] = None) -> int:
+		return ArrowExporter(columns, types).to_parquet(path, [self.rows()])
+
 	def to_json(self) -> str:
-		return json.dumps(self.data)
+		return get_codec(self.codec).dumps(self.data)
 
 	def rewind(self) -> None:
 		self.index = 0
+
+	def __iter__(self):
+		return iter(self.rows())
+
+	def __len__(self) -> int:
+		return 0 if self.is_empty() else self.count()
+
+	def batched(self, size: int):
+		return batched(self.rows(), size)
@@ -0,0 +1,190 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+
+from diskcache import Cache
+
+from .paths import user_cache_dir
+
+
+class MemoryCacheBackend:
+	"""
+	In-process LRU bounded by entry count and total body size. Entries are dropped once their expire has passed.
+	"""
+
+	def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.entries = OrderedDict()
+		self.size = 0
+		self.evictions = 0
+		self.lock = threading.Lock()
+
+	def get(self, key):
+		with self.lock:
+			item = self.entries.get(key)
+			if item is None:
+				return None
+			entry, deadline = item
+			if deadline is not None and time.time() >= deadline:
+				self.remove(key)
+				return None
+			self.entries.move_to_end(key)
+			return entry
+
+	def remove(self, key):
+		entry, _ = self.entries.pop(key)
+		self.size -= len(entry["content"])
+
+	def set(self, key, entry, expire=None):
+		with self.lock:
+			if key in self.entries:
+				self.remove(key)
+			self.entries[key] = (entry, time.time() + expire if expire is not None else None)
+			self.size += len(entry["content"])
+			while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+				self.remove(next(iter(self.entries)))
+				self.evictions += 1
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+			self.size = 0
+
+
+class DiskCacheBackend:
+	"""
+	diskcache backed store shared between processes, evicting least recently used entries past size_limit bytes.
+	"""
+
+	def __init__(self, directory=None, size_limit=256 * 1024 * 1024):
+		self.cache = Cache(directory if directory is not None else user_cache_dir("responses"), size_limit=size_limit, eviction_policy="least-recently-used")
+
+	def get(self, key):
+		return self.cache.get(key)
+
+	def set(self, key, entry, expire=None):
+		self.cache.set(key, entry, expire=expire)
+
+	def clear(self):
+		self.cache.clear()
+
+
+class ResponseCache:
+	"""
+	Opt-in cache for read requests, keyed on server, method, endpoint, normalised params and body.
+	Entries are fresh for the endpoint's TTL. Stale entries carrying an ETag or Last-Modified
+	validator are kept for revalidate_ttl and revalidated with a conditional request.
+	"""
+
+	VALIDATOR_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+	def __init__(self, backend=None, ttl=300, ttls=None, methods=("GET",), power_queries=True, revalidate_ttl=86400):
+		self.backend = backend if backend is not None else MemoryCacheBackend()
+		self.ttl = ttl
+		# Endpoint prefix -> TTL in seconds; the longest matching prefix wins and 0 disables caching
+		self.ttls = dict(ttls or {})
+		self.methods = frozenset(method.upper() for method in methods)
+		self.power_queries = power_queries
+		self.revalidate_ttl = revalidate_ttl
+		self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0}
+		self.lock = threading.Lock()
+
+	def record(self, counter):
+		with self.lock:
+			self.stats[counter] += 1
+
+	def get_stats(self):
+		stats = dict(self.stats)
+		stats["evictions"] = getattr(self.backend, "evictions", None)
+		return stats
+
+	def ttl_for(self, endpoint):
+		matches = [prefix for prefix in self.ttls if endpoint.startswith(prefix)]
+		return self.ttls[max(matches, key=len)] if matches else self.ttl
+
+	def accepts(self, method, endpoint, options):
+		if options.get("stream") or not self.ttl_for(endpoint):
+			return False
+		if method.upper() in self.methods:
+			return True
+		# PowerQueries are POSTed but only read data
+		return self.power_queries and method.upper() == "POST" and endpoint.startswith("/ws/schema/query/")
+
+	def key(self, server_address, method, endpoint, options):
+		params = options.get("params") or ""
+		if isinstance(params, str):
+			params = parse_qsl(params, keep_blank_values=True)
+		elif isinstance(params, dict):
+			params = list(params.items())
+		body = json.dumps(options.get("json"), sort_keys=True, default=str)
+		raw = json.dumps([server_address, method.upper(), endpoint, sorted(params), body])
+		return hashlib.sha256(raw.encode()).hexdigest()
+
+	def lookup(self, key):
+		"""
+		Returns (entry, fresh). entry is None on a miss.
+		"""
+		entry = self.backend.get(key)
+		if entry is None:
+			self.record("misses")
+			return None, False
+		if time.time() < entry["expires_at"]:
+			self.record("hits")
+			return entry, True
+		if not self.conditional_headers(entry):
+			# Nothing to revalidate with, the entry is as good as absent
+			self.record("misses")
+			return None, False
+		return entry, False
+
+	def conditional_headers(self, entry):
+		headers = {}
+		if entry["headers"].get("ETag"):
+			headers["If-None-Match"] = entry["headers"]["ETag"]
+		if entry["headers"].get("Last-Modified"):
+			headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+		return headers
+
+	def store(self, key, endpoint, status, headers, content):
+		if status != 200:
+			return None
+		ttl = self.ttl_for(endpoint)
+		kept = {name: headers.get(name) for name in self.VALIDATOR_HEADERS if headers.get(name)}
+		entry = {"status": status, "headers": kept, "content": content, "expires_at": time.time() + ttl}
+		has_validator = "ETag" in kept or "Last-Modified" in kept
+		self.backend.set(key, entry, expire=ttl + self.revalidate_ttl if has_validator else ttl)
+		self.record("stores")
+		return entry
+
+	def revalidated(self, key, endpoint, entry):
+		ttl = self.ttl_for(endpoint)
+		entry = dict(entry, expires_at=time.time() + ttl)
+		self.backend.set(key, entry, expire=ttl + self.revalidate_ttl)
+		self.record("revalidated")
+		return entry
+
+	def clear(self):
+		self.backend.clear()
@@ -0,0 +1,96 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy:
+	"""
+	Decides whether a failed call is retried and how long to wait first. Waits grow
+	exponentially with full jitter and a Retry-After header from the server takes precedence.
+	Budgets are counted per call, so one policy can be shared by every thread and coroutine.
+	"""
+
+	IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+	# PowerQueries are sent with POST but never modify data
+	IDEMPOTENT_ENDPOINTS = ("/ws/schema/query/",)
+
+	def __init__(self, total=3, backoff_factor=0.5, max_backoff=60, jitter=True,
+				 status_forcelist=(429, 500, 502, 503, 504), retry_methods=IDEMPOTENT_METHODS,
+				 respect_retry_after=True, max_retry_after=300, on_retry=None):
+		self.total = total
+		self.backoff_factor = backoff_factor
+		self.max_backoff = max_backoff
+		self.jitter = jitter
+		self.status_forcelist = frozenset(status_forcelist)
+		self.retry_methods = frozenset(method.upper() for method in retry_methods)
+		self.respect_retry_after = respect_retry_after
+		self.max_retry_after = max_retry_after
+		self.hooks = list(on_retry or [])
+
+	def on_retry(self, hook):
+		self.hooks.append(hook)
+		return hook
+
+	def is_idempotent(self, method, endpoint):
+		return method.upper() in self.retry_methods or endpoint.startswith(self.IDEMPOTENT_ENDPOINTS)
+
+	def backoff(self, retries):
+		delay = min(self.max_backoff, self.backoff_factor * (2 ** retries))
+		return random.uniform(0, delay) if self.jitter else delay
+
+	def parse_retry_after(self, value):
+		if not value:
+			return None
+		try:
+			return max(float(value), 0.0)
+		except ValueError:
+			pass
+		try:
+			return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+		except (TypeError, ValueError):
+			return None
+
+	def status_delay(self, method, endpoint, retries, status, headers=None):
+		"""
+		Returns the seconds to wait before retrying a response with this status, or None to give up.
+		"""
+		if retries >= self.total or status not in self.status_forcelist:
+			return None
+		# A 429 is rejected before it is processed, so it is safe to retry for every method
+		if status != 429 and not self.is_idempotent(method, endpoint):
+			return None
+		retry_after = self.parse_retry_after((headers or {}).get("Retry-After")) if self.respect_retry_after else None
+		if retry_after is not None:
+			return min(retry_after, self.max_retry_after)
+		return self.backoff(retries)
+
+	def error_delay(self, method, endpoint, retries):
+		"""
+		Returns the seconds to wait before retrying after a connection error, or None to give up.
+		"""
+		if retries >= self.total or not self.is_idempotent(method, endpoint):
+			return None
+		return self.backoff(retries)
+
+	def notify(self, **event):
+		for hook in self.hooks:
+			hook(event)
@@ -0,0 +1,207 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import difflib
+import re
+import threading
+import time
+
+from .response_cache import MemoryCacheBackend
+
+# Field names on the left of a FIQL comparison: id==1, last_name=like=A*, grade_level=ge=9
+FIQL_FIELD = re.compile(r"([A-Za-z_][\w.]*)\s*(?:==|!=|=[a-z]+=|<=|>=|<|>)")
+
+
+class SchemaError(ValueError):
+	pass
+
+
+class TableSchema:
+	"""
+	Column definitions of one table, keyed by lower case column name.
+	"""
+
+	__slots__ = ("name", "columns")
+
+	def __init__(self, name, columns):
+		self.name = name.lower()
+		self.columns = {column["name"].lower(): column for column in columns}
+
+	@classmethod
+	def from_metadata(cls, name, payload):
+		columns = find_columns(payload)
+		if columns is None:
+			raise SchemaError(f"No column definitions in the metadata of table '{name}'.")
+		return cls(name, [column if isinstance(column, dict) else {"name": column} for column in columns])
+
+	def __contains__(self, column):
+		return column.lower() in self.columns
+
+	def column(self, name):
+		return self.columns.get(name.lower())
+
+	def check(self, fields, usage):
+		# Columns of the queried table may be qualified with its name: students.last_name
+		unknown = [field for field in fields if field.lower().removeprefix(f"{self.name}.") not in self.columns]
+		if unknown:
+			hints = [f"'{field}'" + (f" (did you mean '{match[0]}'?)" if (match := difflib.get_close_matches(field.lower(), self.columns, 1)) else "")
+					 for field in unknown]
+			raise SchemaError(f"Unknown {usage} column(s) on table '{self.name}': {', '.join(hints)}.")
+
+
+def find_columns(payload):
+	# The column list is nested differently between PowerSchool versions
+	if isinstance(payload, dict):
+		if isinstance(payload.get("columns"), list):
+			return payload["columns"]
+		if isinstance(payload.get("column"), list):
+			return payload["column"]
+		for value in payload.values():
+			columns = find_columns(value)
+			if columns is not None:
+				return columns
+	return None
+
+
+def split_fields(value):
+	return [field.strip().lstrip("-+") for field in str(value).split(",") if field.strip()]
+
+
+def expression_fields(expression):
+	# Quoted values can contain operators, so they are dropped before looking for field names
+	expression = re.sub(r"\"[^\"]*\"|'[^']*'", "''", str(expression))
+	return FIQL_FIELD.findall(expression)
+
+
+class SchemaRegistry:
+	"""
+	Caches table metadata from /ws/schema/table/{table}/metadata and checks projection, sort, q and
+	body column names of table queries before they are sent. Tables can be given a minimal default
+	column set that replaces projection=* when a query does not pick its own projection.
+	Pass a DiskCacheBackend to share metadata between processes.
+	"""
+
+	def __init__(self, backend=None, ttl=86400, validate=True, projections=None):
+		self.backend = backend if backend is not None else MemoryCacheBackend()
+		self.ttl = ttl
+		self.validate = validate
+		self.projections = {}
+		for table, columns in (projections or {}).items():
+			self.declare(table, columns)
+		self.tables = {}
+		self.lock = threading.Lock()
+
+	def declare(self, table, columns):
+		if isinstance(columns, str):
+			columns = split_fields(columns)
+		self.projections[table.lower()] = ",".join(column.lower() for column in columns)
+		return self
+
+	def projection_for(self, table):
+		return self.projections.get(table.lower()) if table else None
+
+	def key(self, request, table):
+		return f"schema:{request.server_address}:{table.lower()}"
+
+	def endpoint(self, table):
+		return f"/ws/schema/table/{table.lower()}/metadata"
+
+	def cached(self, key):
+		with self.lock:
+			cached = self.tables.get(key)
+		if cached is not None and cached[0] > time.monotonic():
+			return cached[1]
+		entry = self.backend.get(key)
+		if entry is not None and entry["expires"] > time.time():
+			return self.remember(key, entry)
+		return None
+
+	def remember(self, key, entry):
+		schema = TableSchema(entry["table"], entry["columns"])
+		with self.lock:
+			self.tables[key] = (time.monotonic() + entry["expires"] - time.time(), schema)
+		return schema
+
+	def store(self, key, table, payload):
+		schema = TableSchema.from_metadata(table, payload)
+		# Backends account entries by their content size
+		entry = {"table": table, "columns": list(schema.columns.values()), "expires": time.time() + self.ttl, "content": b""}
+		self.backend.set(key, entry, expire=self.ttl)
+		return self.remember(key, entry)
+
+	def table(self, request, table):
+		key = self.key(request, table)
+		schema = self.cached(key)
+		if schema is None:
+			schema = self.store(key, table, request.make_request("GET", self.endpoint(table), {}, True))
+		return schema
+
+	async def table_async(self, request, table):
+		key = self.key(request, table)
+		schema = self.cached(key)
+		if schema is None:
+			schema = self.store(key, table, await request.make_request("GET", self.endpoint(table), {}, True))
+		return schema
+
+	def invalidate(self, request=None, table=None):
+		with self.lock:
+			if table is None:
+				self.tables.clear()
+			else:
+				self.tables.pop(self.key(request, table), None)
+		if table is None:
+			self.backend.clear()
+
+	def checked_fields(self, query):
+		fields = []
+		projection = query.query_string.get("projection")
+		if projection and projection != "*":
+			fields.append(("projection", split_fields(projection)))
+		elif query.include_projection and self.projection_for(query.table_name):
+			fields.append(("projection", split_fields(self.projection_for(query.table_name))))
+		if query.query_string.get("sort"):
+			fields.append(("sort", split_fields(query.query_string["sort"])))
+		if query.query_string.get("q"):
+			fields.append(("q", expression_fields(query.query_string["q"])))
+		if query.data and query.http_method in (query.POST, query.PUT, query.PATCH):
+			fields.append(("body", list(query.data)))
+		return fields
+
+	def applies_to(self, query):
+		# PowerQueries and v1 resources have no table metadata
+		return self.validate and query.table_name and query.endpoint and query.endpoint.startswith("/ws/schema/table/") \
+			and not query.endpoint.endswith("/metadata")
+
+	def check(self, query):
+		if not self.applies_to(query):
+			return
+		fields = self.checked_fields(query)
+		if fields:
+			schema = self.table(query.request, query.table_name)
+			for usage, names in fields:
+				schema.check(names, usage)
+
+	async def check_async(self, query):
+		if not self.applies_to(query):
+			return
+		fields = self.checked_fields(query)
+		if fields:
+			schema = await self.table_async(query.request, query.table_name)
+			for usage, names in fields:
+				schema.check(names, usage)
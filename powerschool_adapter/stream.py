@@ -0,0 +1,70 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from .codec import get_codec
+from .response import Response
+
+try:
+	import ijson
+except ImportError:  # pragma: no cover - optional dependency
+	ijson = None
+
+
+def item_prefix(key: str) -> str:
+	# Table and PowerQuery pages hold rows under "record", v1 resources under "<key>s.<key>"
+	return key if key == "record" else f"{key}s.{key}"
+
+
+def iter_items(fp, prefix: str):
+	"""
+	Incrementally yields every object found at prefix. PowerSchool returns a bare object
+	instead of a one element array when a v1 resource holds a single item, so both forms are handled.
+	"""
+	events = iter(ijson.parse(fp, use_float=True))
+	for current, event, value in events:
+		if event != "start_map" or current not in (prefix, f"{prefix}.item"):
+			continue
+		builder = ijson.ObjectBuilder()
+		builder.event(event, value)
+		for nested, event, value in events:
+			builder.event(event, value)
+			if nested == current and event == "end_map":
+				break
+		yield builder.value
+
+
+def squash_record(record, table_name: str = None):
+	tables = record.get("tables") if isinstance(record, dict) else None
+	if not tables:
+		return record
+	if table_name and table_name.lower() in tables:
+		return tables[table_name.lower()]
+	return next(iter(tables.values()))
+
+
+def iter_rows(fp, key: str = "record", table_name: str = None, codec=None):
+	if ijson is None:
+		# Without ijson the page has to be decoded in one go
+		codec = get_codec(codec)
+		response = Response(codec.loads(fp.read()), key, codec)
+		records = response.data if isinstance(response.data, list) else [response.data] if response.data else []
+	else:
+		records = iter_items(fp, item_prefix(key.lower()))
+	for record in records:
+		yield squash_record(record, table_name)
@@ -0,0 +1,153 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from diskcache import Cache
+
+from .paths import user_cache_dir
+
+SyncEvent = namedtuple("SyncEvent", ["action", "table", "id", "row", "version"])
+
+
+def row_value(row, column):
+	"""
+	Looks a column up case-insensitively; PowerQuery rows qualify it as table.column.
+	"""
+	column = column.lower()
+	for key, value in row.items():
+		key = key.lower()
+		if key == column or key.endswith(f".{column}"):
+			return value
+	return None
+
+
+class MemoryVersionStore:
+
+	def __init__(self):
+		self.versions = {}
+
+	def get(self, application, table):
+		return self.versions.get((application, table))
+
+	def set(self, application, table, version):
+		self.versions[(application, table)] = version
+
+
+class DiskVersionStore:
+	"""
+	Persists data versions in a diskcache directory so they survive restarts.
+	"""
+
+	def __init__(self, directory=None):
+		self.cache = Cache(directory if directory is not None else user_cache_dir("dataversions"))
+
+	def get(self, application, table):
+		return self.cache.get(f"{application}:{table}")
+
+	def set(self, application, table, version):
+		self.cache.set(f"{application}:{table}", version)
+
+
+class IncrementalSync:
+	"""
+	Pulls the change set for a PowerSchool application since the last stored data version,
+	re-fetches the changed rows in batches with `id=in=(...)` filters (or a named query) and
+	yields them as upsert/delete events. The new version is stored once every event is consumed.
+
+	Data versions belong to the application, so one version is kept per application (under
+	the "*" table of the store) and every table is synced from it.
+	"""
+
+	UPSERT = "upsert"
+	DELETE = "delete"
+
+	def __init__(self, powerschool, application, store=None, initial_version=None, batch_size=100, max_workers=4,
+				 id_column="id", projections=None, named_queries=None):
+		self.powerschool = powerschool
+		self.application = application
+		self.store = store if store is not None else MemoryVersionStore()
+		self.initial_version = initial_version
+		self.batch_size = batch_size
+		self.max_workers = max_workers
+		self.id_column = id_column
+		# Table -> projection list used when re-fetching changed rows
+		self.projections = {table.lower(): projection for table, projection in (projections or {}).items()}
+		# Table -> (query name, argument name) used instead of a table query
+		self.named_queries = {table.lower(): query for table, query in (named_queries or {}).items()}
+
+	def get_version(self):
+		version = self.store.get(self.application, "*")
+		if version is None:
+			version = self.initial_version
+		if version is None:
+			raise ValueError(f"No data version stored for '{self.application}'. Pass initial_version to start syncing.")
+		return version
+
+	def commit(self, version):
+		self.store.set(self.application, "*", version)
+
+	def changes(self):
+		"""
+		Returns the new data version and a mapping of lower cased table name -> changed ids.
+		"""
+		response = self.powerschool.new_query().untracked().get_subscription_changes(self.application, self.get_version())
+		data = response.get_original_data() or {}
+		tables = {table.lower(): [str(i) for i in ids] for table, ids in (data.get("tables") or {}).items()}
+		return data.get("$dataversion"), tables
+
+	def batches(self, ids):
+		for start in range(0, len(ids), self.batch_size):
+			yield ids[start:start + self.batch_size]
+
+	def projection_for(self, table):
+		projection = self.projections[table]
+		columns = [column.strip() for column in projection.split(",")] if isinstance(projection, str) else list(projection)
+		# Deletes are inferred from missing ids, so the id column has to come back with every row
+		if "*" not in columns and self.id_column.lower() not in (column.lower() for column in columns):
+			columns.append(self.id_column)
+		return columns
+
+	def fetch_batch(self, table, ids):
+		if table in self.named_queries:
+			query_name, argument = self.named_queries[table]
+			query = self.powerschool.new_query().untracked().pq(query_name).with_data({argument: ids})
+			rows = [row for response in query.iter_pages(page_size=self.batch_size, prefetch=0) for row in response.rows()]
+		else:
+			query = self.powerschool.new_query().untracked().table(table)
+			if table in self.projections:
+				query = query.projection(self.projection_for(table))
+			# Table columns come back lower cased
+			rows = query.fetch_many(ids, self.id_column.lower(), max_batch=self.batch_size, max_workers=1).found.values()
+		return {str(row_value(row, self.id_column)): row for row in rows if row}
+
+	def events(self, auto_commit=True):
+		version, tables = self.changes()
+		jobs = [(table, batch) for table, ids in tables.items() for batch in self.batches(ids)]
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			results = executor.map(lambda job: self.fetch_batch(*job), jobs)
+			for (table, batch), rows in zip(jobs, results):
+				for row_id in batch:
+					row = rows.get(row_id)
+					# A changed id the table no longer returns was deleted
+					action = self.UPSERT if row is not None else self.DELETE
+					yield SyncEvent(action, table, row_id, row, version)
+		if auto_commit and version is not None:
+			self.commit(version)
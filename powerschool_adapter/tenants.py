@@ -0,0 +1,245 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .async_query import AsyncQuery
+from .async_request import AsyncRequest
+from .query import Query
+from .rate_limit import RateLimiter
+from .request import Request
+
+TenantResult = namedtuple("TenantResult", ["tenant", "value", "error", "elapsed"])
+TenantPage = namedtuple("TenantPage", ["tenant", "page", "response", "error"])
+
+
+class Tenant:
+	"""
+	Credentials of one district. The Request (and its connection pool and token) is only
+	created on first use, and every request to the tenant goes through its own rate limiter.
+	"""
+
+	def __init__(self, name, server_address, client_id, client_secret, rate=None, max_in_flight=None, **request_options):
+		self.name = name
+		self.server_address = server_address
+		self.client_id = client_id
+		self.client_secret = client_secret
+		self.rate_limiter = RateLimiter(rate, max_in_flight=max_in_flight) if rate or max_in_flight else None
+		self.request_options = request_options
+		self.lock = threading.Lock()
+		self.request = None
+		self.async_request = None
+
+	def create(self, request_class):
+		options = {"rate_limiter": self.rate_limiter, **self.request_options}
+		return request_class(self.server_address, self.client_id, self.client_secret, **options)
+
+	def get_request(self) -> Request:
+		with self.lock:
+			if self.request is None:
+				self.request = self.create(Request)
+			return self.request
+
+	def get_async_request(self) -> AsyncRequest:
+		with self.lock:
+			if self.async_request is None:
+				self.async_request = self.create(AsyncRequest)
+			return self.async_request
+
+	def query(self) -> Query:
+		return Query(self.get_request())
+
+	def async_query(self) -> AsyncQuery:
+		return AsyncQuery(self.get_async_request())
+
+	def close(self):
+		if self.request is not None:
+			self.request.client.close()
+			self.request = None
+
+	async def aclose(self):
+		if self.async_request is not None:
+			await self.async_request.aclose()
+			self.async_request = None
+
+
+class TenantRegistry:
+	"""
+	Runs the same job against many PowerSchool servers at once. Results are yielded as each
+	tenant finishes, tagged with the tenant name, so one slow district never holds up the rest.
+	A job that fails for one tenant is reported in its result instead of stopping the others.
+	"""
+
+	def __init__(self, max_workers=8):
+		self.tenants = {}
+		self.max_workers = max_workers
+
+	def add(self, name, server_address, client_id, client_secret, **options) -> Tenant:
+		# options: rate, max_in_flight and any Request option (timeout, retry_policy, cache_key...)
+		tenant = self.tenants[name] = Tenant(name, server_address, client_id, client_secret, **options)
+		return tenant
+
+	def remove(self, name):
+		tenant = self.tenants.pop(name, None)
+		if tenant is not None:
+			tenant.close()
+
+	def get(self, name) -> Tenant:
+		return self.tenants[name]
+
+	def names(self):
+		return list(self.tenants)
+
+	def select(self, names=None):
+		return [self.tenants[name] for name in names] if names is not None else list(self.tenants.values())
+
+	def __len__(self):
+		return len(self.tenants)
+
+	def __iter__(self):
+		return iter(self.tenants.values())
+
+	def close(self):
+		for tenant in self.tenants.values():
+			tenant.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		self.close()
+
+	@staticmethod
+	def call(tenant, job):
+		started = time.perf_counter()
+		try:
+			return TenantResult(tenant.name, job(tenant.query()), None, time.perf_counter() - started)
+		except Exception as e:
+			return TenantResult(tenant.name, None, e, time.perf_counter() - started)
+
+	def run(self, job, tenants=None):
+		"""
+		Calls job(query) once per tenant with a fresh Query and yields TenantResults in completion order.
+		"""
+		selected = self.select(tenants)
+		with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(selected)))) as executor:
+			futures = [executor.submit(self.call, tenant, job) for tenant in selected]
+			for future in as_completed(futures):
+				yield future.result()
+
+	def gather(self, job, tenants=None):
+		"""
+		Runs job on every tenant and returns {tenant: value}, raising the first error.
+		"""
+		results = {}
+		for result in self.run(job, tenants):
+			if result.error is not None:
+				raise result.error
+			results[result.tenant] = result.value
+		return results
+
+	def pages(self, build, page_size=100, tenants=None):
+		"""
+		Pages through build(query) on every tenant concurrently and yields TenantPages as they
+		arrive. Pages of one tenant stay in order; a failed tenant yields a single page with its error.
+		"""
+		selected = self.select(tenants)
+		results = queue.Queue(maxsize=self.max_workers * 2)
+		stopped = threading.Event()
+		done = object()
+
+		def put(item):
+			# Bounded so fast tenants wait for the consumer; gives up once the consumer has gone away
+			while not stopped.is_set():
+				try:
+					results.put(item, timeout=0.1)
+					return True
+				except queue.Full:
+					continue
+			return False
+
+		def paginate(tenant):
+			page = 0
+			try:
+				paginator = build(tenant.query()).paginator(page_size)
+				while not stopped.is_set():
+					response = paginator.next_page()
+					if response is None:
+						break
+					page += 1
+					if not put(TenantPage(tenant.name, page, response, None)):
+						return
+			except Exception as e:
+				put(TenantPage(tenant.name, page + 1, None, e))
+			finally:
+				put(done)
+
+		with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(selected)))) as executor:
+			for tenant in selected:
+				executor.submit(paginate, tenant)
+			remaining = len(selected)
+			try:
+				while remaining:
+					item = results.get()
+					if item is done:
+						remaining -= 1
+						continue
+					yield item
+			finally:
+				stopped.set()
+
+	def rows(self, build, page_size=100, tenants=None):
+		"""
+		Yields (tenant, row) pairs across every tenant, raising the first tenant error.
+		"""
+		for page in self.pages(build, page_size, tenants):
+			if page.error is not None:
+				raise page.error
+			for row in page.response.rows():
+				yield page.tenant, row
+
+	async def call_async(self, tenant, job):
+		started = time.perf_counter()
+		try:
+			return TenantResult(tenant.name, await job(tenant.async_query()), None, time.perf_counter() - started)
+		except Exception as e:
+			return TenantResult(tenant.name, None, e, time.perf_counter() - started)
+
+	async def run_async(self, job, tenants=None):
+		"""
+		Asyncio version of run: job(query) receives an AsyncQuery and returns an awaitable.
+		At most max_workers tenants are worked on at a time.
+		"""
+		slots = asyncio.Semaphore(self.max_workers)
+
+		async def call(tenant):
+			async with slots:
+				return await self.call_async(tenant, job)
+
+		for future in asyncio.as_completed([call(tenant) for tenant in self.select(tenants)]):
+			yield await future
+
+	async def aclose(self):
+		for tenant in self.tenants.values():
+			await tenant.aclose()
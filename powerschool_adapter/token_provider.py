@@ -0,0 +1,184 @@
+"""
+Copyright © 2025 TONYLABS TECH CO., LTD..
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without
+restriction, including without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or
+substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING
+BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES, OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT, OR OTHERWISE, ARISING
+FROM, OUT OF, OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+
+from diskcache import Cache, Lock
+
+from .paths import user_cache_dir
+
+
+class MemoryTokenStore:
+	"""
+	Keeps tokens in process memory. Share one instance between Requests to share their tokens.
+	"""
+
+	def __init__(self):
+		self.tokens = {}
+		self.locks = {}
+		self.guard = threading.Lock()
+
+	def get(self, key):
+		return self.tokens.get(key)
+
+	def set(self, key, token, expires_at):
+		self.tokens[key] = (token, expires_at)
+
+	def delete(self, key):
+		self.tokens.pop(key, None)
+
+	def lock(self, key):
+		with self.guard:
+			return self.locks.setdefault(key, threading.Lock())
+
+
+class DiskTokenStore:
+	"""
+	Keeps tokens in a diskcache directory shared by every process on the host. Refreshes are
+	serialised across processes with a diskcache lock so only one worker calls /oauth/access_token.
+	"""
+
+	def __init__(self, directory=None, lock_timeout=30):
+		self.directory = directory if directory is not None else user_cache_dir("tokens")
+		self.lock_timeout = lock_timeout
+		self.cache = Cache(self.directory)
+
+	def get(self, key):
+		return self.cache.get(key, default=None)
+
+	def set(self, key, token, expires_at):
+		self.cache.set(key, (token, expires_at), expire=max(expires_at - time.time(), 0))
+
+	def delete(self, key):
+		self.cache.delete(key)
+
+	def lock(self, key):
+		# The lock expires on its own if the process holding it dies mid refresh
+		return Lock(self.cache, f"{key}:lock", expire=self.lock_timeout)
+
+
+class TokenProvider:
+	"""
+	Hands out the access token and refreshes it `refresh_margin` seconds before it expires.
+	Refreshes are single-flight: threads and coroutines wait for the refresh already in progress
+	and processes coordinate through the store's lock.
+	"""
+
+	def __init__(self, store=None, key="powerschool", refresh_margin=60):
+		self.store = store if store is not None else MemoryTokenStore()
+		self.key = key
+		self.refresh_margin = refresh_margin
+		self.token = None
+		self.expires_at = 0
+		# Lifetime of the last token fetched by this provider
+		self.ttl = None
+		self.thread_lock = threading.Lock()
+		# asyncio locks belong to the loop they were first used on, so each loop gets its own
+		self.async_locks = weakref.WeakKeyDictionary()
+
+	def margin(self):
+		# A token living shorter than the margin would never count as fresh and be fetched on every call
+		return min(self.refresh_margin, self.ttl / 2) if self.ttl else self.refresh_margin
+
+	def is_fresh(self, token, expires_at, stale=None):
+		return bool(token) and token != stale and time.time() < expires_at - self.margin()
+
+	def current(self, stale=None):
+		if self.is_fresh(self.token, self.expires_at, stale):
+			return self.token
+		return None
+
+	def load(self, stale=None):
+		cached = self.store.get(self.key)
+		# Entries written by older releases hold a bare token without its expiry
+		if isinstance(cached, tuple) and self.is_fresh(*cached, stale=stale):
+			self.token, self.expires_at = cached
+			return self.token
+		return None
+
+	def save(self, token, ttl):
+		self.ttl = int(ttl)
+		self.token, self.expires_at = token, time.time() + self.ttl
+		self.store.set(self.key, self.token, self.expires_at)
+		return self.token
+
+	def get_token(self, fetch, stale=None):
+		"""
+		Returns a fresh token, calling fetch() -> (token, ttl) only when no other thread or
+		process has refreshed it. Pass the token a request was rejected with as stale to force a refresh.
+		"""
+		token = self.current(stale)
+		if token:
+			return token
+		with self.thread_lock:
+			token = self.current(stale) or self.load(stale)
+			if token:
+				return token
+			with self.store.lock(self.key):
+				token = self.load(stale)
+				if token:
+					return token
+				return self.save(*fetch())
+
+	def async_lock(self):
+		loop = asyncio.get_running_loop()
+		with self.thread_lock:
+			lock = self.async_locks.get(loop)
+			if lock is None:
+				lock = self.async_locks[loop] = asyncio.Lock()
+			return lock
+
+	async def acquire_store_lock(self, lock):
+		acquiring = asyncio.get_running_loop().run_in_executor(None, lock.acquire)
+		try:
+			await asyncio.shield(acquiring)
+		except asyncio.CancelledError:
+			# The executor thread still takes the lock, so hand it back as soon as it has it
+			def release(future):
+				if not future.cancelled() and future.exception() is None:
+					lock.release()
+			acquiring.add_done_callback(release)
+			raise
+
+	async def get_token_async(self, fetch, stale=None):
+		token = self.current(stale)
+		if token:
+			return token
+		async with self.async_lock():
+			token = self.current(stale) or self.load(stale)
+			if token:
+				return token
+			lock = self.store.lock(self.key)
+			await self.acquire_store_lock(lock)
+			try:
+				token = self.load(stale)
+				if token:
+					return token
+				return self.save(*await fetch())
+			finally:
+				lock.release()
+
+	def refresh(self, fetch, stale):
+		return self.get_token(fetch, stale=stale)
+
+	async def refresh_async(self, fetch, stale):
+		return await self.get_token_async(fetch, stale=stale)
@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+from powerschool_adapter.async_powerschool import AsyncPowerSchool
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.partition import ValueChunks
+from powerschool_adapter.response_cache import ResponseCache
+from powerschool_adapter.retry import RetryPolicy
+
+
+class TestAsyncPowerSchool(unittest.IsolatedAsyncioTestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=25)).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def powerschool(self):
+		return AsyncPowerSchool(server_address=self.mock.url, client_id="client", client_secret="secret", cache_key=None)
+
+	async def test_table(self):
+		async with self.powerschool() as powerschool:
+			response = await powerschool.table('students').projection(['ID', 'DCID', 'LAST_NAME']).sort('id').page_size(5).get()
+			self.assertEqual([row["id"] for row in response.rows()], ["1", "2", "3", "4", "5"])
+			self.assertEqual(set(response.rows()[0]), {"id", "dcid", "last_name"})
+
+	async def test_pagination(self):
+		async with self.powerschool() as powerschool:
+			powerschool.table('students').projection(["ID", "STUDENT_NUMBER", "FIRST_NAME"]).sort('ID')
+			ids = []
+			while True:
+				students = await powerschool.paginate(page_size=10)
+				if not students:
+					break
+				ids.extend(student["tables"]["students"]["id"] for student in students)
+			self.assertEqual(ids, [str(i) for i in range(1, 26)])
+
+	async def test_parallel_pagination_and_count(self):
+		async with self.powerschool() as powerschool:
+			rows = await powerschool.table('students').sort('id').paginate_parallel(page_size=7, max_workers=3)
+			self.assertEqual(rows, self.mock.dataset.tables["students"][:25])
+			count = await powerschool.table('students').q("grade_level=ge=6").count()
+			expected = sum(int(row["grade_level"]) >= 6 for row in self.mock.dataset.tables["students"])
+			self.assertEqual(int(count.data["count"]), expected)
+
+	async def test_sync_only_helpers_have_async_versions(self):
+		async with self.powerschool() as powerschool:
+			query = powerschool.table('students').projection("id,grade_level").sort('id')
+			streamed = [row["id"] async for row in query.stream(page_size=10)]
+			self.assertEqual(streamed, [str(i) for i in range(1, 26)])
+			self.assertEqual([row["id"] async for row in powerschool.to('/ws/v1/student/3').stream()], [3])
+			exported = [row["id"] async for row in query.checkpointed(page_size=10, max_workers=3).rows()]
+			self.assertEqual(exported, streamed)
+			keyset = [row["id"] async for row in query.checkpointed(page_size=10, keyset="id").rows()]
+			self.assertEqual(sorted(keyset, key=int), streamed)
+			table = await query.to_arrow(page_size=10)
+			self.assertEqual(table.num_rows, 25)
+			rows = await powerschool.pq("com.mock.students.by_grade").partitioned(ValueChunks("grade_level", ["1", "2"])).fetch()
+			expected = [row["id"] for row in self.mock.dataset.tables["students"] if row["grade_level"] in ("1", "2")]
+			self.assertEqual(sorted(row["students.id"] for row in rows), sorted(expected))
+
+	async def test_bulk_write(self):
+		mock = MockPowerSchool(Dataset.synthetic(students=5)).start()
+		try:
+			async with AsyncPowerSchool(server_address=mock.url, client_id="client", client_secret="secret", cache_key=None) as powerschool:
+				students = [{"name": {"first_name": "Ada", "last_name": f"L{i}"}, "action": "INSERT"} for i in range(5)]
+				students.append({"id": 999, "action": "UPDATE", "name": {"last_name": "Missing"}})
+				report = await powerschool.to('/ws/v1/student').bulk_write(students, batch_size=2, max_workers=2)
+				self.assertEqual(len(report.succeeded), 5)
+				self.assertEqual([result.index for result in report.failed], [5])
+				self.assertEqual(sorted(row["last_name"] for row in mock.dataset.tables["students"][5:]), [f"L{i}" for i in range(5)])
+
+				rows = [{"id": "1", "last_name": "Updated"}, {"last_name": "Inserted"}]
+				report = await powerschool.table('students').bulk_write(rows)
+				self.assertTrue(report.is_successful())
+				self.assertEqual(mock.dataset.find("students", "1")["last_name"], "Updated")
+				self.assertEqual(mock.dataset.tables["students"][-1]["last_name"], "Inserted")
+		finally:
+			mock.stop()
+
+	async def test_retries_and_response_cache(self):
+		events = []
+		cache = ResponseCache(ttls={"/ws/v1/district/student": 0.1})
+		with MockPowerSchool(Dataset.synthetic(students=5), retry_after=0) as mock:
+			async with AsyncPowerSchool(server_address=mock.url, client_id="client", client_secret="secret", cache_key=None,
+										retry_policy=RetryPolicy(total=3, backoff_factor=0, on_retry=[events.append]),
+										response_cache=cache) as powerschool:
+				mock.fail_next(429, 503)
+				first = (await powerschool.to('/ws/v1/district/student').get()).to_list()
+				self.assertEqual([event["status"] for event in events], [429, 503])
+				mock.revoke_tokens()
+				await asyncio.sleep(0.2)
+				self.assertEqual((await powerschool.to('/ws/v1/district/student').get()).to_list(), first)
+				self.assertEqual(cache.get_stats()["revalidated"], 1)
+				self.assertEqual(mock.stats["tokens"], 2)
+
+
+if __name__ == "__main__":
+	unittest.main()
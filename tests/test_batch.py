@@ -0,0 +1,52 @@
+import unittest
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+
+
+class TestFetchMany(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		dataset = Dataset.synthetic(students=300)
+		# Every third student does not exist
+		dataset.tables["students"] = [dict(row, enroll_status="0") for row in dataset.tables["students"] if int(row["id"]) % 3]
+		cls.mock = MockPowerSchool(dataset).start()
+		cls.powerschool = PowerSchool(cls.mock.url, "client", "secret", cache_key=None)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.mock.history.clear()
+
+	def test_table(self):
+		ids = list(range(1, 121)) + [1, 2]
+		result = self.powerschool.table('students').q("enroll_status==0").fetch_many(ids, max_url_length=300)
+		self.assertEqual(sorted(result.found, key=int), [str(i) for i in range(1, 121) if i % 3])
+		self.assertEqual(result.missing, [str(i) for i in range(3, 121, 3)])
+		self.assertGreater(len(self.mock.history), 1)
+		for request in self.mock.history:
+			self.assertLessEqual(len(self.mock.url) + len(request.target), 300)
+			self.assertTrue(request.params["q"].startswith("(enroll_status==0);id=in=("))
+
+	def test_resource(self):
+		result = self.powerschool.to('/ws/v1/district/student').fetch_many(["1", "3", "4"])
+		self.assertEqual((result.found["4"]["id"], result.found["4"]["local_id"]), (4, 100004))
+		self.assertEqual(result.missing, ["3"])
+		self.assertEqual(len(self.mock.history), 1)
+
+	def test_upper_case_id_column(self):
+		result = self.powerschool.table('students').fetch_many([1, 2, 3], id_column="ID")
+		self.assertEqual(sorted(result.found), ["1", "2"])
+		self.assertEqual(result.missing, ["3"])
+		self.assertTrue(self.mock.history[0].params["q"].startswith("ID=in=("))
+
+	def test_or_filter_keeps_ids(self):
+		with MockPowerSchool(Dataset.synthetic(students=30)) as mock:
+			powerschool = PowerSchool(mock.url, "client", "secret", cache_key=None)
+			ids = ["1", "2", "3", "4", "5"]
+			result = powerschool.table("students").q("grade_level==4,grade_level==7").fetch_many(ids)
+			self.assertEqual(sorted(result.found, key=int), ["2", "4"])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from powerschool_adapter.bulk import BulkWriter
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+
+
+class TestBulkWrite(unittest.TestCase):
+	def setUp(self):
+		dataset = Dataset.synthetic(students=0, schools=0)
+		dataset.tables["u_students_extension"] = [{"id": "5", "studentsdcid": "1", "nickname": "Ace"}]
+		self.mock = MockPowerSchool(dataset).start()
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None)
+
+	def tearDown(self):
+		self.mock.stop()
+
+	def batches(self):
+		return [len(request.body["students"]["student"]) for request in self.mock.history if request.path == "/ws/v1/student"]
+
+	def test_students_are_batched_and_failures_retried(self):
+		students = [{"client_uid": str(i), "action": "INSERT", "name": {"last_name": f"Student {i}"}} for i in range(25)]
+		# A 503 is turned away before the batch is applied, so only the first batch is resubmitted
+		self.mock.fail_next(503)
+		report = self.powerschool.to('/ws/v1/student').bulk_write(students, batch_size=10, max_workers=1)
+		self.assertTrue(report.is_successful())
+		self.assertEqual(self.batches(), [10, 10, 5, 10])
+		self.assertEqual(len({result.id for result in report.results}), 25)
+		self.assertEqual(sorted(row["last_name"] for row in self.mock.dataset.tables["students"]), sorted(f"Student {i}" for i in range(25)))
+
+	def test_unconfirmed_batches_are_not_resubmitted(self):
+		students = [{"action": "INSERT", "name": {"last_name": f"Student {i}"}} for i in range(15)]
+		self.mock.fail_next(500)
+		report = self.powerschool.to('/ws/v1/student').bulk_write(students, batch_size=10, max_workers=1)
+		self.assertEqual(self.batches(), [10, 5])
+		self.assertEqual({result.status for result in report.failed}, {"UNCONFIRMED"})
+		self.assertEqual([result.index for result in report.failed], list(range(10)))
+
+	def test_results_are_matched_on_client_uid(self):
+		students = [{"action": "INSERT"}, {"client_uid": "b", "action": "INSERT"}, {"action": "INSERT"}]
+		writer = BulkWriter(self.powerschool.to('/ws/v1/student'))
+		batch = list(enumerate(students))
+		self.assertEqual([entry["client_uid"] for entry in writer.batch_body(batch)["students"]["student"]], ["0", "b", "2"])
+		results = [{"client_uid": uid, "status": "SUCCESS", "success_message": {"id": uid}} for uid in ("2", "b", "0")]
+		written = writer.batch_results(batch, {"results": {"result": results}})
+		self.assertEqual([(result.index, result.id) for result in written], [(0, "0"), (1, "b"), (2, "2")])
+
+	def test_failures_are_reported(self):
+		students = [{"client_uid": "0", "action": "INSERT"}, {"client_uid": "1", "id": 999, "action": "UPDATE"}, {"client_uid": "2", "action": "INSERT"}]
+		report = self.powerschool.to('/ws/v1/student').bulk_write(students, retries=0)
+		self.assertEqual([result.index for result in report.failed], [1])
+		self.assertEqual(report.failed[0].error, {"error": "Not found"})
+
+	def test_table_rows_are_fanned_out(self):
+		rows = [{"id": 5, "studentsdcid": 1, "nickname": "Ada"}, {"studentsdcid": 2, "nickname": "Grace"}]
+		report = self.powerschool.table('u_students_extension').bulk_write(rows)
+		self.assertEqual([result.action for result in report.results], ["UPDATE", "INSERT"])
+		writes = sorted((request.method, request.path, request.body) for request in self.mock.history)
+		self.assertEqual(writes[0][:2], ("POST", "/ws/schema/table/u_students_extension"))
+		self.assertEqual(writes[1][:2], ("PUT", "/ws/schema/table/u_students_extension/5"))
+		self.assertEqual(writes[1][2]["tables"]["u_students_extension"], {"studentsdcid": "1", "nickname": "Ada"})
+		self.assertEqual(self.mock.dataset.find("u_students_extension", 5)["nickname"], "Ada")
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,51 @@
+import gzip
+import os
+import tempfile
+import unittest
+from powerschool_adapter.cassette import Cassette, CassetteError
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.retry import RetryPolicy
+
+
+class TestCassette(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+		self.path = os.path.join(self.directory.name, "sync.jsonl.gz")
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	def replay(self, **options):
+		return PowerSchool("http://powerschool.invalid", "client", "secret", cache_key=None, cassette=Cassette(self.path, **options),
+						   retry_policy=RetryPolicy(backoff_factor=0, max_retry_after=0))
+
+	def record(self):
+		with MockPowerSchool(Dataset.synthetic(students=150)) as mock, Cassette(self.path, "record") as cassette:
+			mock.fail_next(503)
+			powerschool = PowerSchool(mock.url, "client", "secret", cache_key=None, cassette=cassette,
+									  retry_policy=RetryPolicy(backoff_factor=0, max_retry_after=0))
+			rows = powerschool.table("students").sort("id").paginate_parallel(page_size=40)
+			streamed = list(powerschool.table("schools").stream(page_size=10))
+		return cassette, rows, streamed
+
+	def test_replay_without_network(self):
+		cassette, rows, streamed = self.record()
+		# Token, count, the failed attempt, four pages and the streamed pages
+		self.assertEqual(len(cassette), 1 + 1 + 1 + 4 + 2)
+		powerschool = self.replay()
+		self.assertEqual(powerschool.table("students").sort("id").paginate_parallel(page_size=40), rows)
+		self.assertEqual(list(powerschool.table("schools").stream(page_size=10)), streamed)
+		with self.assertRaises(CassetteError):
+			powerschool.table("cc").get()
+
+	def test_credentials_are_not_recorded(self):
+		self.record()
+		with gzip.open(self.path, "rt") as fp:
+			content = fp.read()
+		self.assertIn("replayed-token", content)
+		self.assertNotRegex(content, r"Bearer \w")
+		self.assertNotRegex(content, r"Basic \w")
+
+if __name__ == "__main__":
+	unittest.main()
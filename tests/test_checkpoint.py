@@ -0,0 +1,84 @@
+import unittest
+import requests
+from powerschool_adapter.checkpoint import CheckpointedExport, MemoryCheckpointStore
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.retry import RetryPolicy
+
+
+class TestCheckpointedExport(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=95)).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None, retry_policy=RetryPolicy(total=0))
+		self.store = MemoryCheckpointStore()
+
+	def run_until_failure(self, export, pages):
+		seen = []
+		with self.assertRaises(requests.exceptions.HTTPError):
+			for response in export.pages():
+				seen.extend(row["id"] for row in response.rows())
+				if len(seen) == pages * 20:
+					self.mock.fail_next(500)
+		return seen
+
+	def test_resumes_by_page(self):
+		query = self.powerschool.table("students").sort("id")
+		seen = self.run_until_failure(query.checkpointed(self.store, "students", page_size=20), 2)
+		progress = self.store.get("students")
+		self.assertEqual((progress["page"], progress["rows"]), (2, 40))
+		seen.extend(row["id"] for row in query.checkpointed(self.store, "students", page_size=20, max_workers=3).rows())
+		self.assertEqual(seen, [str(row["id"]) for row in self.mock.dataset.tables["students"]])
+		self.assertIsNone(self.store.get("students"))
+
+	def test_resumes_by_keyset(self):
+		query = self.powerschool.table("students").q("grade_level=ge=9")
+		seen = self.run_until_failure(query.checkpointed(self.store, "keyset", page_size=20, keyset="id"), 1)
+		self.assertEqual(self.store.get("keyset")["sort_key"], seen[-1])
+		seen.extend(row["id"] for row in query.checkpointed(self.store, "keyset", page_size=20, keyset="id").rows())
+		expected = [str(row["id"]) for row in self.mock.dataset.tables["students"] if int(row["grade_level"]) >= 9]
+		self.assertEqual(seen, expected)
+
+	def test_keyset_column_is_added_to_the_projection(self):
+		query = self.powerschool.table("students").projection(["LAST_NAME"])
+		rows = list(query.checkpointed(page_size=20, keyset="id").rows())
+		self.assertEqual([row["id"] for row in rows], [row["id"] for row in self.mock.dataset.tables["students"]])
+
+	def test_keyset_keeps_an_or_filter_grouped(self):
+		query = self.powerschool.table("students").q("grade_level==4,grade_level==7")
+		rows = list(query.checkpointed(page_size=5, keyset="id").rows())
+		expected = [row["id"] for row in self.mock.dataset.tables["students"] if row["grade_level"] in ("4", "7")]
+		self.assertEqual([row["id"] for row in rows], expected)
+
+	def test_keyset_without_values_raises(self):
+		export = self.powerschool.table("students").checkpointed(self.store, "nulls", page_size=20, keyset="nickname")
+		with self.assertRaisesRegex(ValueError, "nickname"):
+			list(export.rows())
+
+	def test_rejects_changed_mode(self):
+		query = self.powerschool.table("students").sort("id")
+		self.run_until_failure(query.checkpointed(self.store, "students", page_size=20), 1)
+		with self.assertRaisesRegex(ValueError, "keyset=None"):
+			list(query.checkpointed(self.store, "students", page_size=20, keyset="id").rows())
+		self.assertEqual(self.store.get("students")["page"], 1)
+
+	def test_rejects_changed_query(self):
+		self.store.set("job", {"fingerprint": "other", "page": 3, "sort_key": None, "rows": 60})
+		with self.assertRaises(ValueError):
+			list(self.powerschool.table("students").checkpointed(self.store, "job").pages())
+		export = self.powerschool.table("students").checkpointed(self.store, "job", page_size=50, restart=True)
+		self.assertEqual(sum(len(response.rows()) for response in export.pages()), 95)
+		with self.assertRaises(ValueError):
+			CheckpointedExport(self.powerschool.pq("com.mock.students.by_grade").with_data({"grade_level": "9"}), keyset="id")
+
+	def test_power_query_resume(self):
+		query = self.powerschool.pq("com.mock.students.by_grade").with_data({"grade_level": "0"})
+		self.store.set("pq", {"fingerprint": query.checkpointed().fingerprint, "page": 1, "sort_key": None, "rows": 5})
+		rows = list(query.checkpointed(self.store, "pq", page_size=5).rows())
+		self.assertEqual(len(rows) + 5, len(query.send().to_list()))
@@ -0,0 +1,104 @@
+import json
+import unittest
+from collections import namedtuple
+from dataclasses import dataclass
+from powerschool_adapter.codec import JsonCodec, get_codec, orjson, msgspec
+from powerschool_adapter.query import Query
+
+PAGE = json.dumps({"name": "Students", "record": [
+	{"id": 1, "tables": {"students": {"id": "1", "first_name": "Ada", "grade_level": "5"}}},
+	{"id": 2, "tables": {"students": {"id": "2", "first_name": "Grace"}}},
+]}).encode()
+
+RECORD = json.dumps({"id": 1, "name": "students", "tables": {"students": {"id": "1", "first_name": "Ada", "grade_level": "5"}}}).encode()
+
+Student = namedtuple("Student", ["id", "first_name", "grade_level"])
+
+
+@dataclass
+class StudentRow:
+	id: str
+	first_name: str
+
+
+class FakeResponse:
+	def __init__(self, content):
+		self.content = content
+
+
+class FakeRequest:
+	def __init__(self, codec):
+		self.codec = codec
+		self.schema = None
+		self.instrumentation = None
+		self.calls = []
+
+	def make_request(self, method, endpoint, options=None, json=False):
+		self.calls.append(json)
+		return self.codec.loads(PAGE) if json else FakeResponse(PAGE)
+
+
+class TestCodec(unittest.TestCase):
+	def codecs(self):
+		codecs = [get_codec("json")]
+		if orjson is not None:
+			codecs.append(get_codec("orjson"))
+		if msgspec is not None:
+			codecs.append(get_codec("msgspec"))
+		return codecs
+
+	def test_default_codec_is_the_fastest_installed(self):
+		expected = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+		self.assertEqual(get_codec().name, expected)
+		self.assertIs(get_codec(), get_codec())
+
+	def test_round_trip(self):
+		for codec in self.codecs():
+			self.assertEqual(codec.loads(codec.encode({"a": [1, "b"]})), {"a": [1, "b"]})
+			self.assertEqual(json.loads(codec.dumps([Student("1", "Ada", None), StudentRow("2", "Grace")])),
+							 [{"id": "1", "first_name": "Ada", "grade_level": None}, {"id": "2", "first_name": "Grace"}])
+
+	def test_decode_rows(self):
+		for codec in self.codecs():
+			rows = codec.decode_rows(PAGE, Student, table_name="students")
+			self.assertEqual(rows, [Student("1", "Ada", "5"), Student("2", "Grace", None)])
+			self.assertEqual(codec.decode_rows(PAGE, StudentRow, table_name="students")[1], StudentRow("2", "Grace"))
+
+	def test_decode_single_record(self):
+		row_types = [Student]
+		if msgspec is not None:
+			row_types.append(msgspec.defstruct("StudentStruct", [("id", str), ("first_name", str), ("grade_level", str)]))
+		for codec in self.codecs():
+			for row_type in row_types:
+				rows = codec.decode_rows(RECORD, row_type, table_name="students")
+				self.assertEqual([(row.id, row.first_name, row.grade_level) for row in rows], [("1", "Ada", "5")], (codec.name, row_type))
+
+	def test_to_json_uses_the_request_codec(self):
+		codec = JsonCodec()
+		codec.dumps = lambda value: "from request codec"
+		response = Query(FakeRequest(codec)).table("students").send()
+		self.assertEqual(response.to_json(), "from request codec")
+
+	@unittest.skipUnless(msgspec, "msgspec is not installed")
+	def test_msgspec_structs(self):
+		class Row(msgspec.Struct):
+			id: int
+			first_name: str
+			grade_level: int = 0
+
+		rows = get_codec("msgspec").decode_rows(PAGE, Row, table_name="students")
+		self.assertEqual([(row.id, row.grade_level) for row in rows], [(1, 5), (2, 0)])
+
+	def test_typed_query(self):
+		request = FakeRequest(JsonCodec())
+		query = Query(request).table("students").typed(Student)
+		response = query.send()
+		self.assertEqual(request.calls, [False])
+		self.assertEqual(response.to_list()[0].first_name, "Ada")
+		self.assertEqual(response.count(), 2)
+		# Counting is never typed
+		self.assertIsNone(query._replace(endpoint="/count", row_type=None).row_type)
+		self.assertEqual(query.send().to_json(), request.codec.dumps([Student("1", "Ada", "5"), Student("2", "Grace", None)]))
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,46 @@
+import json
+import unittest
+from powerschool_adapter.columnar import Columnar
+from powerschool_adapter.response import Response
+
+
+class TestColumnar(unittest.TestCase):
+	def setUp(self):
+		self.page = {"name": "Students", "record": [
+			{"id": 1, "tables": {"students": {"id": "1", "first_name": "Ada", "grade_level": "5"}}},
+			{"id": 2, "tables": {"students": {"id": "2", "first_name": "Grace"}}},
+		]}
+
+	def test_schema_from_projection(self):
+		response = Response(self.page).squash_table_response(columnar=True, columns=["id", "first_name"])
+		self.assertEqual(response.data.columns, ("id", "first_name"))
+		self.assertEqual(response.data[0].first_name, "Ada")
+		self.assertEqual(response.count(), 2)
+
+	def test_inferred_schema_is_a_union(self):
+		response = Response(self.page).squash_table_response(columnar=True)
+		self.assertEqual(response.data.columns, ("id", "first_name", "grade_level"))
+		self.assertIsNone(response.data[1].grade_level)
+
+	def test_widen(self):
+		columnar = Columnar.from_dicts([{"id": "1"}])
+		columnar.widen(("id", "nickname")).extend([{"id": "2", "nickname": "Bo"}])
+		self.assertEqual(columnar.to_list()[0], {"id": "1", "nickname": None})
+		self.assertEqual(columnar[1].nickname, "Bo")
+
+	def test_views(self):
+		response = Response(self.page).squash_table_response(columnar=True)
+		self.assertEqual(response.to_list()[0], {"id": "1", "first_name": "Ada", "grade_level": "5"})
+		self.assertEqual(response.to_dict()["2"]["first_name"], "Grace")
+		self.assertEqual(json.loads(response.to_json())[1]["grade_level"], None)
+		self.assertEqual(response.data.column("first_name"), ["Ada", "Grace"])
+		self.assertEqual(response.data.to_columns()["id"], ["1", "2"])
+
+	def test_power_query_columns(self):
+		columnar = Columnar.from_dicts([{"students.dcid": "1", "class": "A"}])
+		self.assertEqual(columnar[0].students_dcid, "1")
+		self.assertEqual(columnar[0].class_, "A")
+		self.assertEqual(columnar.to_list()[0], {"students.dcid": "1", "class": "A"})
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+
+
+class TestConcurrency(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=200)).start()
+		cls.powerschool = PowerSchool(cls.mock.url, "client", "secret", cache_key=None)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def test_shared_query_across_threads(self):
+		base = self.powerschool.table('students').projection(["ID", "STUDENT_NUMBER"])
+		base.get()
+		tokens = self.mock.stats["tokens"]
+
+		def run(index):
+			response = base.q(f"id=={index}").get()
+			return index, response.squash_table_response().data[0]
+
+		with ThreadPoolExecutor(max_workers=16) as executor:
+			results = list(executor.map(run, range(1, 201)))
+
+		for index, row in results:
+			self.assertEqual(row, {"id": str(index), "student_number": str(100000 + index)})
+		self.assertEqual(dict(base.query_string), {"projection": "ID,STUDENT_NUMBER"})
+		self.assertEqual(self.mock.stats["tokens"], tokens)
+
+	def test_options_do_not_leak_between_calls(self):
+		query = self.powerschool.table('students')
+		query.with_data({"first_name": "Ada"}).post()
+		query.get()
+		post, get = self.mock.history[-2:]
+		self.assertEqual((post.method, post.body), ("POST", {"tables": {"students": {"first_name": "Ada"}}}))
+		self.assertEqual((get.method, get.body), ("GET", {}))
+
+	def test_legacy_builder_is_per_thread(self):
+		def run(index):
+			self.powerschool.table('students').q(f"id=={index}")
+			return index, self.powerschool.send().squash_table_response().data[0]["id"]
+
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			for index, row_id in executor.map(run, range(1, 51)):
+				self.assertEqual(row_id, str(index))
+
+	def test_connections_are_reused(self):
+		powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None, pool_maxsize=4, timeout=(5, 30))
+		query = powerschool.table('students')
+		with ThreadPoolExecutor(max_workers=4) as executor:
+			list(executor.map(lambda page: query.page(page).get(), range(1, 41)))
+		stats = powerschool.pool_stats()
+		self.assertLessEqual(stats["connections"], 4)
+		self.assertEqual(stats["requests"], 41)
+		self.assertEqual(stats["reused"], stats["requests"] - stats["connections"])
+
+if __name__ == "__main__":
+	unittest.main()
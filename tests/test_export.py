@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.response import Response
+from powerschool_adapter.schema import SchemaRegistry
+
+try:
+	import pyarrow
+	import pyarrow.parquet
+except ImportError:
+	pyarrow = None
+
+
+@unittest.skipUnless(pyarrow, "pyarrow is not installed")
+class TestExport(unittest.TestCase):
+	def setUp(self):
+		self.response = Response({"name": "Students", "record": [
+			{"id": 1, "tables": {"students": {"id": "1", "gpa": "3.5", "entrydate": "2024-08-15", "enrolled": "1", "first_name": "Ada"}}},
+			{"id": 2, "tables": {"students": {"id": "2", "gpa": "", "entrydate": "2024-08-20", "enrolled": "0", "first_name": "Grace"}}},
+		]})
+
+	def test_types_are_inferred(self):
+		table = self.response.to_arrow(types={"enrolled": "bool"})
+		self.assertEqual(str(table.schema.field("id").type), "int64")
+		self.assertEqual(str(table.schema.field("gpa").type), "double")
+		self.assertEqual(str(table.schema.field("entrydate").type), "date32[day]")
+		self.assertEqual(table.column("enrolled").to_pylist(), [True, False])
+		self.assertEqual(table.column("gpa").to_pylist(), [3.5, None])
+		self.assertEqual(table.column("entrydate").to_pylist()[0], date(2024, 8, 15))
+
+	def test_column_pruning(self):
+		table = self.response.to_arrow(columns=["ID", "FIRST_NAME"])
+		self.assertEqual(table.column_names, ["id", "first_name"])
+
+	def test_parquet(self):
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "students.parquet")
+			self.assertEqual(self.response.to_parquet(path), 2)
+			self.assertEqual(pyarrow.parquet.read_table(path).column("first_name").to_pylist(), ["Ada", "Grace"])
+
+	def test_zero_padded_numbers_stay_strings(self):
+		from powerschool_adapter.export import ArrowExporter
+		batch = ArrowExporter().record_batch([{"zip": "02134", "student_number": "00123", "gpa": "03.5", "id": "10"}])
+		self.assertEqual([str(field.type) for field in batch.schema], ["string", "string", "string", "int64"])
+		self.assertEqual(batch.column(0).to_pylist(), ["02134"])
+
+	def test_later_pages_widen_the_schema(self):
+		from powerschool_adapter.export import ArrowExporter
+		exporter = ArrowExporter()
+		table = exporter.to_table([[{"gpa": "4", "code": "1"}], [{"gpa": "3.5", "code": "A", "nickname": "Bo"}]])
+		self.assertEqual(str(table.schema.field("gpa").type), "double")
+		self.assertEqual(table.column("gpa").to_pylist(), [4.0, 3.5])
+		self.assertEqual(table.column("code").to_pylist(), ["1", "A"])
+		self.assertEqual(table.column("nickname").to_pylist(), [None, "Bo"])
+		with self.assertRaises(ValueError):
+			ArrowExporter(types={"code": "int"}).to_table([[{"code": "1"}], [{"code": "A"}]])
+
+	def test_parquet_is_rewritten_when_widened(self):
+		from powerschool_adapter.export import ArrowExporter
+		pages = [[{"id": "1", "gpa": "4"}], [{"id": "2", "gpa": "3.5"}], [{"id": "3", "gpa": "n/a"}]]
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "grades.parquet")
+			self.assertEqual(ArrowExporter().to_parquet(path, pages), 3)
+			table = pyarrow.parquet.read_table(path)
+			self.assertEqual(str(table.schema.field("gpa").type), "string")
+			self.assertEqual(table.column("id").to_pylist(), [1, 2, 3])
+			self.assertEqual(os.listdir(directory), ["grades.parquet"])
+
+	def test_failed_parquet_export_leaves_no_file(self):
+		from powerschool_adapter.export import ArrowExporter
+
+		def pages():
+			yield [{"id": "1"}]
+			raise RuntimeError("connection lost")
+
+		with tempfile.TemporaryDirectory() as directory:
+			with self.assertRaises(RuntimeError):
+				ArrowExporter().to_parquet(os.path.join(directory, "students.parquet"), pages())
+			self.assertEqual(os.listdir(directory), [])
+	def test_query_export_takes_columns_from_the_metadata(self):
+		# Null columns are left out of rows, so nickname and gpa only appear on the second page
+		rows = [{"id": "1"}, {"id": "2"}, {"id": "3", "nickname": "Bo", "gpa": "3.5"}]
+		with MockPowerSchool(Dataset({"students": rows})) as mock:
+			powerschool = PowerSchool(mock.url, "client", "secret", cache_key=None, schema=SchemaRegistry())
+			table = powerschool.table("students").sort("id").to_arrow(page_size=2, max_workers=1)
+		self.assertEqual(table.column_names, ["id", "nickname", "gpa"])
+		self.assertEqual(table.column("gpa").to_pylist(), [None, None, 3.5])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,67 @@
+import re
+import unittest
+from datetime import date
+from powerschool_adapter.expression import Field, Param, or_
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+
+
+class TestExpression(unittest.TestCase):
+	def test_render_and_escaping(self):
+		expression = Field("enroll_status").eq(0) & Field("id").in_([1, 2, "a b"]) & (Field("last_name").startswith("Mc Do") | Field("entrydate").between(date(2024, 8, 1), date(2024, 8, 31)))
+		self.assertEqual(str(expression), 'enroll_status==0;id=in=(1,2,"a b");(last_name=="Mc Do*",entrydate=ge=2024-08-01;entrydate=le=2024-08-31)')
+		self.assertEqual(str(Field("last_name").like('O"Brien*')), 'last_name=="O\\"Brien*"')
+		self.assertEqual(str(Field("fedethnicity").ne(True)), "fedethnicity!=1")
+
+	def test_template(self):
+		template = (Field("schoolid").eq(Param("school")) & Field("id").in_(Param("ids"))).compile()
+		self.assertEqual(template.source(), "schoolid=={school};id=in={ids}")
+		self.assertEqual(template.render(school=100, ids=[1, 2]), "schoolid==100;id=in=(1,2)")
+		with self.assertRaises(KeyError):
+			template.render(school=100)
+
+	def test_split(self):
+		template = (Field("schoolid").eq(100) & Field("id").in_(range(1, 200))).compile()
+		parts = template.split(200)
+		self.assertGreater(len(parts), 1)
+		self.assertTrue(all(len(part) <= 200 and part.startswith("schoolid==100;id=in=(") for part in parts))
+		ids = [int(i) for part in parts for i in re.search(r"\((.*)\)", part).group(1).split(",")]
+		self.assertEqual(ids, list(range(1, 200)))
+		# A list under an or cannot be split without changing the result
+		self.assertEqual(len(or_(Field("a").eq(1), Field("id").in_(range(1, 200))).compile().split(200)), 1)
+		with self.assertRaises(ValueError):
+			Field("name").in_(["x" * 50, "y"]).compile().split(30)
+
+
+class TestFetchWhere(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		# Three enrollments per student
+		enrollments = [{"id": str(i), "studentid": str(1000 + i // 3), "termid": str(3400 + i % 3)} for i in range(450)]
+		cls.mock = MockPowerSchool(Dataset({"cc": enrollments})).start()
+		cls.powerschool = PowerSchool(cls.mock.url, "client", "secret", cache_key=None)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def test_split_requests_are_merged(self):
+		self.mock.history.clear()
+		students = [str(i) for i in range(1000, 1150)]
+		rows = self.powerschool.table("cc").q("termid=ge=3400").fetch_where(Field("studentid").in_(Param("students")), max_url_length=400, page_size=50, students=students)
+		self.assertEqual([row["studentid"] for row in rows], [student for student in students for _ in range(3)])
+		self.assertGreater(len({request.params["q"] for request in self.mock.history}), 1)
+		for request in self.mock.history:
+			self.assertLessEqual(len(self.mock.url) + len(request.target), 400)
+			self.assertTrue(request.params["q"].startswith("(termid=ge=3400);studentid=in=("))
+
+	def test_existing_or_filter_stays_grouped(self):
+		with MockPowerSchool(Dataset.synthetic(students=30)) as mock:
+			powerschool = PowerSchool(mock.url, "client", "secret", cache_key=None)
+			query = powerschool.table("students").q("grade_level==4,grade_level==7")
+			for expression in (Field("id").in_(Param("ids")), Field("id").in_(Param("ids")).compile()):
+				rows = query.fetch_where(expression, max_url_length=len(mock.url) + 120, ids=[str(i) for i in range(1, 13)])
+				self.assertEqual(sorted((row["id"] for row in rows), key=int), ["2", "4", "10"])
+
+if __name__ == "__main__":
+	unittest.main()
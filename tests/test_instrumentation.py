@@ -0,0 +1,78 @@
+import unittest
+import requests
+from powerschool_adapter.instrumentation import Histogram, Instrumentation
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.retry import RetryPolicy
+
+try:
+	from opentelemetry.sdk.trace import TracerProvider
+	from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+	from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+	TracerProvider = None
+
+
+class TestInstrumentation(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=3), retry_after=0).start()
+		cls.address = cls.mock.url
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.before, self.after = [], []
+		self.instrumentation = Instrumentation(tracing=False, before_request=[self.before.append], after_request=[self.after.append])
+		self.powerschool = PowerSchool(self.address, "client", "secret", cache_key=None, instrumentation=self.instrumentation,
+									   retry_policy=RetryPolicy(total=2, backoff_factor=0))
+
+	def test_stats(self):
+		self.mock.fail_next(503, 401)
+		self.powerschool.table("students").get()
+		self.powerschool.table("students").for_id(2).with_data({"first_name": "Ada"}).put()
+		stats = self.instrumentation.get_stats()
+		self.assertEqual((stats["requests"], stats["retries"], stats["auth_refreshes"], stats["token_fetches"]), (2, 1, 1, 2))
+		self.assertEqual(stats["endpoints"]["/ws/schema/table/students"]["rows"], 3)
+		self.assertEqual(stats["endpoints"]["/ws/schema/table/students/{id}"]["latency"]["count"], 1)
+		self.assertGreater(stats["endpoints"]["/ws/schema/table/students/{id}"]["bytes_out"], 0)
+		self.assertGreater(stats["bytes_in"], 0)
+		self.assertEqual([event["endpoint"] for event in self.before], ["/ws/schema/table/students", "/ws/schema/table/students/2"])
+		self.assertEqual([event["status"] for event in self.after], [200, 200])
+
+	def test_errors(self):
+		self.mock.fail_next(404)
+		with self.assertRaises(requests.exceptions.HTTPError):
+			self.powerschool.table("students").get()
+		self.assertEqual(self.instrumentation.get_stats()["errors"], 1)
+		self.assertEqual(self.after[0]["status"], 404)
+
+	def test_logging_instead_of_print(self):
+		with self.assertLogs("powerschool_adapter.request", "INFO") as logs:
+			self.powerschool.request.authenticate(force=True)
+		self.assertIn("Authenticated successfully", logs.output[0])
+
+	def test_histogram(self):
+		histogram = Histogram()
+		for value in [0.002] * 90 + [0.3] * 9 + [4.0]:
+			histogram.observe(value)
+		self.assertEqual(histogram.summary()["p50"], 0.005)
+		self.assertEqual(histogram.quantile(0.95), 0.5)
+		self.assertEqual(histogram.quantile(1), 4.0)
+
+	@unittest.skipUnless(TracerProvider, "opentelemetry-sdk is not installed")
+	def test_spans(self):
+		exporter = InMemorySpanExporter()
+		provider = TracerProvider()
+		provider.add_span_processor(SimpleSpanProcessor(exporter))
+		instrumentation = Instrumentation(tracer=provider.get_tracer("test"))
+		powerschool = PowerSchool(self.address, "client", "secret", cache_key=None, instrumentation=instrumentation)
+		powerschool.table("students").for_id(3).get()
+		span = exporter.get_finished_spans()[0]
+		self.assertEqual(span.name, "GET /ws/schema/table/students/{id}")
+		self.assertEqual(span.attributes["http.response.status_code"], 200)
+
+if __name__ == "__main__":
+	unittest.main()
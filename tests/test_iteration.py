@@ -0,0 +1,61 @@
+import asyncio
+import time
+import unittest
+from powerschool_adapter.async_powerschool import AsyncPowerSchool
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.paginator import batched
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.response import Response
+
+
+class TestIteration(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=45)).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None)
+		self.ids = [row["id"] for row in self.mock.dataset.tables["students"]]
+
+	def test_response_protocol(self):
+		response = Response({"name": "Students", "record": [{"id": 1, "tables": {"students": {"id": "1"}}}]})
+		self.assertEqual(list(response), [{"id": "1"}])
+		self.assertEqual(len(response), 1)
+		self.assertEqual(len(Response({"record": []})), 0)
+		self.assertEqual(list(batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+	def test_iter_rows_and_batches(self):
+		self.powerschool.table("students").sort("id")
+		self.assertEqual([row["id"] for row in self.powerschool.iter_rows(page_size=10)], self.ids)
+		sizes = [len(batch) for batch in self.powerschool.table("students").batched(20, page_size=15, prefetch=2)]
+		self.assertEqual(sizes, [20, 20, 5])
+		self.assertEqual(sum(len(page) for page in self.powerschool.table("students").iter_pages(page_size=10, prefetch=0)), 45)
+
+	def test_next_page_is_prefetched(self):
+		self.powerschool.request.authenticate()
+		requests = self.mock.stats["requests"]
+		pages = self.powerschool.table("students").iter_pages(page_size=10, prefetch=1)
+		first = next(pages)
+		deadline = time.monotonic() + 2
+		while self.mock.stats["requests"] < requests + 2 and time.monotonic() < deadline:
+			time.sleep(0.01)
+		# Page 2 was requested while page 1 was still being consumed
+		self.assertEqual(self.mock.stats["requests"], requests + 2)
+		self.assertEqual(len(first), 10)
+		self.assertEqual(len(next(pages)), 10)
+		pages.close()
+
+	def test_async_iteration(self):
+		async def collect():
+			async with AsyncPowerSchool(self.mock.url, "client", "secret", cache_key=None) as powerschool:
+				query = powerschool.table("students").sort("id")
+				rows = [row["id"] async for row in query.iter_rows(page_size=10, prefetch=2)]
+				batches = [len(batch) async for batch in query.batched(30, page_size=10)]
+				return rows, batches
+		rows, batches = asyncio.run(collect())
+		self.assertEqual(rows, self.ids)
+		self.assertEqual(batches, [30, 15])
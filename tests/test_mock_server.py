@@ -0,0 +1,62 @@
+import unittest
+import requests
+from benchmarks.run import Benchmark
+from powerschool_adapter.mock_server import Dataset, Filter, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.retry import RetryPolicy
+
+
+class TestMockServer(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=120, enrollments_per_student=2)).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None,
+									   retry_policy=RetryPolicy(total=3, backoff_factor=0, max_retry_after=0))
+
+	def test_filter(self):
+		rows = [{"id": "1", "last_name": "Mc Donald", "grade_level": "9"}, {"id": "2", "last_name": "Smith", "grade_level": "10"}]
+		expressions = {
+			"grade_level=ge=10": ["2"], 'last_name=="Mc D*"': ["1"], "id=in=(1,3)": ["1"],
+			"(id==1,id==2);grade_level=lt=10": ["1"], "last_name!=smi*": ["1"],
+		}
+		for expression, expected in expressions.items():
+			self.assertEqual([row["id"] for row in rows if Filter(expression)(row)], expected, expression)
+
+	def test_tables(self):
+		students = self.powerschool.table("students").q("grade_level=ge=9").sort("id")
+		rows = students.paginate_parallel(page_size=25)
+		self.assertEqual(len(rows), sum(int(row["grade_level"]) >= 9 for row in self.mock.dataset.tables["students"]))
+		self.assertEqual(len(self.powerschool.table("cc").paginate_parallel(page_size=100)), 240)
+		with self.assertRaises(requests.exceptions.HTTPError):
+			self.powerschool.table("students").projection("id,lastname").get()
+
+	def test_resources_power_queries_and_data_versions(self):
+		student = self.powerschool.to("/ws/v1/student/3").get().to_dict()
+		self.assertEqual(student["id"], 3)
+		rows = self.powerschool.pq("com.mock.students.by_grade", {"grade_level": "9"}).to_list()
+		self.assertTrue(all(row["students.grade_level"] == "9" for row in rows))
+		version = self.mock.dataset.version
+		self.powerschool.table("students").for_id(7).with_data({"last_name": "Hopper"}).put()
+		changes = self.powerschool.new_query().get_subscription_changes("roster", version).get_original_data()
+		self.assertEqual(changes["tables"], {"STUDENTS": [7]})
+
+	def test_fault_injection(self):
+		self.mock.fail_next(429, 503)
+		self.assertEqual(self.powerschool.table("schools").get().count(), 4)
+		self.mock.revoke_tokens()
+		self.assertEqual(self.powerschool.table("schools").get().count(), 4)
+
+	def test_benchmark_smoke(self):
+		results = Benchmark(students=200, page_size=50, repeat=1, writes=20).run(["paginate_parallel", "bulk_write_v1", "parse"])
+		self.assertEqual(results["paginate_parallel"]["rows"], 200)
+		self.assertEqual(results["bulk_write_v1"]["rows"], 20)
+		self.assertGreater(results["parse"]["rows_per_second"], 0)
+
+if __name__ == "__main__":
+	unittest.main()
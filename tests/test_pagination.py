@@ -1,30 +1,83 @@
-import os
 import unittest
-from dotenv import load_dotenv
+from powerschool_adapter.expression import Field
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
 from powerschool_adapter.powerschool import PowerSchool
 
-load_dotenv()
 
-# Load sensitive data from environment variables
-SERVER_ADDRESS = os.getenv("POWERSCHOOL_SERVER_ADDRESS")
-CLIENT_ID = os.getenv("POWERSCHOOL_CLIENT_ID")
-CLIENT_SECRET = os.getenv("POWERSCHOOL_CLIENT_SECRET")
+class TestPagination(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=57)).start()
 
-powerschool = PowerSchool(
-    server_address=SERVER_ADDRESS,
-    client_id=CLIENT_ID,
-    client_secret=CLIENT_SECRET
-)
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None)
+		self.ids = sorted((row["id"] for row in self.mock.dataset.tables["students"]), key=int)
 
-class TestPagination(unittest.TestCase):
 	def test_pagination(self):
-		powerschool.table('students').projection(["ID", "STUDENT_NUMBER", "FIRST_NAME"]).sort('STUDENT_NUMBER')
+		self.powerschool.table('students').projection(["ID", "STUDENT_NUMBER", "FIRST_NAME"]).sort('ID')
+		pages = []
 		while True:
-			students = powerschool.paginate(page_size=1)
+			students = self.powerschool.paginate(page_size=10)
 			if not students:
 				break
-			for student in students:
-				print(student)
+			pages.append([student["tables"]["students"]["id"] for student in students])
+		self.assertEqual([len(page) for page in pages], [10, 10, 10, 10, 10, 7])
+		self.assertEqual([student_id for page in pages for student_id in page], self.ids)
+
+	def test_parallel_pagination(self):
+		students = self.powerschool.table('students').projection(["ID", "STUDENT_NUMBER", "FIRST_NAME"]).sort('ID').paginate_parallel(page_size=10, max_workers=4)
+		self.assertEqual([student["id"] for student in students], self.ids)
+		self.assertEqual(self.powerschool.table('students').q("id=gt=1000").paginate_parallel(page_size=10), [])
+
+	def test_parallel_pagination_of_power_queries(self):
+		rows = self.powerschool.pq("com.mock.students.by_grade").with_data({"grade_level": "5"}).paginate_parallel(page_size=3, max_workers=3)
+		expected = [row["id"] for row in self.mock.dataset.tables["students"] if row["grade_level"] == "5"]
+		self.assertEqual([row["students.id"] for row in rows], expected)
+
+	def test_columnar_pages_without_projection_keep_every_column(self):
+		# Null columns are left out of rows, so the nickname column only appears on page 2
+		rows = [{"id": str(i)} for i in range(1, 5)] + [{"id": "5", "nickname": "Bo"}]
+		with MockPowerSchool(Dataset({"students": rows})) as mock:
+			powerschool = PowerSchool(mock.url, "client", "secret", cache_key=None)
+			students = powerschool.table('students').sort('id').columnar().paginate_parallel(page_size=3, max_workers=2)
+		self.assertEqual(students.columns, ("id", "nickname"))
+		self.assertEqual([(row.id, row.nickname) for row in students], [("1", None), ("2", None), ("3", None), ("4", None), ("5", "Bo")])
+
+	def test_bulk_reads_return_the_same_rows(self):
+		query = self.powerschool.table('students').projection(["ID", "LAST_NAME"]).sort('ID')
+		expected = [{"id": row["id"], "last_name": row["last_name"]} for row in self.mock.dataset.tables["students"]]
+		self.assertEqual(query.paginate_parallel(page_size=10), expected)
+		self.assertEqual(list(query.iter_rows(page_size=10)), expected)
+		self.assertEqual(query.page_size(100).send().rows(), expected)
+		self.assertEqual(query.fetch_where(Field("id").in_(self.ids), max_url_length=len(self.mock.url) + 150), expected)
+		found = query.fetch_many(self.ids).found
+		self.assertEqual([found[row_id] for row_id in self.ids], expected)
+
+	def test_legacy_chaining(self):
+		pages = []
+		while True:
+			students = self.powerschool.table('students').sort('ID').paginate(page_size=20)
+			if not students:
+				break
+			pages.append(len(students))
+		self.assertEqual(pages, [20, 20, 17])
+		query = self.powerschool.table('students').q("grade_level=ge=6")
+		self.assertIs(query.clone(), query)
+		self.assertIsNone(query.reset().endpoint)
+		self.assertIsNone(self.powerschool.current_query().endpoint)
+
+	def test_internal_queries_are_not_tracked(self):
+		query = self.powerschool.table('students').q("grade_level=ge=6")
+		query.count()
+		query.paginate_parallel(page_size=10)
+		query.fetch_many(["1", "2"])
+		self.assertIs(self.powerschool.current_query(), query)
+		self.assertEqual(self.powerschool.current_query().endpoint, "/ws/schema/table/students")
+
 
 if __name__ == "__main__":
-	unittest.main()
\ No newline at end of file
+	unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import datetime
+import unittest
+from powerschool_adapter.async_powerschool import AsyncPowerSchool
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.partition import DateRanges, ValueChunks
+from powerschool_adapter.powerschool import PowerSchool
+
+
+def students_by_entry(dataset):
+	def query(args):
+		schools = args.get("school_ids", "").split(",")
+		return [
+			{"students.id": row["id"], "students.schoolid": row["schoolid"], "students.entrydate": row["entrydate"]}
+			for row in dataset.tables["students"]
+			if args["start_date"] <= row["entrydate"] <= args["end_date"] and row["schoolid"] in schools
+		]
+	return query
+
+
+class TestPartitionedQuery(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		dataset = Dataset.synthetic(students=300)
+		dataset.add_named_query("com.mock.students.by_entry", students_by_entry(dataset))
+		cls.mock = MockPowerSchool(dataset).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.query = PowerSchool(self.mock.url, "client", "secret", cache_key=None).pq("com.mock.students.by_entry")
+		self.dates = DateRanges("start_date", "end_date", datetime.date(2020, 8, 1), datetime.date(2024, 12, 31), days=90)
+		self.expected = sorted(row["id"] for row in self.mock.dataset.tables["students"] if row["schoolid"] in ("100", "200"))
+
+	def test_shards(self):
+		ranges = list(DateRanges("from", "to", datetime.date(2024, 1, 1), datetime.date(2024, 1, 10), days=4).shards())
+		self.assertEqual(ranges, [
+			{"from": "2024-01-01", "to": "2024-01-04"}, {"from": "2024-01-05", "to": "2024-01-08"},
+			{"from": "2024-01-09", "to": "2024-01-10"},
+		])
+		self.assertEqual(list(ValueChunks("ids", [1, 2, 3], size=2).shards()), [{"ids": [1, 2]}, {"ids": [3]}])
+		partitioned = self.query.partitioned(self.dates, ValueChunks("school_ids", ["100", "200"]))
+		self.assertEqual(len(list(partitioned.shards())), 36)
+
+	def test_fetch_merges_and_dedupes(self):
+		# The duplicated school shard returns the same rows twice
+		partitioned = self.query.partitioned(self.dates, ValueChunks("school_ids", ["100", "200", "100"]), page_size=7, max_workers=6, key="students.id")
+		rows = partitioned.fetch()
+		self.assertEqual(sorted(row["students.id"] for row in rows), self.expected)
+		# Shards are merged in order, so the date ranges come back ascending
+		ranges = [(datetime.date.fromisoformat(row["students.entrydate"]) - self.dates.start).days // 90 for row in rows]
+		self.assertEqual(ranges, sorted(ranges))
+		whole_rows = self.query.partitioned(ValueChunks("school_ids", ["100", "200", "100"], size=2), DateRanges(
+			"start_date", "end_date", datetime.date(2020, 1, 1), datetime.date(2025, 1, 1), days=3000)).fetch()
+		self.assertEqual(sorted(row["students.id"] for row in whole_rows), self.expected)
+
+	def test_fetch_async(self):
+		async def fetch():
+			async with AsyncPowerSchool(self.mock.url, "client", "secret", cache_key=None) as powerschool:
+				query = powerschool.pq("com.mock.students.by_entry")
+				return await query.partitioned(self.dates, ValueChunks("school_ids", ["100", "200"], size=2), page_size=10).fetch_async()
+		self.assertEqual(sorted(row["students.id"] for row in asyncio.run(fetch())), self.expected)
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from powerschool_adapter.rate_limit import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+	def test_rate(self):
+		limiter = RateLimiter(rate=50, burst=1)
+		started = time.monotonic()
+		for _ in range(11):
+			with limiter:
+				pass
+		self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+	def test_max_in_flight(self):
+		limiter = RateLimiter(max_in_flight=3)
+		lock = threading.Lock()
+		state = {"current": 0, "peak": 0}
+
+		def work(_):
+			with limiter:
+				with lock:
+					state["current"] += 1
+					state["peak"] = max(state["peak"], state["current"])
+				time.sleep(0.01)
+				with lock:
+					state["current"] -= 1
+
+		with ThreadPoolExecutor(max_workers=12) as executor:
+			list(executor.map(work, range(36)))
+		self.assertEqual(state["peak"], 3)
+
+	def test_max_in_flight_async(self):
+		limiter = RateLimiter(max_in_flight=2)
+		state = {"current": 0, "peak": 0}
+
+		async def work():
+			async with limiter:
+				state["current"] += 1
+				state["peak"] = max(state["peak"], state["current"])
+				await asyncio.sleep(0.01)
+				state["current"] -= 1
+
+		async def run():
+			await asyncio.gather(*(work() for _ in range(10)))
+
+		asyncio.run(run())
+		self.assertEqual(state["peak"], 2)
+
+	def test_shared_across_event_loops(self):
+		limiter = RateLimiter(max_in_flight=1)
+
+		async def work():
+			async with limiter:
+				await asyncio.sleep(0.01)
+			return True
+
+		async def run():
+			return await asyncio.gather(work(), work())
+
+		# Each asyncio.run starts a new loop; a semaphore bound to the first one would fail in the second
+		self.assertEqual(asyncio.run(run()), [True, True])
+		self.assertEqual(asyncio.run(run()), [True, True])
+		results = []
+		threads = [threading.Thread(target=lambda: results.append(asyncio.run(run()))) for _ in range(3)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(results, [[True, True]] * 3)
+
+	def test_adaptive(self):
+		limiter = RateLimiter(rate=10, adaptive=True, min_rate=2, latency_threshold=1.0)
+		limiter.feedback(429, 0.1)
+		self.assertEqual(limiter.rate, 5)
+		limiter.feedback(200, 2.0)
+		self.assertEqual(limiter.rate, 2.5)
+		limiter.feedback(429, 0.1)
+		self.assertEqual(limiter.rate, 2)
+		limiter.feedback(200, 0.1)
+		self.assertAlmostEqual(limiter.rate, 2.1)
+
+	def test_shared_per_server(self):
+		first = RateLimiter.for_server("https://district.powerschool.com", rate=5)
+		second = RateLimiter.for_server("https://district.powerschool.com", rate=50)
+		self.assertIs(first, second)
+		self.assertEqual(second.rate, 5)
+
+if __name__ == "__main__":
+	unittest.main()
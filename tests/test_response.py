@@ -0,0 +1,48 @@
+import unittest
+import copy
+from powerschool_adapter.response import UNSET, Response
+
+
+class TestLazyResponse(unittest.TestCase):
+	def setUp(self):
+		self.page = {"name": "Students", "@extensions": "u_admission,s_stu_x", "record": [
+			{"id": 1, "tables": {"students": {"id": "1", "first_name": "Ada"}}},
+			{"id": 2, "tables": {"students": {"id": "2", "first_name": "Grace"}}},
+		]}
+
+	def test_original_data_is_not_walked(self):
+		response = Response(self.page).squash_table_response()
+		self.assertIs(response.get_original_data(), self.page)
+		self.assertIn("@extensions", self.page)
+		self.assertFalse(hasattr(response, "__dict__"))
+
+	def test_inference_and_squash_on_first_access(self):
+		response = Response(self.page).squash_table_response()
+		self.assertEqual(response.extensions, ["u_admission", "s_stu_x"])
+		self.assertEqual(response.count(), 2)
+		self.assertIs(response.data, response.data)
+		self.assertEqual(response.data[1], {"id": "2", "first_name": "Grace"})
+		self.assertEqual(response.rows(), response.data)
+
+	def test_accessor_order_does_not_change_results(self):
+		received = copy.deepcopy(self.page)
+		first = Response(self.page).squash_table_response()
+		first.data
+		second = Response(self.page).squash_table_response()
+		self.assertEqual(second.get_original_data(), received)
+		self.assertEqual((first.extensions, first.to_list()), (second.extensions, second.to_list()))
+		self.assertEqual(self.page, received)
+
+	def test_raw_count_does_not_materialise(self):
+		response = Response(self.page).squash_table_response()
+		self.assertEqual(response.raw_count(), 2)
+		self.assertIs(response._data, UNSET)
+		self.assertEqual(Response({"students": {"student": [{"id": 1}, {"id": 2}, {"id": 3}]}}, "student").raw_count(), 3)
+		self.assertEqual(Response({"student": {"id": 1}}, "student").raw_count(), 1)
+		self.assertEqual(Response({"record": []}).raw_count(), 0)
+
+	def test_set_data_replaces_pending_squash(self):
+		response = Response(self.page).squash_table_response().set_data([{"id": "3"}])
+		self.assertEqual(response.to_list(), [{"id": "3"}])
+		self.assertEqual(Response({"count": 4}).data, {"count": 4})
+		self.assertTrue(Response({"record": []}).is_empty())
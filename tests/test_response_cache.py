@@ -0,0 +1,68 @@
+import time
+import unittest
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.response_cache import MemoryCacheBackend, ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=5)).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.mock.history.clear()
+
+	def test_hits_and_revalidation(self):
+		cache = ResponseCache(ttls={"/ws/v1/district/student": 0.2})
+		powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None, response_cache=cache)
+		query = powerschool.to('/ws/v1/district/student')
+		first = query.get().to_list()
+		self.assertEqual(query.get().to_list(), first)
+		self.assertEqual(len(self.mock.history), 1)
+		time.sleep(0.3)
+		self.assertEqual(query.get().to_list(), first)
+		self.assertEqual(len(self.mock.history), 2)
+		self.assertEqual(cache.get_stats()["hits"], 1)
+		self.assertEqual(cache.get_stats()["revalidated"], 1)
+
+	def test_key_normalises_params(self):
+		cache = ResponseCache()
+		first = cache.key("https://ps", "GET", "/ws/v1/district/school", {"params": "a=1&b=2"})
+		second = cache.key("https://ps", "get", "/ws/v1/district/school", {"params": "b=2&a=1"})
+		self.assertEqual(first, second)
+		self.assertNotEqual(first, cache.key("https://other", "GET", "/ws/v1/district/school", {"params": "a=1&b=2"}))
+
+	def test_lru_eviction(self):
+		backend = MemoryCacheBackend(max_entries=2)
+		for key in ("a", "b"):
+			backend.set(key, {"content": b"x"})
+		backend.get("a")
+		backend.set("c", {"content": b"x"})
+		self.assertIsNone(backend.get("b"))
+		self.assertIsNotNone(backend.get("a"))
+		self.assertEqual(backend.evictions, 1)
+
+	def test_memory_backend_honours_expire(self):
+		backend = MemoryCacheBackend()
+		backend.set("short", {"content": b"xy"}, expire=0.05)
+		backend.set("forever", {"content": b"z"})
+		self.assertIsNotNone(backend.get("short"))
+		time.sleep(0.1)
+		self.assertIsNone(backend.get("short"))
+		self.assertIsNotNone(backend.get("forever"))
+		self.assertEqual(backend.size, 1)
+
+	def test_stale_entry_without_validators_is_a_miss(self):
+		cache = ResponseCache(ttl=0.05, backend=MemoryCacheBackend())
+		cache.store("key", "/ws/v1/district/school", 200, {}, b"{}")
+		cache.backend.set("key", dict(cache.backend.get("key"), expires_at=time.time() - 1))
+		self.assertEqual(cache.lookup("key"), (None, False))
+		self.assertEqual((cache.get_stats()["hits"], cache.get_stats()["misses"]), (0, 1))
+
+if __name__ == "__main__":
+	unittest.main()
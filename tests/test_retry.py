@@ -0,0 +1,54 @@
+import unittest
+import requests
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.retry import RetryPolicy
+
+
+class TestRetry(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=5), retry_after=0).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.mock.history.clear()
+		self.events = []
+		policy = RetryPolicy(total=3, backoff_factor=0, on_retry=[self.events.append])
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None, retry_policy=policy)
+
+	def test_retries_throttling_and_server_errors(self):
+		self.mock.fail_next(429, 503, 502)
+		response = self.powerschool.table('students').get()
+		self.assertFalse(response.is_empty())
+		self.assertEqual(len(self.mock.history), 4)
+		self.assertEqual([event["status"] for event in self.events], [429, 503, 502])
+
+	def test_gives_up_when_budget_is_spent(self):
+		self.mock.fail_next(503, 503, 503, 503)
+		with self.assertRaises(requests.exceptions.HTTPError):
+			self.powerschool.table('students').get()
+		self.assertEqual(len(self.mock.history), 4)
+
+	def test_post_is_not_retried_on_server_error(self):
+		self.mock.fail_next(503)
+		with self.assertRaises(requests.exceptions.HTTPError):
+			self.powerschool.to('/ws/v1/student').with_data({"students": {}}).post()
+		self.assertEqual(len(self.mock.history), 1)
+
+	def test_power_query_is_retried(self):
+		self.mock.fail_next(503)
+		self.powerschool.pq('com.mock.students.by_grade', {"grade_level": "5"})
+		self.assertEqual(len(self.mock.history), 2)
+
+	def test_retry_after(self):
+		policy = RetryPolicy()
+		self.assertEqual(policy.status_delay("GET", "/ws/v1/school", 0, 429, {"Retry-After": "7"}), 7)
+		self.assertIsNone(policy.status_delay("POST", "/ws/v1/student", 0, 503))
+		self.assertIsNone(policy.status_delay("GET", "/ws/v1/school", 3, 503))
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.schema import SchemaError, SchemaRegistry, expression_fields
+
+
+class TestSchemaRegistry(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		students = [{"id": "1", "last_name": "Lovelace", "grade_level": "9", "alert_medical": "none"}]
+		cls.mock = MockPowerSchool(Dataset({"students": students})).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.mock.history.clear()
+		self.schema = SchemaRegistry(projections={"students": ["ID", "LAST_NAME"]})
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None, schema=self.schema)
+
+	def paths(self):
+		return [request.path for request in self.mock.history]
+
+	def test_declared_projection_replaces_star(self):
+		response = self.powerschool.table("students").send()
+		self.assertEqual(response.rows()[0], {"id": "1", "last_name": "Lovelace"})
+		self.assertEqual(self.mock.history[-1].params["projection"], "id,last_name")
+
+	def test_metadata_is_fetched_once(self):
+		for _ in range(3):
+			self.powerschool.table("students").projection("id,grade_level").sort("last_name").q("grade_level=ge=9").send()
+		self.assertEqual([path for path in self.paths() if path.endswith("/metadata")], ["/ws/schema/table/students/metadata"])
+		self.assertEqual(self.powerschool.table("students").metadata().column("alert_medical")["type"], "VARCHAR2")
+
+	def test_unknown_columns_are_rejected_before_sending(self):
+		with self.assertRaisesRegex(SchemaError, "did you mean 'last_name'"):
+			self.powerschool.table("students").projection(["ID", "LASTNAME"]).send()
+		with self.assertRaisesRegex(SchemaError, "sort"):
+			self.powerschool.table("students").sort("first_name").send()
+		with self.assertRaisesRegex(SchemaError, "'grade'"):
+			self.powerschool.table("students").q("id=gt=1;grade==9").send()
+		self.assertEqual([path for path in self.paths() if not path.endswith("/metadata")], [])
+
+	def test_expression_fields(self):
+		self.assertEqual(expression_fields("last_name=like='a==b*',(id=in=(1,2);students.grade_level>=9)"),
+						 ["last_name", "id", "students.grade_level"])
+
+if __name__ == "__main__":
+	unittest.main()
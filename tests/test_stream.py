@@ -0,0 +1,45 @@
+import io
+import json
+import unittest
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.stream import iter_rows
+
+
+class TestStream(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.mock = MockPowerSchool(Dataset.synthetic(students=23)).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.mock.stop()
+
+	def setUp(self):
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None)
+		self.students = self.mock.dataset.tables["students"]
+
+	def test_table_records(self):
+		rows = list(self.powerschool.table("students").projection("id,last_name").sort("id").stream(page_size=5))
+		self.assertEqual(rows, [{"id": row["id"], "last_name": row["last_name"]} for row in self.students])
+
+	def test_v1_list(self):
+		rows = list(self.powerschool.to("/ws/v1/district/student").stream(page_size=10))
+		self.assertEqual([row["id"] for row in rows], list(range(1, 24)))
+		self.assertEqual(rows[0]["name"]["last_name"], self.students[0]["last_name"])
+
+	def test_v1_single(self):
+		self.assertEqual([row["id"] for row in self.powerschool.to("/ws/v1/student/4").stream()], [4])
+		self.assertEqual([row["id"] for row in self.powerschool.to("/ws/v1/student").set_id(5).stream()], [5])
+		self.assertEqual([row["id"] for row in self.powerschool.table("students").for_id(6).stream()], ["6"])
+
+	def test_power_query(self):
+		rows = list(self.powerschool.pq("com.mock.students.by_grade").with_data({"grade_level": "3"}).stream(page_size=2))
+		expected = [row["id"] for row in self.students if row["grade_level"] == "3"]
+		self.assertEqual([row["students.id"] for row in rows], expected)
+
+	def test_recorded_payloads(self):
+		single_item_page = {"students": {"@expansions": "demographics", "student": {"id": 7, "local_id": 1007}}}
+		self.assertEqual(list(iter_rows(io.BytesIO(json.dumps(single_item_page).encode()), "student")), [{"id": 7, "local_id": 1007}])
+		records = {"name": "CC", "record": [{"id": 1, "tables": {"cc": {"id": "1", "termid": "3400"}}}]}
+		self.assertEqual(list(iter_rows(io.BytesIO(json.dumps(records).encode()), "record", "cc")), [{"id": "1", "termid": "3400"}])
@@ -0,0 +1,60 @@
+import unittest
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.sync import IncrementalSync, MemoryVersionStore
+
+
+def students_by_ids(dataset):
+	def query(args):
+		ids = args.get("ids", "").split(",")
+		return [{"STUDENTS.ID": row["id"], "students.last_name": row["last_name"]} for row in dataset.tables["students"] if row["id"] in ids]
+	return query
+
+
+class TestIncrementalSync(unittest.TestCase):
+	def setUp(self):
+		dataset = Dataset.synthetic(students=12)
+		dataset.add_named_query("com.mock.students.by_ids", students_by_ids(dataset))
+		self.mock = MockPowerSchool(dataset).start()
+		self.powerschool = PowerSchool(self.mock.url, "client", "secret", cache_key=None)
+		self.version = dataset.version
+		for row_id in ("1", "3", "4", "7", "9"):
+			dataset.update("students", row_id, {"first_name": f"Changed {row_id}"})
+		dataset.delete("students", "2")
+		dataset.update("students", "3", {"first_name": "Grace"})
+
+	def tearDown(self):
+		self.mock.stop()
+
+	def test_events(self):
+		store = MemoryVersionStore()
+		sync = IncrementalSync(self.powerschool, "roster", store=store, initial_version=self.version, batch_size=2)
+		events = list(sync.events())
+		self.assertEqual([(event.action, event.id) for event in events], [
+			("upsert", "1"), ("upsert", "3"), ("upsert", "4"), ("upsert", "7"), ("upsert", "9"), ("delete", "2"),
+		])
+		self.assertEqual(events[1].row["first_name"], "Grace")
+		self.assertEqual(store.get("roster", "*"), str(self.mock.dataset.version))
+		self.assertEqual(list(IncrementalSync(self.powerschool, "roster", store=store).events()), [])
+
+	def test_projection_without_the_id_column(self):
+		sync = IncrementalSync(self.powerschool, "roster", initial_version=self.version, id_column="ID",
+							   projections={"students": "FIRST_NAME"})
+		actions = {event.id: event.action for event in sync.events()}
+		self.assertEqual(actions, {"1": "upsert", "3": "upsert", "4": "upsert", "7": "upsert", "9": "upsert", "2": "delete"})
+
+	def test_named_query_reads_every_page(self):
+		self.mock.max_page_size = 2
+		sync = IncrementalSync(self.powerschool, "roster", initial_version=self.version, batch_size=5,
+							   named_queries={"students": ("com.mock.students.by_ids", "ids")})
+		events = list(sync.events())
+		self.assertEqual(sorted(event.id for event in events if event.action == "upsert"), ["1", "3", "4", "7", "9"])
+		self.assertEqual([event.id for event in events if event.action == "delete"], ["2"])
+
+	def test_requires_a_version(self):
+		with self.assertRaises(ValueError):
+			list(self.powerschool.incremental_sync("roster").events())
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+
+def count_students(query):
+	return int(query.table("students").count().data["count"])
+
+
+async def count_students_async(query):
+	return int((await query.table("students").count()).data["count"])
+
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.retry import RetryPolicy
+from powerschool_adapter.tenants import TenantRegistry
+
+
+class TestTenantRegistry(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.fast = MockPowerSchool(Dataset.synthetic(students=30)).start()
+		cls.slow = MockPowerSchool(Dataset.synthetic(students=50), latency=0.2).start()
+		cls.broken = MockPowerSchool(Dataset.synthetic(students=10), client_id="other", client_secret="other").start()
+
+	@classmethod
+	def tearDownClass(cls):
+		for mock in (cls.fast, cls.slow, cls.broken):
+			mock.stop()
+
+	def setUp(self):
+		self.registry = TenantRegistry(max_workers=4)
+		for name, mock in (("fast", self.fast), ("slow", self.slow), ("broken", self.broken)):
+			self.registry.add(name, mock.url, "client", "secret", rate=50, retry_policy=RetryPolicy(total=0))
+
+	def tearDown(self):
+		self.registry.close()
+
+	def test_lazy_requests(self):
+		self.assertIsNone(self.registry.get("fast").request)
+		self.assertEqual(self.registry.gather(count_students, ["fast"]), {"fast": 30})
+		self.assertIsNotNone(self.registry.get("fast").request)
+		self.assertIsNone(self.registry.get("slow").request)
+
+	def test_run_yields_in_completion_order(self):
+		results = list(self.registry.run(count_students))
+		self.assertEqual([result.tenant for result in results][-1], "slow")
+		values = {result.tenant: result.value for result in results}
+		self.assertEqual((values["fast"], values["slow"]), (30, 50))
+		errors = [result.tenant for result in results if result.error is not None]
+		self.assertEqual(errors, ["broken"])
+
+	def test_pages(self):
+		counts = {}
+		pages = list(self.registry.pages(lambda query: query.table("students").sort("id"), page_size=10, tenants=["fast", "slow"]))
+		for page in pages:
+			counts[page.tenant] = counts.get(page.tenant, 0) + len(page.response.rows())
+		self.assertEqual(counts, {"fast": 30, "slow": 50})
+		self.assertEqual(pages[0].tenant, "fast")
+		self.assertEqual([page.page for page in pages if page.tenant == "slow"], [1, 2, 3, 4, 5])
+		failed = list(self.registry.pages(lambda query: query.table("students"), tenants=["broken"]))
+		self.assertIsNotNone(failed[0].error)
+
+	def test_rows_stop_early(self):
+		rows = self.registry.rows(lambda query: query.table("students"), page_size=5, tenants=["fast", "slow"])
+		first = [next(rows) for _ in range(3)]
+		rows.close()
+		self.assertTrue(all(tenant in ("fast", "slow") for tenant, _ in first))
+
+	def test_run_async(self):
+		async def collect():
+			results = [result async for result in self.registry.run_async(count_students_async, ["fast", "slow"])]
+			await self.registry.aclose()
+			return results
+		results = asyncio.run(collect())
+		self.assertEqual([(result.tenant, result.value) for result in results], [("fast", 30), ("slow", 50)])
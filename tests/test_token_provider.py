@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from powerschool_adapter.mock_server import Dataset, MockPowerSchool
+from powerschool_adapter.paths import user_cache_dir
+from powerschool_adapter.powerschool import PowerSchool
+from powerschool_adapter.token_provider import DiskTokenStore, MemoryTokenStore, TokenProvider
+
+
+def expire_in(provider, seconds):
+	provider.expires_at = time.time() + seconds
+	provider.store.set(provider.key, provider.token, provider.expires_at)
+
+
+class CountingFetch:
+	def __init__(self, ttl=3600):
+		self.calls = 0
+		self.ttl = ttl
+		self.lock = threading.Lock()
+
+	def __call__(self):
+		with self.lock:
+			self.calls += 1
+			calls = self.calls
+		time.sleep(0.05)
+		return f"token-{calls}", self.ttl
+
+
+class TestTokenProvider(unittest.TestCase):
+	def test_single_flight_across_threads(self):
+		provider = TokenProvider(MemoryTokenStore())
+		fetch = CountingFetch()
+		with ThreadPoolExecutor(max_workers=32) as executor:
+			tokens = set(executor.map(lambda _: provider.get_token(fetch), range(64)))
+		self.assertEqual(tokens, {"token-1"})
+		self.assertEqual(fetch.calls, 1)
+
+	def test_stale_token_is_refreshed_once(self):
+		provider = TokenProvider(MemoryTokenStore())
+		fetch = CountingFetch()
+		stale = provider.get_token(fetch)
+		with ThreadPoolExecutor(max_workers=16) as executor:
+			tokens = set(executor.map(lambda _: provider.refresh(fetch, stale), range(32)))
+		self.assertEqual(tokens, {"token-2"})
+		self.assertEqual(fetch.calls, 2)
+
+	def test_refreshes_before_expiry(self):
+		provider = TokenProvider(MemoryTokenStore(), refresh_margin=60)
+		fetch = CountingFetch(ttl=600)
+		provider.get_token(fetch)
+		expire_in(provider, 59)
+		provider.get_token(fetch)
+		self.assertEqual(fetch.calls, 2)
+
+	def test_margin_is_clamped_for_short_lived_tokens(self):
+		provider = TokenProvider(MemoryTokenStore(), refresh_margin=60)
+		fetch = CountingFetch(ttl=30)
+		provider.get_token(fetch)
+		provider.get_token(fetch)
+		self.assertEqual(fetch.calls, 1)
+		expire_in(provider, 14)
+		provider.get_token(fetch)
+		self.assertEqual(fetch.calls, 2)
+
+	def test_disk_store_defaults_to_the_user_cache(self):
+		with tempfile.TemporaryDirectory() as directory, mock.patch.dict(os.environ, {"XDG_CACHE_HOME": directory}):
+			store = DiskTokenStore()
+			self.assertEqual(store.directory, user_cache_dir("tokens"))
+			self.assertTrue(store.directory.startswith(directory) or sys.platform in ("win32", "darwin"))
+
+	def test_disk_store_is_shared(self):
+		with tempfile.TemporaryDirectory() as directory:
+			fetch = CountingFetch()
+			first = TokenProvider(DiskTokenStore(directory), key="district")
+			second = TokenProvider(DiskTokenStore(directory), key="district")
+			self.assertEqual(first.get_token(fetch), second.get_token(fetch))
+			self.assertEqual(fetch.calls, 1)
+
+	def test_single_flight_across_coroutines(self):
+		provider = TokenProvider(MemoryTokenStore())
+		calls = []
+
+		async def fetch():
+			calls.append(1)
+			await asyncio.sleep(0.05)
+			return "token", 3600
+
+		async def run():
+			return await asyncio.gather(*(provider.get_token_async(fetch) for _ in range(50)))
+
+		self.assertEqual(set(asyncio.run(run())), {"token"})
+		self.assertEqual(len(calls), 1)
+
+	def test_refreshes_on_a_second_event_loop(self):
+		provider = TokenProvider(MemoryTokenStore())
+		calls = []
+
+		async def fetch():
+			calls.append(1)
+			await asyncio.sleep(0.05)
+			return f"token-{len(calls)}", 3600
+
+		async def run(stale=None):
+			# Coroutines queue on the lock, which ties it to the running loop
+			return set(await asyncio.gather(*(provider.get_token_async(fetch, stale) for _ in range(5))))
+
+		self.assertEqual(asyncio.run(run()), {"token-1"})
+		self.assertEqual(asyncio.run(run(stale="token-1")), {"token-2"})
+		self.assertEqual(len(calls), 2)
+
+	def test_cancelled_refresh_releases_the_store_lock(self):
+		provider = TokenProvider(MemoryTokenStore())
+		lock = provider.store.lock(provider.key)
+		lock.acquire()
+
+		async def fetch():
+			return "token", 3600
+
+		async def run():
+			task = asyncio.ensure_future(provider.get_token_async(fetch))
+			await asyncio.sleep(0.05)
+			task.cancel()
+			with self.assertRaises(asyncio.CancelledError):
+				await task
+			lock.release()
+			await asyncio.sleep(0.1)
+
+		asyncio.run(run())
+		self.assertTrue(lock.acquire(timeout=1))
+
+	def test_servers_sharing_a_store_keep_their_own_tokens(self):
+		store = MemoryTokenStore()
+		with MockPowerSchool(Dataset.synthetic(students=1)) as first, MockPowerSchool(Dataset.synthetic(students=1)) as second:
+			for mock in (first, second, first, second):
+				PowerSchool(mock.url, "client", "secret", token_store=store).table("students").get()
+			self.assertEqual(len(store.tokens), 2)
+			self.assertEqual((first.stats["tokens"], second.stats["tokens"]), (1, 1))
+
+if __name__ == "__main__":
+	unittest.main()